@@ -1,4 +1,6 @@
+from plotjs.batch import ExportJob, ExportResult, save_many
+from plotjs.page import Page
 from plotjs.plotjs import PlotJS
 
 __version__ = "0.0.12"
-__all__: list[str] = ["PlotJS"]
+__all__: list[str] = ["ExportJob", "ExportResult", "Page", "PlotJS", "save_many"]
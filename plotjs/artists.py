@@ -0,0 +1,162 @@
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.axes import Axes
+from matplotlib.collections import (
+    FillBetweenPolyCollection,
+    PathCollection,
+    QuadMesh,
+)
+from matplotlib.figure import Figure, FigureBase
+from matplotlib.legend import Legend
+from matplotlib.lines import Line2D
+from matplotlib.patches import Patch
+from matplotlib.path import Path
+
+# artists that `PlotSVGParser` can make interactive
+INTERACTIVE_ARTISTS: tuple[type, ...] = (
+    PathCollection,
+    QuadMesh,
+    FillBetweenPolyCollection,
+    Line2D,
+    Legend,
+)
+
+
+def _is_interactive(artist: Artist, parent: Artist) -> bool:
+    if isinstance(artist, INTERACTIVE_ARTISTS):
+        return True
+    # bars, pies and other patches, but not the background of the Axes
+    return (
+        isinstance(parent, Axes)
+        and isinstance(artist, Patch)
+        and artist in parent.patches
+    )
+
+
+def element_type(artist: Artist) -> str | None:
+    """
+    Get the kind of plot element that the JavaScript parser makes of
+    an interactive artist.
+
+    Patches are bars when they are clipped to the Axes, and pies when
+    they are not clipped, filled and curved (such as wedges).
+
+    Args:
+        artist: An interactive artist (see `split_artists()`).
+
+    Returns:
+        One of `"point"`, `"rectangle"`, `"area"`, `"line"`, `"bar"` and
+        `"pie"`, or `None` for legends and other patches.
+    """
+    if isinstance(artist, PathCollection):
+        return "point"
+    if isinstance(artist, QuadMesh):
+        return "rectangle"
+    if isinstance(artist, FillBetweenPolyCollection):
+        return "area"
+    if isinstance(artist, Line2D):
+        return "line"
+    if not isinstance(artist, Patch):
+        return None
+    if artist.get_clip_on() and (
+        artist.get_clip_box() is not None or artist.get_clip_path() is not None
+    ):
+        return "bar"
+    codes = artist.get_path().codes
+    curved: bool = codes is not None and bool(
+        np.isin(codes, (Path.CURVE3, Path.CURVE4)).any()
+    )
+    if curved and artist.get_fill() and artist.get_facecolor()[3] > 0:
+        return "pie"
+    return None
+
+
+def split_artists(fig: Figure) -> tuple[list[Artist], list[Artist]]:
+    """
+    Split the artists of a figure into the ones that the JavaScript
+    parser can make interactive (points, lines, bars, areas, pies,
+    meshes and legends) and the static ones (backgrounds, spines,
+    axis, texts, images...).
+
+    Axes (and subfigures) are not included: only their children are.
+
+    Args:
+        fig: A matplotlib figure.
+
+    Returns:
+        A tuple with the list of interactive artists and the list of
+        static artists.
+    """
+    interactive: list[Artist] = []
+    static: list[Artist] = []
+
+    def _visit(parent: Artist) -> None:
+        for child in parent.get_children():
+            if isinstance(child, (Axes, FigureBase)):
+                _visit(child)
+            elif _is_interactive(child, parent):
+                interactive.append(child)
+            else:
+                static.append(child)
+
+    _visit(fig)
+    return interactive, static
+
+
+@contextmanager
+def hidden(artists: Iterable[Artist]) -> Iterator[None]:
+    """
+    Temporarily hide artists, restoring their visibility on exit.
+
+    Their stale state is restored too, without marking their parents
+    as stale: showing them again does not change the figure.
+    """
+    visibility: list[tuple[Artist, bool, bool]] = [
+        (artist, artist.get_visible(), artist.stale) for artist in artists
+    ]
+    try:
+        for artist, _, _ in visibility:
+            artist.set_visible(False)
+        yield
+    finally:
+        for artist, visible, stale in visibility:
+            callback, artist.stale_callback = artist.stale_callback, None
+            try:
+                artist.set_visible(visible)
+                artist.stale = stale
+            finally:
+                artist.stale_callback = callback
+
+
+def resolve_bbox_inches(fig: Figure, savefig_kws: dict) -> dict:
+    """
+    Replace `bbox_inches="tight"` by the actual bounding box of the
+    figure, so that several renders with different visible artists
+    cover exactly the same area.
+
+    Args:
+        fig: A matplotlib figure.
+        savefig_kws: Keyword arguments for `fig.savefig()`.
+
+    Returns:
+        A copy of `savefig_kws`.
+    """
+    savefig_kws = dict(savefig_kws)
+    bbox_inches = savefig_kws.get("bbox_inches", plt.rcParams["savefig.bbox"])
+    if bbox_inches != "tight":
+        return savefig_kws
+
+    fig.draw_without_rendering()
+    bbox = fig.get_tightbbox(
+        fig._get_renderer(),
+        bbox_extra_artists=savefig_kws.pop("bbox_extra_artists", None),
+    )
+    pad_inches = savefig_kws.pop("pad_inches", None)
+    if pad_inches in (None, "layout"):
+        pad_inches = plt.rcParams["savefig.pad_inches"]
+    savefig_kws["bbox_inches"] = bbox.padded(pad_inches)
+    return savefig_kws
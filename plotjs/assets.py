@@ -0,0 +1,276 @@
+import hashlib
+import os
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import NamedTuple
+
+from jinja2 import Environment, FileSystemLoader, Template
+
+from plotjs.minify import minify_js
+from plotjs.utils import _get_and_sanitize_js
+
+STATIC_DIR: Path = Path(__file__).parent / "static"
+CSS_PATH: str = os.path.join(STATIC_DIR, "default.css")
+JS_PARSER_PATH: str = os.path.join(STATIC_DIR, "plotparser.js")
+TEMPLATE_NAME: str = "template.html"
+CHART_TEMPLATE_NAME: str = "chart.html"
+
+env: Environment = Environment(loader=FileSystemLoader(STATIC_DIR))
+
+
+class ExternalAsset(NamedTuple):
+    file_name: str
+    content: str
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    currsize: int
+
+
+class AssetRegistry:
+    """
+    Process-wide cache of the static assets used to build an HTML
+    file (default CSS, sanitized JS parser, compiled template).
+
+    Each asset is loaded once and kept in memory. An entry is
+    reloaded when the modification time of its source file changes,
+    which keeps editing the static files during development painless.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, tuple[int, object]] = {}
+        self._hits: int = 0
+        self._misses: int = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str, path: str, loader: Callable[[str], object]) -> object:
+        """
+        Get an asset from the cache, loading it with `loader` on a miss.
+
+        Args:
+            key: Unique name of the asset in the registry.
+            path: Path of the source file, used for mtime invalidation.
+            loader: Function called with `path` to (re)build the asset.
+
+        Returns:
+            The cached asset.
+        """
+        mtime: int = os.stat(path).st_mtime_ns
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == mtime:
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+
+        value = loader(path)
+        with self._lock:
+            self._entries[key] = (mtime, value)
+        return value
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+registry: AssetRegistry = AssetRegistry()
+
+
+def _read_file(path: str) -> str:
+    with open(path) as f:
+        return f.read()
+
+
+def get_default_css() -> str:
+    """
+    Get the default CSS shipped with plotjs.
+
+    Returns:
+        A string of raw CSS.
+    """
+    return registry.get("default_css", CSS_PATH, _read_file)
+
+
+def _variant(production: bool, debug: bool) -> str:
+    if not production:
+        return "development"
+    return "production-debug" if debug else "production"
+
+
+def get_js_parser(production: bool = False, debug: bool = False) -> str:
+    """
+    Get the JavaScript parser, ready to be inlined in the HTML.
+
+    Args:
+        production: Whether to minify the parser and remove its logging.
+        debug: Whether to keep logging when `production=True`.
+
+    Returns:
+        A string of raw JavaScript.
+    """
+    if production:
+        return registry.get(
+            f"js_parser:{_variant(production, debug)}",
+            JS_PARSER_PATH,
+            lambda _: minify_js(get_js_parser(), strip_logging=not debug),
+        )
+    return registry.get(
+        "js_parser",
+        JS_PARSER_PATH,
+        lambda path: _get_and_sanitize_js(
+            file_path=path,
+            after_pattern=r"class Selection.*",
+        ),
+    )
+
+
+def get_js_bootstrap(production: bool = False, debug: bool = False) -> str:
+    """
+    Get the script that makes the charts of a page interactive: the
+    parser, followed by a call to `initPlots()`.
+
+    Args:
+        production: Whether to minify the script and remove its logging.
+        debug: Whether to keep logging when `production=True`.
+
+    Returns:
+        A string of raw JavaScript.
+    """
+
+    def _bootstrap(_) -> str:
+        source: str = (
+            f"(function () {{\n{get_js_parser()}\ninitPlots(document);\n}})();\n"
+        )
+        if production:
+            return minify_js(source, strip_logging=not debug)
+        return source
+
+    return registry.get(
+        f"js_bootstrap:{_variant(production, debug)}", JS_PARSER_PATH, _bootstrap
+    )
+
+
+def get_template(name: str = TEMPLATE_NAME) -> Template:
+    """
+    Get a compiled jinja2 template from the static directory.
+
+    Args:
+        name: Name of the template file.
+
+    Returns:
+        The compiled template.
+    """
+    return registry.get(
+        f"template:{name}",
+        os.path.join(STATIC_DIR, name),
+        lambda _: env.get_template(name),
+    )
+
+
+def _external_asset(content: str, extension: str) -> ExternalAsset:
+    digest: str = hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+    return ExternalAsset(f"plotjs-{digest}.{extension}", content)
+
+
+def get_external_js(production: bool = False, debug: bool = False) -> ExternalAsset:
+    """
+    Get the JavaScript file used by HTML outputs that reference
+    their assets instead of inlining them: the parser and the
+    bootstrap of the charts (see `get_js_bootstrap()`). It is loaded
+    with a classic (deferred) script, which also works for pages
+    opened from the filesystem.
+
+    Args:
+        production: Whether to minify the script and remove its logging.
+        debug: Whether to keep logging when `production=True`.
+
+    Returns:
+        A named tuple with the content-hashed `file_name` and the
+        `content` of the file.
+    """
+    return registry.get(
+        f"external_js:{_variant(production, debug)}",
+        JS_PARSER_PATH,
+        lambda _: _external_asset(get_js_bootstrap(production, debug), "js"),
+    )
+
+
+def get_external_css() -> ExternalAsset:
+    """
+    Get the CSS file used by HTML outputs that reference their
+    assets instead of inlining them.
+
+    Returns:
+        A named tuple with the content-hashed `file_name` and the
+        `content` of the file.
+    """
+    return registry.get(
+        "external_css",
+        CSS_PATH,
+        lambda _: _external_asset(get_default_css(), "css"),
+    )
+
+
+def write_external_asset(asset: ExternalAsset, directory: str) -> str:
+    """
+    Write an asset in a directory, unless it is already there. Since
+    file names contain the hash of the content, an existing file is
+    always up to date.
+
+    Args:
+        asset: The asset to write.
+        directory: Where to write it. Created if it doesn't exist.
+
+    Returns:
+        The path of the file.
+    """
+    path: str = os.path.join(directory, asset.file_name)
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        # write then rename, so that concurrent exports never see a
+        # partially written file
+        tmp_path: str = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(asset.content)
+        os.replace(tmp_path, path)
+    return path
+
+
+def cache_info() -> CacheInfo:
+    """
+    Get hit/miss statistics of the asset cache.
+
+    Returns:
+        A named tuple with `hits`, `misses` and `currsize` (the
+        number of cached assets).
+
+    Examples:
+        ```python
+        from plotjs import PlotJS, assets
+
+        PlotJS().as_html()
+        before = assets.cache_info()
+        PlotJS().as_html()
+
+        # assets of the second export are all read from the cache
+        assets.cache_info().misses == before.misses
+        # True
+        ```
+    """
+    return registry.cache_info()
+
+
+def clear_cache() -> None:
+    """
+    Drop all cached assets and reset the hit/miss counters.
+    """
+    registry.clear()
@@ -0,0 +1,236 @@
+import os
+import pickle
+import time
+import traceback
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+from matplotlib.figure import Figure
+
+from plotjs.profiling import ExportProfile
+
+
+@dataclass
+class ExportJob:
+    """
+    Description of one HTML export, run by `save_many()`.
+
+    Attributes:
+        figure: What to export. Either a callable returning a matplotlib
+            figure (it must be picklable, e.g. a module-level function or
+            a `functools.partial`), a `Figure`, or a pickled `Figure`
+            (`bytes`).
+        file_path: Where to save the HTML file.
+        tooltips: Keyword arguments passed to `PlotJS.add_tooltip()`. Pass
+            a list of dictionnaries to add several tooltips (one per Axes).
+            Since Axes can not be sent to another process, `ax` must be
+            the index of the Axes in `fig.get_axes()`.
+        css: Additional CSS, passed to `PlotJS.add_css()`.
+        javascript: Additional JavaScript, passed to `PlotJS.add_javascript()`.
+        plot_kws: Keyword arguments passed to `PlotJS()`, such as
+            `bbox_inches` (passed on to `fig.savefig()`).
+        save_kws: Keyword arguments passed to `PlotJS.save()`, such as
+            `document_title`.
+    """
+
+    figure: Callable[[], Figure] | Figure | bytes
+    file_path: str
+    tooltips: dict | list[dict] | None = None
+    css: str | None = None
+    javascript: str | None = None
+    plot_kws: dict = field(default_factory=dict)
+    save_kws: dict = field(default_factory=dict)
+
+
+@dataclass
+class ExportResult:
+    """
+    Outcome of one `ExportJob`.
+
+    Attributes:
+        index: Position of the job in the input of `save_many()`.
+        file_path: Absolute path of the saved file (or the requested path
+            if the export failed).
+        elapsed: Time spent on the job in the worker, in seconds.
+        error: Formatted traceback if the export failed, `None` otherwise.
+        profile: Timings and sizes of the export (see
+            `plotjs.profiling.ExportProfile`), `None` if it failed.
+    """
+
+    index: int
+    file_path: str
+    elapsed: float
+    error: str | None = None
+    profile: ExportProfile | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _init_worker(production: bool = False) -> None:
+    """
+    Force a non-interactive backend and warm the asset cache, so
+    that every job of a worker reuses the same parsed assets.
+
+    Args:
+        production: Whether jobs export minified pages, in which case
+            the minified bootstrap is warmed too.
+    """
+    import matplotlib
+
+    matplotlib.use("Agg", force=True)
+
+    from plotjs import assets
+
+    assets.get_template()
+    assets.get_template(assets.CHART_TEMPLATE_NAME)
+    assets.get_default_css()
+    assets.get_js_bootstrap()
+    if production:
+        assets.get_js_bootstrap(production=True)
+
+
+def _load_figure(figure: Callable[[], Figure] | Figure | bytes) -> Figure:
+    if isinstance(figure, Figure):
+        return figure
+    if isinstance(figure, (bytes, bytearray)):
+        fig = pickle.loads(figure)
+    elif callable(figure):
+        fig = figure()
+    else:
+        raise TypeError(
+            "`figure` must be a Figure, a pickled Figure or a callable returning a Figure."
+        )
+    if not isinstance(fig, Figure):
+        raise TypeError(f"Expected a matplotlib Figure, got {type(fig).__name__}.")
+    return fig
+
+
+def _run_job(index: int, job: ExportJob) -> ExportResult:
+    import matplotlib.pyplot as plt
+
+    from plotjs import PlotJS
+
+    start: float = time.perf_counter()
+    fig: Figure | None = None
+    try:
+        fig = _load_figure(job.figure)
+        plot = PlotJS(fig, **job.plot_kws)
+
+        tooltips = job.tooltips
+        if isinstance(tooltips, dict):
+            tooltips = [tooltips]
+        for tooltip in tooltips or []:
+            tooltip = dict(tooltip)
+            if isinstance(tooltip.get("ax"), int):
+                tooltip["ax"] = fig.get_axes()[tooltip["ax"]]
+            plot.add_tooltip(**tooltip)
+
+        if job.css:
+            plot.add_css(job.css)
+        if job.javascript:
+            plot.add_javascript(job.javascript)
+
+        plot.save(job.file_path, **job.save_kws)
+        return ExportResult(
+            index=index,
+            file_path=plot._file_path,
+            elapsed=time.perf_counter() - start,
+            profile=plot.profile,
+        )
+    except Exception:  # noqa: BLE001
+        # any error of the user's figure or arguments is reported in
+        # the result, so that the other jobs keep running
+        return ExportResult(
+            index=index,
+            file_path=job.file_path,
+            elapsed=time.perf_counter() - start,
+            error=traceback.format_exc(),
+        )
+    finally:
+        if fig is not None:
+            plt.close(fig)
+
+
+def save_many(
+    jobs: Iterable[ExportJob | dict],
+    *,
+    max_workers: int | None = None,
+    mp_context=None,
+) -> Iterator[ExportResult]:
+    """
+    Export many figures to HTML files in parallel, using a pool of
+    processes.
+
+    Rendering a figure to SVG is CPU-bound, so this scales with the
+    number of cores. Each worker uses the Agg backend and keeps its
+    assets cached between jobs. Results are yielded as soon as jobs
+    complete (not in input order), and a failing job does not stop
+    the others: its error is reported in the result instead.
+
+    Args:
+        jobs: An iterable of `ExportJob`, or of dictionnaries with the
+            same keys.
+        max_workers: Number of processes. If `None` (default), uses the
+            number of CPUs.
+        mp_context: Optional multiprocessing context passed to
+            `concurrent.futures.ProcessPoolExecutor`.
+
+    Returns:
+        An iterator of `ExportResult`, in completion order.
+
+    Examples:
+        ```python
+        import matplotlib.pyplot as plt
+        from plotjs import ExportJob, save_many
+
+        def make_figure():
+            fig, ax = plt.subplots()
+            ax.scatter([1, 2, 3], [1, 2, 3])
+            return fig
+
+        jobs = [
+            ExportJob(
+                figure=make_figure,
+                file_path=f"chart-{i}.html",
+                tooltips={"labels": ["A", "B", "C"]},
+            )
+            for i in range(100)
+        ]
+
+        for result in save_many(jobs, max_workers=4):
+            if not result.ok:
+                print(result.file_path, result.error)
+        ```
+    """
+    job_list: list[ExportJob] = [
+        job if isinstance(job, ExportJob) else ExportJob(**job) for job in jobs
+    ]
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(job_list) or 1))
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=mp_context,
+        initializer=_init_worker,
+        initargs=(any(job.save_kws.get("production") for job in job_list),),
+    ) as executor:
+        futures: dict[Future, int] = {
+            executor.submit(_run_job, i, job): i for i, job in enumerate(job_list)
+        }
+        for future in as_completed(futures):
+            index: int = futures[future]
+            try:
+                yield future.result()
+            except Exception:  # noqa: BLE001
+                # the job could not be sent to or received from the
+                # worker (e.g. unpicklable figure or crashed process)
+                yield ExportResult(
+                    index=index,
+                    file_path=job_list[index].file_path,
+                    elapsed=0.0,
+                    error=traceback.format_exc(),
+                )
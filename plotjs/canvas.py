@@ -0,0 +1,132 @@
+import base64
+
+import numpy as np
+from matplotlib.collections import PathCollection
+from matplotlib.path import Path
+from matplotlib.transforms import IdentityTransform
+
+_PATH_COMMANDS: dict[int, str] = {
+    Path.MOVETO: "M",
+    Path.LINETO: "L",
+    Path.CURVE3: "Q",
+    Path.CURVE4: "C",
+}
+
+
+def _encode(values: np.ndarray, dtype: str) -> str:
+    return base64.b64encode(np.ascontiguousarray(values, dtype=dtype).tobytes()).decode(
+        "ascii"
+    )
+
+
+def _per_marker(values, n: int, keep: np.ndarray) -> np.ndarray:
+    """
+    Repeat values cyclically over `n` markers (as matplotlib does),
+    and only keep the drawn ones. A single value is left as is.
+    """
+    values = np.asarray(values)
+    if len(values) <= 1:
+        return values
+    return values[np.arange(n) % len(values)][keep]
+
+
+def _path_data(path: Path) -> str:
+    """
+    Convert a marker path to SVG path data, with the y axis pointing
+    down as in SVG.
+    """
+    parts: list[str] = []
+    for vertices, code in path.iter_segments(simplify=False, curves=True):
+        if code == Path.CLOSEPOLY:
+            parts.append("Z")
+            continue
+        coordinates = " ".join(
+            f"{x:.6g} {-y:.6g}" for x, y in np.reshape(vertices, (-1, 2))
+        )
+        parts.append(f"{_PATH_COMMANDS[code]}{coordinates}")
+    return "".join(parts)
+
+
+def supports_canvas(artist) -> bool:
+    """
+    Whether an artist can be drawn on a canvas by the parser: scatter
+    plots, whose markers are paths placed at offsets.
+
+    Args:
+        artist: A matplotlib artist.
+
+    Returns:
+        `True` if the artist is a `PathCollection` with offsets.
+    """
+    return (
+        isinstance(artist, PathCollection)
+        and isinstance(artist.get_transform(), IdentityTransform)
+        and len(artist.get_offsets()) > 0
+    )
+
+
+def marker_data(artist: PathCollection, renderer) -> dict:
+    """
+    Get what the parser needs to draw the markers of a scatter plot
+    on a canvas, in SVG coordinates. Arrays are base64 strings of
+    little-endian values, with a single value when it is the same
+    for all markers.
+
+    Must be called while the figure is drawn by the SVG renderer.
+
+    Args:
+        artist: A `PathCollection`, as accepted by `supports_canvas()`.
+        renderer: The SVG renderer drawing the figure.
+
+    Returns:
+        A dict with the `centers` (float32 `x0, y0, x1, y1...`), the
+        `scales` of the marker paths (float32), their `fill` and
+        `stroke` colors (uint8 RGBA), their `linewidths` (float32),
+        the marker `paths` (SVG path data, used cyclically) and the
+        `clip` rectangle (`[x, y, width, height]` or `None`).
+    """
+    height: float = renderer.height
+    artist.update_scalarmappable()
+    artist.set_sizes(artist.get_sizes(), artist.figure.dpi)
+
+    offsets = np.asarray(artist.get_offsets(), dtype=float).reshape(-1, 2)
+    centers = artist.get_offset_transform().transform(offsets)
+    # matplotlib does not draw markers with non-finite offsets
+    keep = np.isfinite(centers).all(axis=1)
+    n: int = len(offsets)
+    centers = np.column_stack([centers[keep, 0], height - centers[keep, 1]])
+
+    transforms = artist.get_transforms()
+    scales = transforms[:, 0, 0] if len(transforms) else np.ones(1)
+
+    def _colors(colors) -> str:
+        colors = np.asarray(colors, dtype=float).reshape(-1, 4)
+        if not len(colors):
+            colors = np.zeros((1, 4))
+        return _encode(np.round(_per_marker(colors, n, keep) * 255), "u1")
+
+    linewidths = np.asarray(artist.get_linewidths(), dtype=float).reshape(-1)
+    if not len(linewidths):
+        linewidths = np.zeros(1)
+
+    clip: list[float] | None = None
+    clip_box = artist.get_clip_box()
+    if artist.get_clip_on() and clip_box is not None:
+        clip = [
+            float(clip_box.x0),
+            float(height - clip_box.y1),
+            float(clip_box.width),
+            float(clip_box.height),
+        ]
+
+    return {
+        "centers": _encode(centers, "<f4"),
+        "scales": _encode(_per_marker(scales, n, keep), "<f4"),
+        "fill": _colors(artist.get_facecolor()),
+        "stroke": _colors(artist.get_edgecolor()),
+        "linewidths": _encode(
+            renderer.points_to_pixels(_per_marker(linewidths, n, keep)), "<f4"
+        ),
+        "paths": [_path_data(path) for path in artist.get_paths()],
+        "clip": clip,
+    }
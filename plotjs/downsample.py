@@ -0,0 +1,119 @@
+import numpy as np
+from matplotlib.lines import Line2D
+
+# vertices kept for each unit of width of the axes, in the SVG
+VERTICES_PER_PIXEL: int = 2
+
+# SVG renderers draw with 72 units per inch
+_SVG_DPI: float = 72.0
+
+
+def lttb(points: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Select the vertices of a polyline to keep with the
+    Largest-Triangle-Three-Buckets algorithm: the first and last
+    vertices are kept, the other ones are split into `n_out - 2`
+    buckets and, in each bucket, the vertex forming the largest
+    triangle with the vertex kept in the previous bucket and the mean
+    of the next bucket is kept.
+
+    Args:
+        points: `(n, 2)` array of finite vertices.
+        n_out: Number of vertices to keep (at least 3).
+
+    Returns:
+        Sorted indices of the vertices kept.
+    """
+    n: int = len(points)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+
+    # bounds of the buckets of the vertices between the first and last
+    bounds = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    cumulative = np.concatenate([[0.0, 0.0], np.cumsum(points, axis=0).ravel()])
+    cumulative = cumulative.reshape(-1, 2)
+    # mean of each bucket, and the last vertex after the last bucket
+    means = (cumulative[bounds[1:]] - cumulative[bounds[:-1]]) / np.diff(bounds)[
+        :, None
+    ]
+    means = np.concatenate([means[1:], points[-1:]])
+
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    previous = points[0]
+    for i in range(n_out - 2):
+        start, stop = bounds[i], bounds[i + 1]
+        bucket = points[start:stop]
+        # twice the area of the triangle (previous, vertex, next mean)
+        areas = np.abs(
+            (previous[0] - means[i][0]) * (bucket[:, 1] - previous[1])
+            - (previous[0] - bucket[:, 0]) * (means[i][1] - previous[1])
+        )
+        best = start + int(np.argmax(areas))
+        kept[i + 1] = best
+        previous = points[best]
+    return kept
+
+
+def simplified_vertices(points: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Select the vertices of a line to keep, with `lttb()` applied to
+    each run of finite vertices (with a share of `n_out` proportional
+    to its length). The first non-finite vertex of each gap is kept,
+    so that the line stays broken at the same places.
+
+    Args:
+        points: `(n, 2)` array of vertices, in display coordinates.
+        n_out: Number of vertices to keep, approximately.
+
+    Returns:
+        Sorted indices of the vertices kept.
+    """
+    n: int = len(points)
+    if n <= n_out:
+        return np.arange(n)
+    finite = np.isfinite(points).all(axis=1)
+    n_finite: int = int(finite.sum())
+
+    # runs of finite vertices, as [start, stop) pairs
+    edges = np.flatnonzero(np.diff(np.concatenate([[0], finite.astype(np.int8), [0]])))
+    kept: list[np.ndarray] = [
+        np.flatnonzero(~finite & np.concatenate([[True], finite[:-1]]))
+    ]
+    for start, stop in edges.reshape(-1, 2):
+        share: int = max(3, round(n_out * (stop - start) / max(n_finite, 1)))
+        kept.append(start + lttb(points[start:stop], share))
+    return np.unique(np.concatenate(kept))
+
+
+def vertex_budget(line: Line2D) -> int:
+    """
+    Number of vertices kept when downsampling a line:
+    `VERTICES_PER_PIXEL` for each unit of width of its axes in the SVG.
+
+    Args:
+        line: A line of an axes.
+
+    Returns:
+        The number of vertices.
+    """
+    width: float = line.axes.bbox.width * _SVG_DPI / line.figure.dpi
+    return max(3, int(VERTICES_PER_PIXEL * width))
+
+
+def supports_downsampling(artist) -> bool:
+    """
+    Whether a line can be downsampled without changing how it looks
+    (beyond its resolution): plain lines, without markers nor steps.
+
+    Args:
+        artist: A matplotlib artist.
+
+    Returns:
+        `True` for lines that can be downsampled.
+    """
+    return (
+        isinstance(artist, Line2D)
+        and artist.get_drawstyle() == "default"
+        and artist.get_marker() in (None, "None", "none", "", " ")
+    )
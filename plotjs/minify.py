@@ -0,0 +1,322 @@
+import re
+from typing import NamedTuple
+
+_IDENTIFIER_CHARS = re.compile(r"[\w$\\]")
+_WORD = re.compile(r"[\w$\\]+")
+_NUMBER = re.compile(
+    r"(?:0[xXoObB][\da-fA-F_]+|(?:\d[\d_]*\.?[\d_]*|\.\d[\d_]*)(?:[eE][-+]?\d+)?)n?"
+)
+# fmt: off
+_PUNCTUATORS: tuple[str, ...] = tuple(
+    sorted(
+        [
+            ">>>=", "...", "===", "!==", "**=", "<<=", ">>=", ">>>", "&&=",
+            "||=", "??=", "=>", "==", "!=", "<=", ">=", "&&", "||", "??", "?.",
+            "++", "--", "+=", "-=", "*=", "/=", "%=", "&=", "|=", "^=", "<<",
+            ">>", "**", "{", "}", "(", ")", "[", "]", ";", ",", "<", ">", "+",
+            "-", "*", "/", "%", "&", "|", "^", "!", "~", "?", ":", "=", ".",
+            "@", "#",
+        ],
+        key=len,
+        reverse=True,
+    )
+)
+# fmt: on
+
+# a `/` after these tokens starts a regular expression, not a division
+_KEYWORDS_BEFORE_EXPRESSION: frozenset[str] = frozenset(
+    {
+        "return",
+        "typeof",
+        "instanceof",
+        "in",
+        "of",
+        "new",
+        "delete",
+        "void",
+        "throw",
+        "case",
+        "do",
+        "else",
+        "yield",
+        "await",
+    }
+)
+
+# tokens after which a line break can't end a statement
+_OPEN_PUNCTUATORS: frozenset[str] = frozenset(
+    p for p in _PUNCTUATORS if p not in {")", "]", "}", "++", "--"}
+)
+
+# tokens before which a line break can't end a statement
+_CONTINUING_PUNCTUATORS: frozenset[str] = frozenset(
+    p
+    for p in _PUNCTUATORS
+    if p not in {"(", "[", "{", "++", "--", "+", "-", "!", "~", "/", "@", "#", "..."}
+)
+
+
+_LOG_CALL: list[str] = ["console", ".", "log", "("]
+
+
+class Token(NamedTuple):
+    # "word" (identifiers, keywords, numbers), "punctuator" or "literal"
+    # (strings, templates and regular expressions)
+    kind: str
+    value: str
+    # whether a line break precedes the token
+    newline: bool
+
+
+def _skip_string(source: str, start: int) -> int:
+    quote: str = source[start]
+    i: int = start + 1
+    while i < len(source):
+        char = source[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == quote:
+            return i + 1
+        if char == "\n":
+            break
+        i += 1
+    raise ValueError(f"Unterminated string at position {start}.")
+
+
+def _skip_template(source: str, start: int) -> int:
+    i: int = start + 1
+    while i < len(source):
+        char = source[i]
+        if char == "\\":
+            i += 2
+        elif char == "`":
+            return i + 1
+        elif source.startswith("${", i):
+            i = _skip_expression(source, i + 2)
+        else:
+            i += 1
+    raise ValueError(f"Unterminated template literal at position {start}.")
+
+
+def _skip_expression(source: str, start: int) -> int:
+    """
+    Skip the expression of a template placeholder, up to (and
+    including) its closing brace.
+    """
+    depth: int = 1
+    i: int = start
+    while i < len(source):
+        char = source[i]
+        if char in "'\"":
+            i = _skip_string(source, i)
+        elif char == "`":
+            i = _skip_template(source, i)
+        elif char == "{":
+            depth += 1
+            i += 1
+        elif char == "}":
+            depth -= 1
+            i += 1
+            if depth == 0:
+                return i
+        else:
+            i += 1
+    raise ValueError(f"Unterminated template placeholder at position {start}.")
+
+
+def _skip_regex(source: str, start: int) -> int:
+    i: int = start + 1
+    in_class: bool = False
+    while i < len(source):
+        char = source[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "\n":
+            break
+        if char == "[":
+            in_class = True
+        elif char == "]":
+            in_class = False
+        elif char == "/" and not in_class:
+            flags = _WORD.match(source, i + 1)
+            return flags.end() if flags else i + 1
+        i += 1
+    raise ValueError(f"Unterminated regular expression at position {start}.")
+
+
+def _regex_allowed(previous: Token | None) -> bool:
+    if previous is None:
+        return True
+    if previous.kind == "word":
+        return previous.value in _KEYWORDS_BEFORE_EXPRESSION
+    if previous.kind == "literal":
+        return False
+    return previous.value not in {")", "]", "}"}
+
+
+def tokenize(source: str) -> list[Token]:
+    """
+    Split JavaScript source code into tokens, dropping comments and
+    whitespace.
+
+    Args:
+        source: JavaScript source code.
+
+    Returns:
+        The list of tokens.
+    """
+    tokens: list[Token] = []
+    newline: bool = False
+    i: int = 0
+    while i < len(source):
+        char = source[i]
+        if char in " \t\r\n\f\v\ufeff":
+            newline = newline or char == "\n"
+            i += 1
+            continue
+        if source.startswith("//", i):
+            end = source.find("\n", i)
+            i = len(source) if end == -1 else end
+            continue
+        if source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            if end == -1:
+                raise ValueError(f"Unterminated comment at position {i}.")
+            newline = newline or "\n" in source[i:end]
+            i = end + 2
+            continue
+
+        previous: Token | None = tokens[-1] if tokens else None
+        if char in "'\"":
+            end, kind = _skip_string(source, i), "literal"
+        elif char == "`":
+            end, kind = _skip_template(source, i), "literal"
+        elif char == "/" and _regex_allowed(previous):
+            end, kind = _skip_regex(source, i), "literal"
+        elif (number := _NUMBER.match(source, i)) and number.end() > i:
+            end, kind = number.end(), "word"
+        elif _IDENTIFIER_CHARS.match(char) or not char.isascii():
+            end = i + 1
+            while end < len(source) and (
+                _IDENTIFIER_CHARS.match(source[end]) or not source[end].isascii()
+            ):
+                end += 1
+            kind = "word"
+        else:
+            punctuator = next(
+                (p for p in _PUNCTUATORS if source.startswith(p, i)), None
+            )
+            if punctuator is None:
+                raise ValueError(f"Unexpected character {char!r} at position {i}.")
+            end, kind = i + len(punctuator), "punctuator"
+
+        tokens.append(Token(kind, source[i:end], newline))
+        newline = False
+        i = end
+    return tokens
+
+
+def _strip_logging(tokens: list[Token]) -> list[Token]:
+    """
+    Remove `console.log(...)` calls. Calls used as statements are
+    removed entirely, other ones are replaced by `void 0`.
+    """
+    result: list[Token] = []
+    i: int = 0
+    while i < len(tokens):
+        is_log: bool = [token.value for token in tokens[i : i + 4]] == _LOG_CALL and (
+            i == 0 or tokens[i - 1].value != "."
+        )
+        if not is_log:
+            result.append(tokens[i])
+            i += 1
+            continue
+
+        depth: int = 0
+        end: int = i + 3
+        while end < len(tokens):
+            if tokens[end].value in ("(", "[", "{"):
+                depth += 1
+            elif tokens[end].value in (")", "]", "}"):
+                depth -= 1
+                if depth == 0:
+                    break
+            end += 1
+        end += 1
+
+        statement_start: bool = not result or result[-1].value in (";", "{", "}")
+        if statement_start and end < len(tokens) and tokens[end].value == ";":
+            end += 1
+        elif statement_start and (end >= len(tokens) or tokens[end].value == "}"):
+            pass
+        else:
+            result.append(Token("word", "void", tokens[i].newline))
+            result.append(Token("word", "0", False))
+        i = end
+    return result
+
+
+def _needs_space(previous: Token, token: Token) -> bool:
+    if previous.kind == "word" and token.kind == "word":
+        return True
+    # `a + +b`, `a - -b`, `a + ++b`...
+    if previous.kind == "punctuator" and token.kind == "punctuator":
+        return previous.value[-1] in "+-" and token.value[0] == previous.value[-1]
+    # `1 .toString()`, as `1.` would be read as a number
+    if previous.kind == "word" and token.value == ".":
+        return previous.value[0].isdigit() and not any(
+            char in previous.value for char in ".eE"
+        )
+    # `a / /re/`
+    return previous.value == "/" and token.value.startswith("/")
+
+
+def _keep_newline(previous: Token, token: Token) -> bool:
+    """
+    Whether a line break between two tokens must be kept because
+    automatic semicolon insertion may depend on it.
+    """
+    return not (
+        (previous.kind == "punctuator" and previous.value in _OPEN_PUNCTUATORS)
+        or (token.kind == "punctuator" and token.value in _CONTINUING_PUNCTUATORS)
+    )
+
+
+def minify_js(source: str, strip_logging: bool = False) -> str:
+    """
+    Minify JavaScript source code: comments and whitespace are
+    removed, and line breaks are only kept where automatic semicolon
+    insertion may depend on them. Names are left untouched.
+
+    Args:
+        source: JavaScript source code.
+        strip_logging: Whether to also remove `console.log()` calls.
+
+    Returns:
+        The minified source code.
+
+    Examples:
+        ```python
+        from plotjs.minify import minify_js
+
+        minify_js("const answer = 42; // comment\\nconsole.log(answer);")
+        # 'const answer=42;console.log(answer);'
+        ```
+    """
+    tokens: list[Token] = tokenize(source)
+    if strip_logging:
+        tokens = _strip_logging(tokens)
+
+    parts: list[str] = []
+    previous: Token | None = None
+    for token in tokens:
+        if previous is not None:
+            if token.newline and _keep_newline(previous, token):
+                parts.append("\n")
+            elif _needs_space(previous, token):
+                parts.append(" ")
+        parts.append(token.value)
+        previous = token
+    return "".join(parts)
@@ -0,0 +1,196 @@
+from collections.abc import Iterator
+
+import numpy as np
+from matplotlib.collections import PathCollection
+from matplotlib.path import Path
+from matplotlib.transforms import IdentityTransform
+
+# maximum number of (marker, occluder) pairs compared at once
+_MAX_PAIRS: int = 1 << 20
+
+# SVG renderers draw with 72 units per inch
+_SVG_DPI: float = 72.0
+
+
+def _distance_to_segments(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Distance from the origin to each segment `starts[i] -> ends[i]`.
+    """
+    directions = ends - starts
+    lengths = np.einsum("ij,ij->i", directions, directions)
+    t = np.divide(
+        -np.einsum("ij,ij->i", starts, directions),
+        lengths,
+        out=np.zeros_like(lengths),
+        where=lengths > 0,
+    )
+    closest = starts + np.clip(t, 0, 1)[:, None] * directions
+    return np.hypot(closest[:, 0], closest[:, 1])
+
+
+def _marker_radii(path: Path) -> tuple[float, float]:
+    """
+    Radius of the circle containing a marker path, and of the circle
+    centered on the origin that its filled area contains (0 when the
+    path is not closed, or does not contain the origin).
+    """
+    polygons = path.to_polygons(closed_only=False)
+    if not polygons:
+        return 0.0, 0.0
+    vertices = np.concatenate(polygons)
+    outer = float(np.hypot(vertices[:, 0], vertices[:, 1]).max())
+
+    codes = path.codes
+    if codes is None or Path.CLOSEPOLY not in codes:
+        return outer, 0.0
+    if not path.contains_point((0, 0)):
+        return outer, 0.0
+    inner = min(
+        float(_distance_to_segments(polygon, np.roll(polygon, -1, axis=0)).min())
+        for polygon in polygons
+        if len(polygon) > 1
+    )
+    return outer, inner
+
+
+def _cyclic(values, n: int) -> np.ndarray:
+    values = np.asarray(values, dtype=float)
+    if not len(values):
+        values = np.zeros((1,) + values.shape[1:])
+    return values[np.arange(n) % len(values)]
+
+
+def _candidate_pairs(
+    centers: np.ndarray, occluders: np.ndarray, cell: float
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """
+    Yield, by chunks, the pairs `(marker, occluder)` of markers and
+    occluders (indices in `centers`) in neighboring cells of a grid of
+    `cell` wide cells, which include all the pairs of centers less than
+    `cell` apart.
+    """
+    cells = np.floor(centers / cell).astype(np.int64)
+    cells -= cells.min(axis=0)
+    height: int = int(cells[:, 1].max()) + 3
+    keys = (cells[:, 0] + 1) * height + cells[:, 1] + 1
+
+    order = occluders[np.argsort(keys[occluders], kind="stable")]
+    sorted_keys = keys[order]
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            targets = keys + dx * height + dy
+            lo = np.searchsorted(sorted_keys, targets, side="left")
+            counts = np.searchsorted(sorted_keys, targets, side="right") - lo
+            markers = np.flatnonzero(counts)
+            cumulative = np.cumsum(counts[markers])
+            start: int = 0
+            while start < len(markers):
+                limit = cumulative[start] - counts[markers[start]] + _MAX_PAIRS
+                stop = max(
+                    int(np.searchsorted(cumulative, limit, side="right")), start + 1
+                )
+                chunk = markers[start:stop]
+                start = stop
+                chunk_counts = counts[chunk]
+                # position of each pair among the pairs of its marker
+                ranks = np.arange(chunk_counts.sum()) - np.repeat(
+                    np.cumsum(chunk_counts) - chunk_counts, chunk_counts
+                )
+                yield (
+                    np.repeat(chunk, chunk_counts),
+                    order[np.repeat(lo[chunk], chunk_counts) + ranks],
+                )
+
+
+def occluded_markers(artist: PathCollection, renderer) -> np.ndarray:
+    """
+    Find the markers of a scatter plot that are fully hidden by
+    markers of the same scatter plot drawn on top of them (the ones
+    that come after them), at the resolution of the export.
+
+    A marker is hidden when it is inside the filled area of an opaque
+    marker drawn after it, up to half a pixel at the DPI of the export.
+    Markers hidden by several other ones together are kept.
+
+    Must be called while the figure is drawn by the SVG renderer.
+
+    Args:
+        artist: A scatter plot (see `plotjs.canvas.supports_canvas()`).
+        renderer: The SVG renderer drawing the figure.
+
+    Returns:
+        A boolean mask, `True` for the hidden markers, parallel to the
+        offsets of the scatter plot.
+    """
+    offsets = np.asarray(artist.get_offsets(), dtype=float).reshape(-1, 2)
+    n: int = len(offsets)
+    hidden = np.zeros(n, dtype=bool)
+    paths = artist.get_paths()
+    if n < 2 or not paths or not isinstance(artist.get_transform(), IdentityTransform):
+        return hidden
+
+    artist.update_scalarmappable()
+    artist.set_sizes(artist.get_sizes(), artist.figure.dpi)
+    transforms = artist.get_transforms()
+    if len(transforms):
+        # only markers scaled the same way on both axes
+        if not (
+            np.allclose(transforms[:, 0, 1], 0)
+            and np.allclose(transforms[:, 1, 0], 0)
+            and np.allclose(transforms[:, 0, 0], transforms[:, 1, 1])
+        ):
+            return hidden
+        scales = _cyclic(np.abs(transforms[:, 0, 0]), n)
+    else:
+        scales = np.ones(n)
+
+    centers = artist.get_offset_transform().transform(offsets)
+    drawn = np.isfinite(centers).all(axis=1)
+
+    radii = np.array([_marker_radii(path) for path in paths])
+    path_index = np.arange(n) % len(paths)
+    linewidths = np.asarray(
+        renderer.points_to_pixels(_cyclic(artist.get_linewidths(), n))
+    )
+    face_alpha = _cyclic(np.reshape(artist.get_facecolor(), (-1, 4)), n)[:, 3]
+    edge_alpha = _cyclic(np.reshape(artist.get_edgecolor(), (-1, 4)), n)[:, 3]
+
+    # strokes may extend beyond half their width at sharp corners
+    # (up to the miter limit of SVG, 4)
+    joinstyle = artist.get_joinstyle()
+    stroke_extent = 0.5 if joinstyle in (None, "round") else 2.0
+    extents = radii[path_index, 0] * scales + np.where(
+        edge_alpha > 0, linewidths * stroke_extent, 0
+    )
+    # an opaque stroke covers half its width outside of the filled area
+    covers = np.where(
+        face_alpha >= 1,
+        radii[path_index, 1] * scales
+        + np.where((edge_alpha >= 1) & (linewidths > 0), linewidths / 2, 0),
+        0,
+    )
+
+    dpi = getattr(renderer, "dpi", None) or _SVG_DPI
+    tolerance: float = 0.5 * _SVG_DPI / dpi
+    occluders = np.flatnonzero(drawn & (covers > 0))
+    if not len(occluders):
+        return hidden
+
+    centers = np.where(drawn[:, None], centers, 0.0)
+    # farthest an occluder can be from a marker it covers
+    cell: float = max(float(covers.max() - extents[drawn].min()) + tolerance, tolerance)
+    for markers, others in _candidate_pairs(centers, occluders, cell):
+        keep = (others > markers) & drawn[markers]
+        markers, others = markers[keep], others[keep]
+        distances = np.hypot(*(centers[markers] - centers[others]).T)
+        covered = distances + extents[markers] <= covers[others] + tolerance
+        # markers identical to an opaque marker drawn on top of them
+        covered |= (
+            (path_index[markers] == path_index[others])
+            & np.isclose(scales[markers], scales[others])
+            & (linewidths[markers] <= linewidths[others])
+            & ((linewidths[others] == 0) | (edge_alpha[others] >= 1))
+            & (distances <= tolerance)
+        )
+        hidden[markers[covered]] = True
+    return hidden
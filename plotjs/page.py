@@ -0,0 +1,310 @@
+import os
+import tempfile
+import webbrowser
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Literal
+
+from plotjs import assets as _assets
+from plotjs import profiling
+from plotjs.plotjs import (
+    DEFAULT_DOCUMENT_TITLE,
+    DEFAULT_FAVICON_PATH,
+    HTML_CHUNK_SIZE,
+    PlotJS,
+)
+from plotjs.profiling import ExportProfile
+from plotjs.utils import _buffered
+
+# placeholder rendered by the template where the charts are streamed
+_CHARTS_PLACEHOLDER = "\x00plotjs-charts\x00"
+
+
+def _unique(values: Iterable[str]) -> list[str]:
+    return list(dict.fromkeys(value for value in values if value))
+
+
+class Page:
+    """
+    Build a single HTML page containing several interactive charts.
+    """
+
+    def __init__(
+        self,
+        document_title: str = DEFAULT_DOCUMENT_TITLE,
+        favicon_path: str = DEFAULT_FAVICON_PATH,
+        profile_callback: Callable[[ExportProfile], None] | None = None,
+    ):
+        """
+        Initiate a `Page`, to which charts and HTML are then added.
+
+        The JavaScript parser and the default CSS are included once
+        for the whole page, and each chart only adds its SVG, a small
+        JSON configuration and its own additional CSS/JavaScript
+        (identical snippets are only included once). The size of the
+        page grows with the content of the charts only.
+
+        Args:
+            document_title: String used for the page title (the title
+                tag inside the head of the html document).
+            favicon_path: Path to a favicon file, remote or local.
+                The default is the logo of plotjs.
+            profile_callback: A function called with the `ExportProfile`
+                of each export of the page. The profile of the last
+                export is also stored in the `profile` attribute.
+
+        Examples:
+            ```python
+            from plotjs import Page, PlotJS
+
+            (
+                Page(document_title="My dashboard")
+                .add_html("<h1>Sales</h1>")
+                .add(PlotJS(fig1).add_tooltip(labels=labels1))
+                .add(PlotJS(fig2).add_tooltip(labels=labels2))
+                .save("dashboard.html")
+            )
+            ```
+        """
+        self._document_title = document_title
+        self._favicon_path = favicon_path
+        self._items: list[PlotJS | str] = []
+        self._profile_callback = profile_callback
+        self.profile: ExportProfile | None = None
+
+    @property
+    def charts(self) -> list[PlotJS]:
+        """
+        The charts of the page, in order.
+        """
+        return [item for item in self._items if isinstance(item, PlotJS)]
+
+    def add(self, *plots: PlotJS) -> "Page":
+        """
+        Add one or several charts to the page.
+
+        Args:
+            plots: `PlotJS` instances.
+
+        Returns:
+            self: Returns the instance to allow method chaining.
+        """
+        for plot in plots:
+            if not isinstance(plot, PlotJS):
+                raise TypeError(
+                    f"Expected a PlotJS instance, got {type(plot).__name__}."
+                )
+            if any(plot is chart for chart in self.charts):
+                raise ValueError("This chart has already been added to the page.")
+            self._items.append(plot)
+        return self
+
+    def add_html(self, html: str) -> "Page":
+        """
+        Add raw HTML to the page (titles, text, layout...), between
+        the charts.
+
+        Args:
+            html: HTML to include, as a string.
+
+        Returns:
+            self: Returns the instance to allow method chaining.
+        """
+        self._items.append(html)
+        return self
+
+    def save(
+        self,
+        file_path: str,
+        assets: Literal["inline", "external"] = "inline",
+        asset_dir: str | None = None,
+        production: bool = False,
+    ) -> "Page":
+        """
+        Save the page to an HTML file.
+
+        Args:
+            file_path: Where to save the HTML file. If the ".html"
+                extension is missing, it's added.
+            assets: How to include the JavaScript parser and the default
+                CSS. With `"inline"` (default), they are part of the HTML
+                file. With `"external"`, they are written to
+                `plotjs-<hash>.js` and `plotjs-<hash>.css` files that
+                the HTML file references. Since file names change with
+                the content, these files can be cached by browsers and
+                shared by all the charts of a website.
+            asset_dir: Where to write the files when `assets="external"`.
+                If `None` (default), they are written next to the HTML
+                file.
+            production: Whether to minify the JavaScript parser and
+                remove its logging (kept if a chart was created with
+                `_debug=True`).
+
+        Returns:
+            self: Returns the instance to allow method chaining.
+        """
+        if assets not in ("inline", "external"):
+            raise ValueError(
+                f"`assets` must be either 'inline' or 'external', not '{assets}'."
+            )
+
+        if not file_path.endswith(".html"):
+            file_path += ".html"
+
+        profile: ExportProfile = ExportProfile()
+        asset_urls: dict[str, str] = {}
+        if assets == "external":
+            html_dir: str = os.path.dirname(os.path.abspath(file_path))
+            if asset_dir is None:
+                asset_dir = html_dir
+            with profile.stage("assets"):
+                js: _assets.ExternalAsset = _assets.get_external_js(
+                    production, self._debug
+                )
+                css: _assets.ExternalAsset = _assets.get_external_css()
+            profile.add_size("js", js.content)
+            profile.add_size("css", css.content)
+            for name, asset in (("js_url", js), ("css_url", css)):
+                with profile.stage("write"):
+                    path: str = _assets.write_external_asset(asset, asset_dir)
+                asset_urls[name] = Path(os.path.relpath(path, html_dir)).as_posix()
+
+        with open(file_path, "w", encoding="utf-8") as f:
+            for chunk in _buffered(
+                self._iter_html_parts(
+                    HTML_CHUNK_SIZE, production, profile=profile, **asset_urls
+                ),
+                HTML_CHUNK_SIZE,
+            ):
+                with profile.stage("write"):
+                    f.write(chunk)
+        self._record_profile(profile)
+
+        self._file_path = os.path.abspath(file_path)
+        return self
+
+    def as_html(self, production: bool = False) -> str:
+        """
+        Retrieve the page as an HTML string.
+
+        Args:
+            production: Whether to minify the JavaScript parser and
+                remove its logging.
+
+        Returns:
+            A string with all the HTML of the page.
+        """
+        self.html: str = "".join(self.iter_html(production=production))
+        return self.html
+
+    def iter_html(
+        self, chunk_size: int = HTML_CHUNK_SIZE, production: bool = False
+    ) -> Iterator[str]:
+        """
+        Iterate over the HTML of the page, chunk by chunk, without
+        building the whole document in memory.
+
+        Args:
+            chunk_size: Approximate size (in characters) of the
+                yielded chunks.
+            production: Whether to minify the JavaScript parser and
+                remove its logging.
+
+        Returns:
+            An iterator of strings that, joined, form the HTML document.
+        """
+        profile: ExportProfile = ExportProfile()
+        yield from _buffered(
+            self._iter_html_parts(chunk_size, production, profile=profile),
+            chunk_size,
+        )
+        self._record_profile(profile)
+
+    def show(self) -> "Page":
+        """
+        Open the HTML file in the default browser. If the page hasn't
+        been saved yet, it will be saved to a temporary file.
+
+        Returns:
+            self: Returns the instance to allow method chaining.
+        """
+        if not hasattr(self, "_file_path"):
+            temp_fd, temp_path = tempfile.mkstemp(suffix=".html")
+            os.close(temp_fd)
+            self.save(temp_path)
+
+        webbrowser.open(f"file://{self._file_path}")
+        return self
+
+    def _chart_ids(self) -> dict[int, str]:
+        # charts have reproducible ids, which are the same for all of
+        # them: the ones already taken get the position of the chart
+        ids: dict[int, str] = {}
+        for position, chart in enumerate(self.charts, start=1):
+            chart_id: str = str(chart._uuid)
+            if chart_id in ids.values():
+                chart_id = f"{chart_id}-{position}"
+            ids[id(chart)] = chart_id
+        return ids
+
+    @property
+    def _debug(self) -> bool:
+        # logging is kept if any chart is debugged
+        return any(chart._debug for chart in self.charts)
+
+    def _record_profile(self, profile: ExportProfile) -> None:
+        self.profile = profile
+        profiling.record(profile, self._profile_callback)
+
+    def _iter_html_parts(
+        self,
+        chunk_size: int,
+        production: bool = False,
+        js_url: str | None = None,
+        css_url: str | None = None,
+        profile: ExportProfile | None = None,
+    ) -> Iterator[str]:
+        profile = profile or ExportProfile()
+        charts: list[PlotJS] = self.charts
+        with profile.stage("assets"):
+            template = _assets.get_template()
+            default_css: str | None = None if css_url else _assets.get_default_css()
+            js_bootstrap: str | None = (
+                None if js_url else _assets.get_js_bootstrap(production, self._debug)
+            )
+        additional_css: str = "\n".join(_unique(c.additional_css for c in charts))
+        additional_javascript: list[str] = _unique(
+            c.additional_javascript for c in charts
+        )
+        profile.add_size("css", (default_css or "") + additional_css)
+        profile.add_size("js", (js_bootstrap or "") + "".join(additional_javascript))
+
+        chunks: Iterator[str] = profile.iterate(
+            "template",
+            template.generate(
+                default_css=default_css,
+                js_bootstrap=js_bootstrap,
+                js_url=js_url,
+                css_url=css_url,
+                additional_css=additional_css,
+                additional_javascript=additional_javascript,
+                charts=_CHARTS_PLACEHOLDER,
+                favicon_path=self._favicon_path,
+                document_title=self._document_title,
+            ),
+        )
+        for chunk in chunks:
+            if chunk != _CHARTS_PLACEHOLDER:
+                profile.add_size("total", chunk)
+                yield chunk
+                continue
+            chart_ids: dict[int, str] = self._chart_ids()
+            for item in self._items:
+                parts: Iterable[str] = (
+                    item._iter_chart_parts(chunk_size, profile, chart_ids[id(item)])
+                    if isinstance(item, PlotJS)
+                    else [item]
+                )
+                for part in parts:
+                    profile.add_size("total", part)
+                    yield part
@@ -1,31 +1,84 @@
 import os
-import io
 import random
 import uuid
 import webbrowser
 import tempfile
 import warnings
-from typing import Optional
+from collections.abc import Callable, Iterator
+from typing import Literal, Optional
 
 import numpy as np
-from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
-from narwhals.typing import SeriesT
+from narwhals.typing import FrameT, SeriesT
 import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
 from matplotlib.axes import Axes
 
-from plotjs.utils import _vector_to_list, _get_and_sanitize_js
-from plotjs import css, javascript
+from plotjs.utils import (
+    _dictionary_encode,
+    _drop_indices,
+    _frame_to_columns,
+    _buffered,
+    _iter_json,
+    _parse_template,
+    _vectors_to_lists,
+)
+from plotjs import assets as _assets
+from plotjs import css, javascript, rendering
+from plotjs.profiling import ExportProfile
+from plotjs.svg import SVGOptimization, iter_tagged_svg
 
-MAIN_DIR: str = Path(__file__).parent
-TEMPLATE_DIR: str = MAIN_DIR / "static"
-CSS_PATH: str = os.path.join(TEMPLATE_DIR, "default.css")
-JS_PARSER_PATH: str = os.path.join(TEMPLATE_DIR, "plotparser.js")
 DEFAULT_FAVICON_PATH = "https://github.com/JosephBARBIERDARNAL/static/blob/main/python-libs/plotjs/favicon.ico?raw=true"
 DEFAULT_DOCUMENT_TITLE = "Made with plotjs"
+HTML_CHUNK_SIZE: int = 1 << 16
 
-env: Environment = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
+# placeholders rendered by the template where the (potentially huge)
+# SVG and JSON payload must be streamed
+_SVG_PLACEHOLDER = "\x00plotjs-svg\x00"
+_PLOT_DATA_PLACEHOLDER = "\x00plotjs-plot-data\x00"
+
+# options of `add_tooltip()` only used when rendering the figure, kept
+# out of the payload
+_RENDER_ONLY_OPTIONS: tuple[str, ...] = ("thin_occluded", "downsample_lines")
+
+
+def _thin_tooltip(axe_tooltip: dict, removed: list[int]) -> dict:
+    # labels and groups of the points left out of the SVG are dropped,
+    # so that they stay aligned with the remaining points
+    if not removed or (
+        axe_tooltip["on"] is not None and "point" not in axe_tooltip["on"]
+    ):
+        return axe_tooltip
+    labels: list | dict = axe_tooltip["tooltip_labels"]
+    if isinstance(labels, dict):
+        labels = {
+            **labels,
+            "columns": {
+                field: _drop_indices(values, removed)
+                for field, values in labels["columns"].items()
+            },
+            "length": labels["length"]
+            - sum(index < labels["length"] for index in removed),
+        }
+    else:
+        labels = _drop_indices(labels, removed)
+    return {
+        **axe_tooltip,
+        "tooltip_labels": labels,
+        "tooltip_groups": _drop_indices(axe_tooltip["tooltip_groups"], removed),
+    }
+
+
+def _encode_labels(labels: list | dict) -> list | dict:
+    if isinstance(labels, dict):
+        # tooltip template: encode each column
+        return {
+            **labels,
+            "columns": {
+                field: _dictionary_encode(values)
+                for field, values in labels["columns"].items()
+            },
+        }
+    return _dictionary_encode(labels)
 
 
 class PlotJS:
@@ -36,6 +89,11 @@ class PlotJS:
     def __init__(
         self,
         fig: Figure | None = None,
+        optimize_svg: bool = False,
+        precision: int = 2,
+        rasterize_static: bool = False,
+        raster_dpi: float | None = None,
+        profile_callback: Callable[[ExportProfile], None] | None = None,
         _debug: bool = False,
         **savefig_kws: dict,
     ):
@@ -43,34 +101,75 @@ class PlotJS:
         Initiate an `PlotJS` instance to convert matplotlib
         figures to interactive charts.
 
+        The figure is rendered to SVG only when the HTML is built
+        (by `save()`, `as_html()`...). Renders are cached: several
+        `PlotJS` instances of a figure that did not change since its
+        last render (e.g. with different tooltips) share the same SVG.
+
         Args:
             fig: An optional matplotlib figure. If None, uses `plt.gcf()`.
+            optimize_svg: Whether to shrink the SVG before embedding it:
+                coordinates are rounded, whitespace, metadata and
+                duplicated definitions are removed. The number of bytes
+                saved is stored in the `svg_optimization` attribute.
+            precision: Number of decimals kept for coordinates when
+                `optimize_svg=True`.
+            rasterize_static: Whether to render all the elements that are
+                not interactive (background, spines, axis, gridlines,
+                texts, images...) into a single PNG image placed below
+                the interactive ones (points, lines, bars, areas, pies
+                and legends), that stay as SVG. This makes the output
+                size and the browser rendering cost depend only on the
+                interactive elements. Note that texts and annotations
+                are then drawn below the data.
+            raster_dpi: Resolution of the image when `rasterize_static=True`.
+                If `None` (default), uses the `dpi` passed to savefig, or
+                the resolution of the figure.
+            profile_callback: A function called with the `ExportProfile`
+                of each export (`save()`, `as_html()`, `iter_html()`),
+                e.g. to send timings to a metrics system. The profile
+                of the last export is also stored in the `profile`
+                attribute.
             savefig_kws: Additional keyword arguments passed to `plt.savefig()`.
+
+        Examples:
+            ```python
+            plot = PlotJS(fig, optimize_svg=True, precision=1)
+            plot.svg_optimization.saved_bytes
+            ```
+
+            ```python
+            PlotJS(fig, rasterize_static=True, raster_dpi=200)
+            ```
+
+            ```python
+            plot = PlotJS(fig).save("index.html")
+            plot.profile.stages["render"].wall
+            plot.profile.sizes["svg"]
+            ```
         """
         if fig is None:
             fig: Figure = plt.gcf()
-        buf: io.StringIO = io.StringIO()
-
-        # temporary change svg hashsalt and id for reproductibility
-        # https://github.com/y-sunflower/plotjs/issues/54
-        old_svg_hashsalt = plt.rcParams["svg.hashsalt"]
-        old_svg_id = plt.rcParams["svg.id"]
-        try:
-            plt.rcParams["svg.hashsalt"] = "svg-hashsalt"
-            plt.rcParams["svg.id"] = "svg-id"
-            fig.savefig(buf, format="svg", **savefig_kws)
-
-            if _debug:
-                fig.savefig("debug-plotjs.svg", **savefig_kws)
-        finally:
-            plt.rcParams["svg.hashsalt"] = old_svg_hashsalt
-            plt.rcParams["svg.id"] = old_svg_id
-
-        buf.seek(0)
-        self._svg_content = buf.getvalue()
+
+        # the figure is rendered when the SVG is first needed
+        self._fig: Figure = fig
+        self._render_options: dict = {
+            "optimize": optimize_svg,
+            "precision": precision,
+            "rasterize_static": rasterize_static,
+            "raster_dpi": raster_dpi,
+            "savefig_kws": savefig_kws,
+        }
+        self._debug: bool = _debug
+        self._profile_callback = profile_callback
+        self.profile: ExportProfile | None = None
+        # timings of the tooltip data, reported by the next export
+        self._data_profile: ExportProfile = ExportProfile()
 
         self._axes: list[Axes] = fig.get_axes()
 
+        # reproducible from one run to another (charts sharing a page
+        # get unique ids there, see `Page`)
         rnd = random.Random(22022001)
         self._uuid = uuid.UUID(int=rnd.getrandbits(128))
 
@@ -79,25 +178,90 @@ class PlotJS:
         self._hover_nearest = False
         self._favicon_path = DEFAULT_FAVICON_PATH
         self._document_title = DEFAULT_DOCUMENT_TITLE
-        self._template = env.get_template("template.html")
+        self._template = _assets.get_template(_assets.CHART_TEMPLATE_NAME)
+
+    def _render(self, profile: ExportProfile | None = None) -> rendering.Render:
+        # scatter plots of these axes are drawn on a canvas by the parser
+        canvas_axes: tuple[int, ...] = tuple(
+            int(axes_class.removeprefix("axes_")) - 1
+            for axes_class, axe_tooltip in getattr(self, "_axes_tooltip", {}).items()
+            if axe_tooltip.get("render") == "canvas"
+        )
+        # hidden markers of scatter plots of these axes are left out
+        thin_axes: tuple[int, ...] = tuple(
+            int(axes_class.removeprefix("axes_")) - 1
+            for axes_class, axe_tooltip in getattr(self, "_axes_tooltip", {}).items()
+            if axe_tooltip.get("thin_occluded")
+        )
+        # lines of these axes are downsampled
+        downsample_axes: tuple[int, ...] = tuple(
+            int(axes_class.removeprefix("axes_")) - 1
+            for axes_class, axe_tooltip in getattr(self, "_axes_tooltip", {}).items()
+            if axe_tooltip.get("downsample_lines")
+        )
+        # positions are needed by `hover_nearest`, and the manifest by
+        # the axes with a tooltip (the parser recognizes the elements
+        # of the other ones from the SVG)
+        record_elements: bool = any(
+            axe_tooltip["hover_nearest"] == "true"
+            or axe_tooltip["tooltip_labels"]
+            or axe_tooltip["tooltip_groups"]
+            for axe_tooltip in getattr(self, "_axes_tooltip", {}).values()
+        )
+        with (profile or ExportProfile()).stage("render"):
+            render = rendering.get_svg(
+                self._fig,
+                canvas_axes=canvas_axes,
+                thin_axes=thin_axes,
+                downsample_axes=downsample_axes,
+                record_elements=record_elements,
+                **self._render_options,
+            )
+        if self._debug:
+            with open("debug-plotjs.svg", "w", encoding="utf-8") as f:
+                f.write(render.svg)
+        return render
 
-        with open(CSS_PATH) as f:
-            self._default_css = f.read()
+    @property
+    def _svg_content(self) -> str:
+        return self._render().svg
 
-        self._js_parser = _get_and_sanitize_js(
-            file_path=JS_PARSER_PATH,
-            after_pattern=r"class Selection.*",
-        )
+    @property
+    def svg_optimization(self) -> SVGOptimization | None:
+        """
+        Size of the SVG before and after optimization, or `None` if
+        `optimize_svg=False`.
+        """
+        if self._render_options["optimize"]:
+            return self._render().optimization
+        return None
+
+    @property
+    def thinned_markers(self) -> dict[str, int]:
+        """
+        Number of markers left out of the SVG because they are hidden
+        by other markers (see `add_tooltip(thin_occluded=True)`), by
+        class of Axes (`"axes_1"`, `"axes_2"`, etc.).
+        """
+        return {
+            axes_class: len(indices)
+            for axes_class, indices in self._render().thinned.items()
+        }
 
     def add_tooltip(
         self,
         *,
         labels: list | tuple | np.ndarray | SeriesT | None = None,
-        groups: list | tuple | np.ndarray | SeriesT | None = None,
+        groups: list | tuple | np.ndarray | SeriesT | str | None = None,
+        data: FrameT | None = None,
+        template: str | None = None,
         tooltip_x_shift: int = 0,
         tooltip_y_shift: int = 0,
         hover_nearest: bool = False,
         on: str | list[str] | None = None,
+        render: Literal["svg", "canvas"] = "svg",
+        thin_occluded: bool = False,
+        downsample_lines: bool = False,
         ax: Axes | None = None,
     ) -> "PlotJS":
         """
@@ -111,7 +275,19 @@ class PlotJS:
                 corresponds to how to 'group' the tooltip. The easiest
                 way to understand this argument is to check the examples
                 below. Also note that the use of this argument is required
-                to 'connect' the legend with plot elements.
+                to 'connect' the legend with plot elements. When `data`
+                is passed, it can also be the name of one of its columns.
+            data: A DataFrame or LazyFrame (any backend supported by
+                narwhals) used with `template`. Only the columns referenced
+                by `template` (and `groups`) are collected.
+            template: A `str.format()` template used to build the labels
+                from the columns of `data`, such as `"{name}: {value:.2f}"`.
+                Values are shipped as columns and the labels are formatted
+                in the browser at hover time, which keeps the output small
+                when labels combine several fields. Supported format specs
+                are `[[fill]align][sign][0][width][,|_][.precision][type]`,
+                with type one of `d`, `e`, `f`, `g`, `s` and `%`. Missing
+                values are displayed as empty strings.
             tooltip_x_shift: Number of pixels to shift the tooltip from
                 the cursor, on the x axis.
             tooltip_y_shift: Number of pixels to shift the tooltip from
@@ -121,6 +297,33 @@ class PlotJS:
                 single element type or a list. Valid values are "point",
                 "line", "bar", "area", "pie (plurals like "points" also
                 accepted). If `None` (default), applies to all element types.
+            render: How to render the points of scatter plots. With
+                `"svg"` (default), each point is an SVG element. With
+                `"canvas"`, points are left out of the SVG and drawn on
+                a canvas in the browser, from compact arrays of
+                positions, sizes and colors. This keeps the output small
+                and the page fast for scatter plots with tens of
+                thousands of points, with the same hover, grouping and
+                tooltip behavior. Custom CSS targeting points (such as
+                `.point`) does not apply to the canvas.
+            thin_occluded: When `True`, markers of scatter plots that
+                are fully hidden by another marker drawn on top of them
+                (at the resolution of the figure) are left out of the
+                output, along with their labels and groups. This keeps
+                dense scatter plots light without changing how they
+                look. `labels` and `groups` must then be the ones of the
+                points. The number of markers left out is reported by
+                `PlotJS.thinned_markers`.
+            downsample_lines: When `True`, lines with more vertices
+                than the width of the axes can show are downsampled
+                (with the Largest-Triangle-Three-Buckets algorithm)
+                before being drawn, which keeps the output small for
+                long time series. Hovering a line then shows the label
+                of its vertex nearest to the mouse: `labels` (or the
+                rows of `data`) are the ones of the vertices of the
+                full-resolution data of the lines, one line after the
+                other. `groups` are still the ones of the lines. Lines
+                with markers or steps are left as is.
             ax: A matplotlib Axes. If `None` (default), uses first Axes.
 
         Returns:
@@ -147,6 +350,14 @@ class PlotJS:
             )
             ```
 
+            ```python
+            PlotJS(...).add_tooltip(
+                data=df,
+                template="<b>{species}</b><br>Sepal length: {sepal_length:.1f}",
+                groups="species",
+            )
+            ```
+
             ```python
             PlotJS(...).add_tooltip(
                 labels=["S&P500", "CAC40", "Sunflower"],
@@ -154,6 +365,28 @@ class PlotJS:
             )
             ```
 
+            ```python
+            PlotJS(...).add_tooltip(
+                labels=labels,  # e.g. 100,000 labels
+                render="canvas",
+            )
+            ```
+
+            ```python
+            PlotJS(...).add_tooltip(
+                labels=labels,  # e.g. 100,000 overlapping points
+                thin_occluded=True,
+            )
+            ```
+
+            ```python
+            PlotJS(...).add_tooltip(
+                data=df,  # e.g. 1,000,000 rows plotted with `ax.plot()`
+                template="{date}: {price:.2f}",
+                downsample_lines=True,
+            )
+            ```
+
             ```python
             PlotJS(...).add_tooltip(
                 labels=["S&P500", "CAC40", "Sunflower"],
@@ -161,8 +394,16 @@ class PlotJS:
             )
             ```
         """
-        if labels is None and groups is None:
+        if template is not None and labels is not None:
+            raise ValueError("`labels` and `template` can't be used together.")
+        if template is not None and data is None:
+            raise ValueError("`data` is required when `template` is passed.")
+        if labels is None and groups is None and template is None:
             warnings.warn("Either `labels` or `groups` must not be `None`.")
+        if render not in ("svg", "canvas"):
+            raise ValueError(
+                f"`render` must be either 'svg' or 'canvas', not '{render}'."
+            )
 
         self._tooltip_x_shift = tooltip_x_shift
         self._tooltip_y_shift = tooltip_y_shift
@@ -207,15 +448,63 @@ class PlotJS:
             ax.get_legend_handles_labels()
         )
 
-        if labels is None:
+        template_parts: list[list] | None = None
+        data_columns: dict[str, list] = {}
+        data_length: int = 0
+        if data is not None:
+            columns: list[str] = []
+            if template is not None:
+                template_parts = _parse_template(template)
+                columns.extend(field for _, field, _ in template_parts if field)
+            if isinstance(groups, str):
+                columns.append(groups)
+            if not columns:
+                raise ValueError(
+                    "When `data` is passed, `template` must be set or `groups` "
+                    "must be a column name."
+                )
+            # only the referenced columns are projected and collected
+            with self._data_profile.stage("data"):
+                data_columns, data_length = _frame_to_columns(
+                    data, list(dict.fromkeys(columns))
+                )
+
+        group_column: list | None = None
+        if isinstance(groups, str) and data is not None:
+            # rows of `data` are kept aligned, missing values included
+            group_column, groups = list(data_columns[groups]), None
+
+        # missing values are dropped from both labels and groups,
+        # so that they stay aligned
+        with self._data_profile.stage("data"):
+            labels, groups = _vectors_to_lists(labels, groups)
+        if group_column is not None:
+            groups = group_column
+
+        if template_parts is not None:
+            # labels are formatted lazily by the parser, from the columns
+            self._tooltip_labels = {
+                "template": template_parts,
+                "columns": {
+                    field: data_columns[field]
+                    for _, field, _ in template_parts
+                    if field
+                },
+                "length": data_length,
+                "extra": list(self._legend_handles_labels),
+            }
+            n_labels: int = data_length + len(self._legend_handles_labels)
+        elif labels is None:
             self._tooltip_labels = []
+            n_labels = 0
         else:
-            self._tooltip_labels = _vector_to_list(labels)
+            self._tooltip_labels = labels
             self._tooltip_labels.extend(self._legend_handles_labels)
+            n_labels = len(self._tooltip_labels)
         if groups is None:
-            self._tooltip_groups = list(range(len(self._tooltip_labels)))
+            self._tooltip_groups = list(range(n_labels))
         else:
-            self._tooltip_groups = _vector_to_list(groups)
+            self._tooltip_groups = groups
             self._tooltip_groups.extend(self._legend_handles_labels)
 
         if not hasattr(self, "_axes_tooltip"):
@@ -229,6 +518,12 @@ class PlotJS:
                 "on": normalized_on,  # None means all elements, otherwise list of element types
             }
         }
+        if render == "canvas":
+            axe_tooltip[f"axes_{axe_idx}"]["render"] = render
+        if thin_occluded:
+            axe_tooltip[f"axes_{axe_idx}"]["thin_occluded"] = True
+        if downsample_lines:
+            axe_tooltip[f"axes_{axe_idx}"]["downsample_lines"] = True
         self._axes_tooltip.update(axe_tooltip)
 
         return self
@@ -361,6 +656,9 @@ class PlotJS:
         file_path: str,
         favicon_path: str = DEFAULT_FAVICON_PATH,
         document_title: str = DEFAULT_DOCUMENT_TITLE,
+        assets: Literal["inline", "external"] = "inline",
+        asset_dir: str | None = None,
+        production: bool = False,
     ) -> "PlotJS":
         """
         Save the interactive matplotlib plots to an HTML file.
@@ -372,6 +670,19 @@ class PlotJS:
                 The default is the logo of plotjs.
             document_title: String used for the page title (the title
                 tag inside the head of the html document).
+            assets: How to include the JavaScript parser and the default
+                CSS. With `"inline"` (default), they are part of the HTML
+                file. With `"external"`, they are written to
+                `plotjs-<hash>.js` and `plotjs-<hash>.css` files that
+                the HTML file references. Since file names change with
+                the content, these files can be cached by browsers and
+                shared by all the charts of a website.
+            asset_dir: Where to write the files when `assets="external"`.
+                If `None` (default), they are written next to the HTML
+                file.
+            production: Whether to minify the JavaScript parser and
+                remove its logging, for smaller files. Logging is kept
+                when the instance was created with `_debug=True`.
 
         Returns:
             The instance itself to allow method chaining.
@@ -384,28 +695,49 @@ class PlotJS:
             ```python
             PlotJS(...).save("path/to/my_chart.html")
             ```
+
+            ```python
+            # all charts share "site/static/plotjs-<hash>.js"
+            PlotJS(...).save(
+                "site/charts/sales.html",
+                assets="external",
+                asset_dir="site/static",
+            )
+            ```
+
+            ```python
+            PlotJS(...).save("index.html", production=True)
+            ```
         """
+        from plotjs.page import Page
+
         self._favicon_path = favicon_path
         self._document_title = document_title
 
-        self._set_html()
-
-        if not file_path.endswith(".html"):
-            file_path += ".html"
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(self.html)
+        page = Page(
+            document_title=document_title,
+            favicon_path=favicon_path,
+            profile_callback=self._set_profile,
+        )
+        page.add(self).save(
+            file_path, assets=assets, asset_dir=asset_dir, production=production
+        )
 
         # store the file path for later use (e.g., show() method)
-        self._file_path = os.path.abspath(file_path)
+        self._file_path = page._file_path
 
         return self
 
-    def as_html(self) -> str:
+    def as_html(self, production: bool = False) -> str:
         """
         Retrieve the interactive plot as an HTML string.
         This can be useful to display the plot in
         environment such as marimo, or do advanced customization.
 
+        Args:
+            production: Whether to minify the JavaScript parser and
+                remove its logging (see `save()`).
+
         Returns:
             A string with all the HTML of the plot.
 
@@ -426,9 +758,48 @@ class PlotJS:
             mo.iframe(html_plot)
             ```
         """
-        self._set_html()
+        self._set_html(production)
         return self.html
 
+    def iter_html(
+        self, chunk_size: int = HTML_CHUNK_SIZE, production: bool = False
+    ) -> Iterator[str]:
+        """
+        Iterate over the HTML of the interactive plot, chunk by chunk.
+        Unlike `as_html()`, the whole document is never built in
+        memory, which keeps memory usage low for very large figures.
+        This is what `save()` uses under the hood, and it can be used
+        to stream a response from a web server.
+
+        Args:
+            chunk_size: Approximate size (in characters) of the
+                yielded chunks.
+            production: Whether to minify the JavaScript parser and
+                remove its logging (see `save()`).
+
+        Returns:
+            An iterator of strings that, joined, form the HTML document.
+
+        Examples:
+            ```python
+            from flask import Flask, Response
+
+            app = Flask(__name__)
+
+            @app.route("/chart")
+            def chart():
+                return Response(PlotJS(fig).iter_html(), mimetype="text/html")
+            ```
+        """
+        from plotjs.page import Page
+
+        page = Page(
+            document_title=self._document_title,
+            favicon_path=self._favicon_path,
+            profile_callback=self._set_profile,
+        )
+        return page.add(self).iter_html(chunk_size, production)
+
     def show(self) -> "PlotJS":
         """
         Open the HTML file in the default browser, or inside your editor.
@@ -455,7 +826,14 @@ class PlotJS:
         webbrowser.open(f"file://{self._file_path}")
         return self
 
-    def _set_plot_data_json(self) -> None:
+    def _set_profile(self, profile: ExportProfile) -> None:
+        self.profile = profile
+        if self._profile_callback is not None:
+            self._profile_callback(profile)
+
+    def _set_plot_data_json(
+        self, profile: ExportProfile | None = None
+    ) -> rendering.Render:
         if not hasattr(self, "_tooltip_labels"):
             if self._axes:
                 self.add_tooltip(labels=[])
@@ -466,25 +844,122 @@ class PlotJS:
                 self._tooltip_y_shift = 0
                 self._axes_tooltip = {}
 
+        # the figure is rendered once per export, with the options of
+        # the tooltips
+        render: rendering.Render = self._render(profile)
+        self._exported_tooltip: dict[str, dict] = {
+            axes_class: _thin_tooltip(axe_tooltip, render.thinned.get(axes_class, []))
+            for axes_class, axe_tooltip in self._axes_tooltip.items()
+        }
+
+        # labels and groups are dictionary-encoded when they contain
+        # repeated values, which is common for categorical groups
+        axes: dict[str, dict] = {
+            axes_class: {
+                **{
+                    key: value
+                    for key, value in axe_tooltip.items()
+                    if key not in _RENDER_ONLY_OPTIONS
+                },
+                "tooltip_labels": _encode_labels(axe_tooltip["tooltip_labels"]),
+                "tooltip_groups": _dictionary_encode(axe_tooltip["tooltip_groups"]),
+            }
+            for axes_class, axe_tooltip in self._exported_tooltip.items()
+        }
+
         self.plot_data_json = {
-            "tooltip_labels": self._tooltip_labels,
-            "tooltip_groups": self._tooltip_groups,
             "tooltip_x_shift": self._tooltip_x_shift,
             "tooltip_y_shift": self._tooltip_y_shift,
             "hover_nearest": self._hover_nearest,
-            "axes": self._axes_tooltip,
+            "axes": axes,
         }
 
-    def _set_html(self) -> None:
-        self._set_plot_data_json()
-        self.html: str = self._template.render(
-            uuid=str(self._uuid),
-            default_css=self._default_css,
-            js_parser=self._js_parser,
-            additional_css=self.additional_css,
-            additional_javascript=self.additional_javascript,
-            svg=self._svg_content,
-            plot_data_json=self.plot_data_json,
-            favicon_path=self._favicon_path,
-            document_title=self._document_title,
+        # SVG groups of the interactive artists, so that the parser
+        # finds plot elements without recognizing them from the SVG.
+        # Their elements are tagged in the SVG (see `_tag_svg()`).
+        if axes and any(render.manifest.values()):
+            self.plot_data_json["manifest"] = render.manifest
+            self.plot_data_json["tagged"] = True
+
+        # centers of the elements, used by the parser to find the
+        # nearest element without reading the layout of the page
+        if any(axe["hover_nearest"] == "true" for axe in axes.values()):
+            self.plot_data_json["positions"] = render.positions
+
+        # markers of the scatter plots drawn on a canvas
+        if any(axe.get("render") == "canvas" for axe in axes.values()):
+            self.plot_data_json["markers"] = render.markers
+
+        # vertices of the downsampled lines, used by the parser to find
+        # the label of the hovered vertex
+        if any(axe.get("downsample_lines") for axe in self._axes_tooltip.values()):
+            self.plot_data_json["vertices"] = render.vertices
+        return render
+
+    def _iter_svg(
+        self, svg: str, chunk_size: int, profile: ExportProfile
+    ) -> Iterator[str]:
+        # only the elements the parser makes interactive are tagged:
+        # the ones of the axes with a tooltip, filtered by `on`
+        manifest: dict = self.plot_data_json.get("manifest", {})
+        elements: dict[str, list[list[str]]] = {
+            axes_class: [
+                entry
+                for entry in manifest.get(axes_class, [])
+                if axe_tooltip["on"] is None or entry[1] in axe_tooltip["on"]
+            ]
+            for axes_class, axe_tooltip in self._exported_tooltip.items()
+        }
+        if not self.plot_data_json.get("tagged") or not any(elements.values()):
+            for start in range(0, len(svg), chunk_size):
+                yield svg[start : start + chunk_size]
+            return
+        groups: dict[str, list] = {
+            axes_class: axe_tooltip["tooltip_groups"]
+            for axes_class, axe_tooltip in self._exported_tooltip.items()
+        }
+        # elements are tagged while the SVG is written, so that the
+        # tagged SVG is never built in memory
+        yield from profile.iterate(
+            "tag",
+            _buffered(iter_tagged_svg(svg, elements, groups, chunk_size), chunk_size),
         )
+
+    def _iter_chart_parts(
+        self,
+        chunk_size: int,
+        profile: ExportProfile | None = None,
+        chart_id: str | None = None,
+    ) -> Iterator[str]:
+        profile = profile or ExportProfile()
+        profile.merge(self._data_profile)
+        self._data_profile = ExportProfile()
+
+        with profile.stage("payload"):
+            render: rendering.Render = self._set_plot_data_json(profile)
+        chunks: Iterator[str] = profile.iterate(
+            "template",
+            self._template.generate(
+                uuid=chart_id or str(self._uuid),
+                svg=_SVG_PLACEHOLDER,
+                plot_data_json=_PLOT_DATA_PLACEHOLDER,
+            ),
+        )
+        for chunk in chunks:
+            if chunk == _SVG_PLACEHOLDER:
+                for part in self._iter_svg(render.svg, chunk_size, profile):
+                    profile.add_size("svg", part)
+                    yield part
+            elif chunk == _PLOT_DATA_PLACEHOLDER:
+                # serialized by batches, timing each JSON token is too costly
+                payload: Iterator[str] = profile.iterate(
+                    "json", _buffered(_iter_json(self.plot_data_json), chunk_size)
+                )
+                for part in payload:
+                    profile.add_size("payload", part)
+                    yield part
+            else:
+                yield chunk
+
+    def _set_html(self, production: bool = False) -> None:
+        self.html: str = "".join(self.iter_html(production=production))
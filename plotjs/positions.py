@@ -0,0 +1,240 @@
+import base64
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+
+import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.collections import Collection, PathCollection, QuadMesh
+from matplotlib.figure import Figure
+from matplotlib.legend import Legend
+from matplotlib.lines import Line2D
+from matplotlib.patches import Patch
+
+from plotjs.artists import element_type, split_artists
+from plotjs.canvas import marker_data
+from plotjs.downsample import simplified_vertices, vertex_budget
+from plotjs.occlusion import occluded_markers
+
+
+def _path_centers(paths, transform) -> np.ndarray:
+    centers: list[tuple[float, float]] = []
+    for path in paths:
+        extents = transform.transform_path(path).get_extents()
+        centers.append(((extents.x0 + extents.x1) / 2, (extents.y0 + extents.y1) / 2))
+    return np.asarray(centers, dtype=float).reshape(-1, 2)
+
+
+def _centers(artist: Artist) -> np.ndarray | None:
+    """
+    Compute the center of each SVG element drawn for an artist, in
+    display coordinates and in the order of the SVG.
+    """
+    if isinstance(artist, PathCollection):
+        offsets = np.asarray(artist.get_offsets(), dtype=float).reshape(-1, 2)
+        centers = artist.get_offset_transform().transform(offsets)
+        # matplotlib does not draw elements with non-finite offsets
+        return centers[np.isfinite(centers).all(axis=1)]
+    if isinstance(artist, QuadMesh):
+        coordinates = artist.get_coordinates()
+        cells = (
+            coordinates[:-1, :-1]
+            + coordinates[1:, :-1]
+            + coordinates[:-1, 1:]
+            + coordinates[1:, 1:]
+        ) / 4
+        return artist.get_transform().transform(cells.reshape(-1, 2))
+    if isinstance(artist, Collection):
+        return _path_centers(artist.get_paths(), artist.get_transform())
+    if isinstance(artist, Line2D):
+        return _path_centers([artist.get_path()], artist.get_transform())
+    if isinstance(artist, Patch):
+        return _path_centers([artist.get_path()], artist.get_transform())
+    return None
+
+
+def encode_positions(centers: np.ndarray) -> str:
+    """
+    Encode `(x, y)` pairs as a base64 string of little-endian
+    float32 values (`x0, y0, x1, y1...`), decoded in the browser
+    with a `Float32Array`.
+    """
+    return base64.b64encode(
+        np.ascontiguousarray(centers, dtype="<f4").tobytes()
+    ).decode("ascii")
+
+
+@contextmanager
+def record_positions(
+    fig: Figure,
+    positions: dict[str, np.ndarray],
+    canvas: Iterable[Artist] = (),
+    markers: dict[str, dict] | None = None,
+    manifest: dict[str, list[list[str]]] | None = None,
+    thin: Iterable[Artist] = (),
+    thinned: dict[str, list[int]] | None = None,
+    downsample: Iterable[Artist] = (),
+    vertices: dict[str, dict] | None = None,
+) -> Iterator[None]:
+    """
+    Record, while the figure is saved to SVG, the center of the
+    elements of each interactive artist in SVG coordinates. Results
+    are stored in `positions`, by `id` of the SVG group of the artist.
+
+    Ids are found by mirroring the way the SVG renderer numbers
+    groups (`{name}_{count}`, unless the artist has a gid).
+
+    Artists of `canvas` (see `plotjs.canvas.supports_canvas()`) are
+    replaced by an empty group, and the data needed to draw their
+    markers on a canvas is stored in `markers` instead.
+
+    The `[id, type]` of the SVG group of each interactive artist (see
+    `plotjs.artists.element_type()`) is appended to `manifest`, by
+    class of its Axes (`axes_{n}`), in the order of the SVG.
+
+    Markers of the scatter plots of `thin` that are hidden by other
+    markers (see `plotjs.occlusion.occluded_markers()`) are left out of
+    the SVG (and of the positions and canvas markers). Their index among
+    the points of their Axes (the ones drawn on a canvas first, like the
+    parser does) is stored in `thinned`, by class of the Axes.
+
+    Lines of `downsample` (see `plotjs.downsample.supports_downsampling()`)
+    are drawn with the vertices selected by
+    `plotjs.downsample.simplified_vertices()`. The SVG position of these
+    vertices, their row in the data of the line and its number of rows
+    are stored in `vertices`, by `id` of the SVG group of the line.
+    """
+    interactive: list[Artist] = [
+        artist for artist in split_artists(fig)[0] if not isinstance(artist, Legend)
+    ]
+    axes: list = fig.get_axes()
+    canvas_ids: set[int] = {id(artist) for artist in canvas}
+    thin_ids: set[int] = {id(artist) for artist in thin}
+    downsample_ids: set[int] = {id(artist) for artist in downsample}
+    # number of points drawn so far, and index of the hidden ones, by
+    # class of their Axes and whether they are drawn on a canvas
+    point_counts: dict[tuple[str, bool], int] = {}
+    removed: dict[tuple[str, bool], list[int]] = {}
+    drawing: list[Artist] = []
+    group_ids: dict[int, str] = {}
+
+    def _draw_figure(renderer, *args, **kwargs):
+        counts: dict[str, int] = {}
+        # only the last draw (the one of the output) is kept
+        point_counts.clear()
+        removed.clear()
+        open_group = renderer.open_group
+
+        def _open_group(s, gid=None):
+            if gid:
+                group_id = gid
+            else:
+                counts[s] = counts.get(s, 0) + 1
+                group_id = f"{s}_{counts[s]:d}"
+            # first group opened by an interactive artist is its own
+            if drawing and id(drawing[-1]) not in group_ids:
+                group_ids[id(drawing[-1])] = group_id
+            return open_group(s, gid)
+
+        renderer.open_group = _open_group
+        try:
+            return type(fig).draw(fig, renderer, *args, **kwargs)
+        finally:
+            del renderer.open_group
+
+    def _draw_placeholder(artist: Artist, renderer) -> None:
+        if not artist.get_visible():
+            return
+        name: str = type(artist).__name__
+        renderer.open_group(name, artist.get_gid())
+        renderer.close_group(name)
+        if markers is not None:
+            markers[group_ids[id(artist)]] = marker_data(artist, renderer)
+
+    def _count_points(artist: Artist, hidden: np.ndarray | None) -> None:
+        if not thin_ids or not isinstance(artist, PathCollection):
+            return
+        if artist.axes not in axes:
+            return
+        key = (f"axes_{axes.index(artist.axes) + 1}", id(artist) in canvas_ids)
+        offsets = np.asarray(artist.get_offsets(), dtype=float).reshape(-1, 2)
+        centers = artist.get_offset_transform().transform(offsets)
+        drawn = np.isfinite(centers).all(axis=1)
+        start: int = point_counts.get(key, 0)
+        if hidden is not None:
+            indices = start + np.flatnonzero(hidden[drawn])
+            removed.setdefault(key, []).extend(indices.tolist())
+        point_counts[key] = start + int(drawn.sum())
+
+    def _draw_artist(artist: Artist, renderer, *args, **kwargs):
+        drawing.append(artist)
+        hidden: np.ndarray | None = None
+        if artist.get_visible():
+            if id(artist) in thin_ids:
+                hidden = occluded_markers(artist, renderer)
+            _count_points(artist, hidden)
+        offsets = artist.get_offsets() if hidden is not None else None
+        rows: np.ndarray | None = None
+        if id(artist) in downsample_ids and artist.get_visible():
+            points = artist.get_transform().transform(artist.get_path().vertices)
+            rows = simplified_vertices(points, vertex_budget(artist))
+        data = artist.get_data(orig=True) if rows is not None else None
+        try:
+            if hidden is not None and hidden.any():
+                # matplotlib does not draw markers with non-finite offsets
+                artist.set_offsets(
+                    np.where(hidden[:, None], np.nan, np.asarray(offsets, float))
+                )
+            if rows is not None and len(rows) < len(points):
+                artist.set_data(np.asarray(data[0])[rows], np.asarray(data[1])[rows])
+            if id(artist) in canvas_ids:
+                return _draw_placeholder(artist, renderer)
+            result = type(artist).draw(artist, renderer, *args, **kwargs)
+            group_id = group_ids.get(id(artist))
+            height = getattr(renderer, "height", fig.bbox.height)
+            kind = element_type(artist) if group_id else None
+            if manifest is not None and kind and artist.axes in axes:
+                axes_class = f"axes_{axes.index(artist.axes) + 1}"
+                manifest.setdefault(axes_class, []).append([group_id, kind])
+            centers = _centers(artist) if group_id else None
+            if centers is not None and len(centers):
+                centers = np.column_stack([centers[:, 0], height - centers[:, 1]])
+                positions[group_id] = centers
+            if vertices is not None and rows is not None and group_id:
+                kept = points[rows]
+                drawn = np.isfinite(kept).all(axis=1)
+                vertices[group_id] = {
+                    "positions": encode_positions(
+                        np.column_stack([kept[drawn, 0], height - kept[drawn, 1]])
+                    ),
+                    "rows": base64.b64encode(
+                        np.ascontiguousarray(rows[drawn], dtype="<u4").tobytes()
+                    ).decode("ascii"),
+                    "length": len(points),
+                }
+            return result
+        finally:
+            if hidden is not None and hidden.any():
+                artist.set_offsets(offsets)
+            if rows is not None and len(rows) < len(points):
+                artist.set_data(*data)
+            drawing.pop()
+
+    fig.draw = _draw_figure
+    for artist in interactive:
+        artist.draw = lambda renderer, *a, _artist=artist, **kw: _draw_artist(
+            _artist, renderer, *a, **kw
+        )
+    try:
+        yield
+        if thinned is not None:
+            for (axes_class, on_canvas), indices in removed.items():
+                start = 0 if on_canvas else point_counts.get((axes_class, True), 0)
+                thinned.setdefault(axes_class, []).extend(
+                    start + index for index in indices
+                )
+            for indices in thinned.values():
+                indices.sort()
+    finally:
+        del fig.draw
+        for artist in interactive:
+            del artist.draw
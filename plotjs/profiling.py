@@ -0,0 +1,211 @@
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+# sizes reported by every profile, in bytes (UTF-8)
+SIZES: tuple[str, ...] = ("svg", "payload", "css", "js", "total")
+
+# profiles aggregating the exports of the current context
+_collectors: ContextVar[tuple["ExportProfile", ...]] = ContextVar(
+    "plotjs_profile_collectors", default=()
+)
+
+
+@dataclass
+class StageTiming:
+    """
+    Time spent in one stage of an export.
+
+    Attributes:
+        wall: Wall-clock time, in seconds.
+        cpu: CPU time of the process, in seconds.
+        calls: Number of times the stage was entered.
+    """
+
+    wall: float = 0.0
+    cpu: float = 0.0
+    calls: int = 0
+
+
+@dataclass
+class ExportProfile:
+    """
+    Timings and sizes of one or several HTML exports.
+
+    Stages are:
+
+    - `data`: conversion of the tooltip labels, groups and columns
+      (done by `add_tooltip()`, reported by the next export)
+    - `render`: rendering of the figure to SVG with `savefig` (close
+      to zero when the render is reused from the cache)
+    - `assets`: loading of the template, CSS and JavaScript parser
+    - `payload`: building of the JSON configuration of the charts
+    - `json`: serialization of the JSON configuration
+    - `tag`: tagging of the plot elements in the SVG
+    - `template`: rendering of the Jinja templates
+    - `write`: writing of the files, for `save()`
+
+    The time of a stage does not include the time of the stages
+    nested in it (such as `render` in `payload`).
+
+    Attributes:
+        stages: Timing of each stage, by name, in execution order.
+        sizes: Number of bytes of the `svg`, the JSON `payload`, the
+            `css` and `js` shipped with the page (inline or in external
+            files) and of the `total` HTML document.
+        exports: Number of exports profiled.
+    """
+
+    stages: dict[str, StageTiming] = field(default_factory=dict)
+    sizes: dict[str, int] = field(default_factory=lambda: dict.fromkeys(SIZES, 0))
+    exports: int = 0
+    # [wall, cpu] spent in the nested stages of each open stage
+    _nested: list[list[float]] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+
+    @property
+    def wall(self) -> float:
+        """
+        Total wall-clock time of the stages, in seconds.
+        """
+        return sum(timing.wall for timing in self.stages.values())
+
+    @property
+    def cpu(self) -> float:
+        """
+        Total CPU time of the stages, in seconds.
+        """
+        return sum(timing.cpu for timing in self.stages.values())
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time the code run in the block as stage `name`.
+        """
+        wall: float = time.perf_counter()
+        cpu: float = time.process_time()
+        self._nested.append([0.0, 0.0])
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            nested_wall, nested_cpu = self._nested.pop()
+            timing = self.stages.setdefault(name, StageTiming())
+            timing.wall += wall - nested_wall
+            timing.cpu += cpu - nested_cpu
+            timing.calls += 1
+            if self._nested:
+                self._nested[-1][0] += wall
+                self._nested[-1][1] += cpu
+
+    def iterate(self, name: str, iterable: Iterable[str]) -> Iterator[str]:
+        """
+        Iterate over `iterable`, timing the production of each item
+        as stage `name`. The time spent by the consumer between two
+        items is not included.
+        """
+        iterator: Iterator[str] = iter(iterable)
+        while True:
+            with self.stage(name):
+                item = next(iterator, None)
+            if item is None:
+                return
+            yield item
+
+    def add_size(self, name: str, text: str) -> None:
+        """
+        Add the number of bytes of `text` to size `name`.
+        """
+        self.sizes[name] = self.sizes.get(name, 0) + len(text.encode("utf-8"))
+
+    def merge(self, other: "ExportProfile") -> "ExportProfile":
+        """
+        Add the timings, sizes and number of exports of another profile.
+
+        Returns:
+            self: Returns the instance to allow method chaining.
+        """
+        for name, timing in other.stages.items():
+            total = self.stages.setdefault(name, StageTiming())
+            total.wall += timing.wall
+            total.cpu += timing.cpu
+            total.calls += timing.calls
+        for name, size in other.sizes.items():
+            self.sizes[name] = self.sizes.get(name, 0) + size
+        self.exports += other.exports
+        return self
+
+    def as_dict(self) -> dict:
+        """
+        Convert the profile to a JSON serializable dict, e.g. to send
+        it to a metrics system.
+
+        Returns:
+            A dict with the `stages` (`wall`, `cpu` and `calls` by
+            stage), the `sizes`, the number of `exports` and the total
+            `wall` and `cpu` times.
+        """
+        return {
+            "stages": {
+                name: {"wall": timing.wall, "cpu": timing.cpu, "calls": timing.calls}
+                for name, timing in self.stages.items()
+            },
+            "sizes": dict(self.sizes),
+            "exports": self.exports,
+            "wall": self.wall,
+            "cpu": self.cpu,
+        }
+
+
+def record(
+    profile: ExportProfile,
+    callback: Callable[[ExportProfile], None] | None = None,
+) -> None:
+    """
+    Mark `profile` as one finished export: add it to the profiles
+    collected by the enclosing `collect()` blocks and call `callback`.
+    """
+    profile.exports = 1
+    for collector in _collectors.get():
+        collector.merge(profile)
+    if callback is not None:
+        callback(profile)
+
+
+@contextmanager
+def collect() -> Iterator[ExportProfile]:
+    """
+    Aggregate the profiles of all the exports (`save()`, `as_html()`
+    and fully consumed `iter_html()`) run in the block, in the current
+    thread.
+
+    Returns:
+        A context manager yielding the aggregated `ExportProfile`,
+        updated after each export.
+
+    Examples:
+        ```python
+        from plotjs import PlotJS, profiling
+
+        with profiling.collect() as profile:
+            for i, fig in enumerate(figures):
+                PlotJS(fig).add_tooltip(labels=labels).save(f"chart-{i}.html")
+
+        profile.exports
+        # 100
+        profile.stages["render"].wall
+        # 4.52
+        profile.sizes["total"]
+        # 10438215
+        ```
+    """
+    profile: ExportProfile = ExportProfile()
+    token = _collectors.set((*_collectors.get(), profile))
+    try:
+        yield profile
+    finally:
+        _collectors.reset(token)
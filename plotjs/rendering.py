@@ -0,0 +1,471 @@
+import io
+import re
+import threading
+import weakref
+from collections.abc import Callable
+from typing import NamedTuple
+
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+from plotjs.artists import hidden, resolve_bbox_inches, split_artists
+from plotjs.assets import CacheInfo
+from plotjs.canvas import supports_canvas
+from plotjs.downsample import supports_downsampling
+from plotjs.positions import encode_positions, record_positions
+from plotjs.svg import SVGOptimization, insert_backdrop, optimize_svg
+
+# rcParams that change the SVG output, part of the cache key
+_RCPARAMS_PREFIXES: tuple[str, ...] = ("svg.", "savefig.")
+
+
+class Render(NamedTuple):
+    svg: str
+    optimization: SVGOptimization | None
+    # base64 float32 centers of the elements of each interactive
+    # artist, by id of its SVG group (see `plotjs.positions`)
+    positions: dict[str, str]
+    # markers drawn on a canvas by the parser, by id of the (empty)
+    # SVG group of their artist (see `plotjs.canvas`)
+    markers: dict[str, dict]
+    # `[id, type]` of the SVG group of each interactive artist, by
+    # class of its Axes, in the order of the SVG
+    manifest: dict[str, list[list[str]]]
+    # index of the hidden points left out of the SVG, among the points
+    # of each Axes, by class of the Axes (see `plotjs.occlusion`)
+    thinned: dict[str, list[int]]
+    # positions and rows of the vertices of downsampled lines, by id of
+    # their SVG group (see `plotjs.downsample`)
+    vertices: dict[str, dict]
+
+
+def _savefig_svg(
+    fig: Figure,
+    positions: dict | None = None,
+    canvas: list | None = None,
+    markers: dict | None = None,
+    manifest: dict | None = None,
+    thin: list | None = None,
+    thinned: dict | None = None,
+    downsample: list | None = None,
+    vertices: dict | None = None,
+    **savefig_kws,
+) -> str:
+    buf: io.StringIO = io.StringIO()
+    if positions is None:
+        fig.savefig(buf, format="svg", **savefig_kws)
+    else:
+        with record_positions(
+            fig,
+            positions,
+            canvas or (),
+            markers,
+            manifest,
+            thin or (),
+            thinned,
+            downsample or (),
+            vertices,
+        ):
+            fig.savefig(buf, format="svg", **savefig_kws)
+    svg: str = buf.getvalue()
+    buf.close()
+    return svg
+
+
+def _savefig_hybrid(
+    fig: Figure,
+    raster_dpi: float | None,
+    positions: dict | None = None,
+    canvas: list | None = None,
+    markers: dict | None = None,
+    manifest: dict | None = None,
+    thin: list | None = None,
+    thinned: dict | None = None,
+    downsample: list | None = None,
+    vertices: dict | None = None,
+    **savefig_kws,
+) -> str:
+    """
+    Render the static artists of a figure to a PNG backdrop, and
+    the interactive ones to an SVG on top of it.
+    """
+    savefig_kws = resolve_bbox_inches(fig, savefig_kws)
+    interactive, static = split_artists(fig)
+
+    png_kws: dict = dict(savefig_kws)
+    if raster_dpi is not None:
+        png_kws["dpi"] = raster_dpi
+    buf: io.BytesIO = io.BytesIO()
+    with hidden(interactive):
+        fig.savefig(buf, format="png", **png_kws)
+
+    with hidden(static):
+        svg: str = _savefig_svg(
+            fig,
+            positions,
+            canvas,
+            markers,
+            manifest,
+            thin,
+            thinned,
+            downsample,
+            vertices,
+            **savefig_kws,
+        )
+
+    return insert_backdrop(svg, buf.getvalue())
+
+
+def render_svg(
+    fig: Figure,
+    *,
+    optimize: bool = False,
+    precision: int = 2,
+    rasterize_static: bool = False,
+    raster_dpi: float | None = None,
+    canvas_axes: tuple[int, ...] = (),
+    thin_axes: tuple[int, ...] = (),
+    downsample_axes: tuple[int, ...] = (),
+    record_elements: bool = True,
+    savefig_kws: dict | None = None,
+) -> Render:
+    """
+    Render a figure to SVG, with reproducible ids, and record the
+    position of its interactive elements.
+
+    Args:
+        fig: A matplotlib figure.
+        optimize: Whether to pass the SVG through `optimize_svg()`.
+        precision: Number of decimals kept for coordinates when
+            `optimize=True`.
+        rasterize_static: Whether to render static artists to a PNG
+            backdrop.
+        raster_dpi: Resolution of the backdrop.
+        canvas_axes: Indices (in `fig.axes`) of the axes whose scatter
+            plots are left out of the SVG, to be drawn on a canvas.
+        thin_axes: Indices (in `fig.axes`) of the axes whose scatter
+            plots are drawn without the markers fully hidden by other
+            markers (see `plotjs.occlusion`).
+        downsample_axes: Indices (in `fig.axes`) of the axes whose lines
+            are downsampled (see `plotjs.downsample`).
+        record_elements: Whether to record the positions of the elements
+            and the manifest of the interactive artists, which hooks the
+            drawing of the figure. They are always recorded along with
+            `canvas_axes`, `thin_axes` and `downsample_axes`.
+        savefig_kws: Keyword arguments passed to `fig.savefig()`.
+
+    Returns:
+        A named tuple with the SVG, the optimization report (or `None`
+        if `optimize=False`), the positions of the elements, the
+        markers to draw on a canvas, the manifest of the interactive
+        artists, the points left out by `thin_axes` and the vertices
+        of the lines downsampled by `downsample_axes`. All of them but
+        the SVG and the optimization report are empty when nothing
+        was recorded.
+    """
+    savefig_kws = savefig_kws or {}
+    centers: dict = {}
+    canvas: list = [
+        artist
+        for index in canvas_axes
+        for artist in fig.axes[index].collections
+        if supports_canvas(artist)
+    ]
+    thin: list = [
+        artist
+        for index in thin_axes
+        for artist in fig.axes[index].collections
+        if supports_canvas(artist)
+    ]
+    downsample: list = [
+        artist
+        for index in downsample_axes
+        for artist in fig.axes[index].lines
+        if supports_downsampling(artist)
+    ]
+    markers: dict = {}
+    manifest: dict = {}
+    thinned: dict = {}
+    vertices: dict = {}
+    # drawing the figure is only hooked when something is recorded
+    record: bool = record_elements or bool(canvas or thin or downsample)
+
+    # savefig marks the figure as stale (e.g. when restoring its face
+    # color), it is left as it was before
+    stale: bool = fig.stale
+
+    # temporary change svg hashsalt and id for reproductibility
+    # https://github.com/y-sunflower/plotjs/issues/54
+    old_svg_hashsalt = plt.rcParams["svg.hashsalt"]
+    old_svg_id = plt.rcParams["svg.id"]
+    try:
+        plt.rcParams["svg.hashsalt"] = "svg-hashsalt"
+        plt.rcParams["svg.id"] = "svg-id"
+        if rasterize_static:
+            svg: str = _savefig_hybrid(
+                fig,
+                raster_dpi,
+                centers if record else None,
+                canvas,
+                markers,
+                manifest,
+                thin,
+                thinned,
+                downsample,
+                vertices,
+                **savefig_kws,
+            )
+        else:
+            svg = _savefig_svg(
+                fig,
+                centers if record else None,
+                canvas,
+                markers,
+                manifest,
+                thin,
+                thinned,
+                downsample,
+                vertices,
+                **savefig_kws,
+            )
+    finally:
+        plt.rcParams["svg.hashsalt"] = old_svg_hashsalt
+        plt.rcParams["svg.id"] = old_svg_id
+        if fig.stale != stale:
+            fig.stale = stale
+
+    # ids are guessed while drawing: only keep the ones of the output
+    group_ids: set[str] = set(re.findall(r'<g id="([^"]*)"', svg)) if record else set()
+    positions: dict[str, str] = {
+        group_id: encode_positions(group_centers)
+        for group_id, group_centers in centers.items()
+        if group_id in group_ids
+    }
+    markers = {
+        group_id: group_markers
+        for group_id, group_markers in markers.items()
+        if group_id in group_ids
+    }
+    vertices = {
+        group_id: group_vertices
+        for group_id, group_vertices in vertices.items()
+        if group_id in group_ids
+    }
+    manifest = {
+        axes_class: [entry for entry in entries if entry[0] in group_ids]
+        for axes_class, entries in manifest.items()
+    }
+
+    optimization: SVGOptimization | None = None
+    if optimize:
+        svg, optimization = optimize_svg(svg, precision=precision)
+    return Render(svg, optimization, positions, markers, manifest, thinned, vertices)
+
+
+def _figure_properties(fig: Figure) -> tuple:
+    return (tuple(fig.bbox.bounds), fig.get_facecolor(), fig.get_edgecolor())
+
+
+class _FigureState:
+    """
+    State of a figure right after a render, to tell whether it changed
+    since then.
+
+    Drawing a figure clears the stale flag of its artists, and changing
+    an artist sets it again, along with the ones of its parents. Some
+    flags are still set after an export (the one of the figure is left
+    as it was, `bbox_inches="tight"` restores the position of the Axes,
+    etc.), so only the artists that were not stale right after the
+    render are watched, along with the size and colors of the figure.
+    """
+
+    def __init__(self, fig: Figure, draws: int):
+        self.draws: int = draws
+        self.properties: tuple = _figure_properties(fig)
+        # artists are held by weak reference, like the figure
+        self.artists: list[tuple[weakref.ref, bool]] = [
+            (weakref.ref(artist), artist.stale) for artist in fig.findobj()
+        ]
+
+    def unchanged(self, fig: Figure, draws: int) -> bool:
+        if draws != self.draws or _figure_properties(fig) != self.properties:
+            return False
+        artists: list = fig.findobj()
+        return len(artists) == len(self.artists) and all(
+            ref() is artist and (stale or not artist.stale)
+            for (ref, stale), artist in zip(self.artists, artists)
+        )
+
+
+class _FigureEntry:
+    """
+    Cached renders of one figure, and the number of times it was
+    drawn (by plotjs or by anything else, such as a GUI backend).
+    """
+
+    def __init__(self):
+        self.draws: int = 0
+        self.renders: dict[str, tuple[_FigureState, Render]] = {}
+
+    def on_draw(self, event) -> None:
+        self.draws += 1
+
+
+class SVGCache:
+    """
+    Process-wide cache of SVG renders, keyed by figure (held by
+    weak reference) and rendering options.
+
+    A render is reused as long as the figure was neither modified
+    (the stale flag of its artists) nor drawn again since then. Drawing
+    is tracked because interactive backends redraw modified figures,
+    which clears their stale state.
+    """
+
+    def __init__(self):
+        self._figures: weakref.WeakKeyDictionary[Figure, _FigureEntry] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._hits: int = 0
+        self._misses: int = 0
+        self._lock = threading.Lock()
+
+    def _entry(self, fig: Figure) -> _FigureEntry:
+        entry = self._figures.get(fig)
+        if entry is None:
+            entry = self._figures[fig] = _FigureEntry()
+            # the callback registry is shared by all the canvases of
+            # the figure, including the ones used by savefig
+            fig.canvas.mpl_connect("draw_event", entry.on_draw)
+        return entry
+
+    def get(
+        self,
+        fig: Figure,
+        key: str,
+        render: Callable[[], Render],
+    ) -> Render:
+        """
+        Get the render of a figure from the cache, calling `render`
+        on a miss.
+
+        Args:
+            fig: A matplotlib figure.
+            key: Rendering options, as a string.
+            render: Function rendering the figure.
+
+        Returns:
+            The render.
+        """
+        with self._lock:
+            entry = self._entry(fig)
+            cached = entry.renders.get(key)
+            if cached is not None and cached[0].unchanged(fig, entry.draws):
+                self._hits += 1
+                return cached[1]
+            self._misses += 1
+
+        result: Render = render()
+        with self._lock:
+            entry.renders[key] = (_FigureState(fig, entry.draws), result)
+        return result
+
+    def cache_info(self) -> CacheInfo:
+        with self._lock:
+            size: int = sum(len(entry.renders) for entry in self._figures.values())
+            return CacheInfo(self._hits, self._misses, size)
+
+    def clear(self) -> None:
+        with self._lock:
+            for entry in self._figures.values():
+                entry.renders.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+cache: SVGCache = SVGCache()
+
+
+def _cache_key(**options) -> str:
+    rcparams: dict = {
+        key: value
+        for key, value in plt.rcParams.items()
+        if key.startswith(_RCPARAMS_PREFIXES)
+    }
+    return repr((sorted(options.items()), sorted(rcparams.items())))
+
+
+def get_svg(
+    fig: Figure,
+    *,
+    optimize: bool = False,
+    precision: int = 2,
+    rasterize_static: bool = False,
+    raster_dpi: float | None = None,
+    canvas_axes: tuple[int, ...] = (),
+    thin_axes: tuple[int, ...] = (),
+    downsample_axes: tuple[int, ...] = (),
+    record_elements: bool = True,
+    savefig_kws: dict | None = None,
+) -> Render:
+    """
+    Same as `render_svg()`, but renders of figures that did not
+    change since their last render are reused from the cache.
+    """
+    savefig_kws = savefig_kws or {}
+    key: str = _cache_key(
+        optimize=optimize,
+        precision=precision,
+        rasterize_static=rasterize_static,
+        raster_dpi=raster_dpi,
+        canvas_axes=canvas_axes,
+        thin_axes=thin_axes,
+        downsample_axes=downsample_axes,
+        record_elements=record_elements,
+        savefig_kws=sorted(savefig_kws.items()),
+    )
+    return cache.get(
+        fig,
+        key,
+        lambda: render_svg(
+            fig,
+            optimize=optimize,
+            precision=precision,
+            rasterize_static=rasterize_static,
+            raster_dpi=raster_dpi,
+            canvas_axes=canvas_axes,
+            thin_axes=thin_axes,
+            downsample_axes=downsample_axes,
+            record_elements=record_elements,
+            savefig_kws=savefig_kws,
+        ),
+    )
+
+
+def cache_info() -> CacheInfo:
+    """
+    Get hit/miss statistics of the SVG render cache.
+
+    Returns:
+        A named tuple with `hits`, `misses` and `currsize` (the
+        number of cached renders).
+
+    Examples:
+        ```python
+        from plotjs import PlotJS, rendering
+
+        PlotJS(fig).add_tooltip(labels=labels).save("labels.html")
+        PlotJS(fig).add_tooltip(groups=groups).save("groups.html")
+
+        rendering.cache_info()
+        # CacheInfo(hits=1, misses=1, currsize=1)
+        ```
+    """
+    return cache.cache_info()
+
+
+def clear_cache() -> None:
+    """
+    Drop all cached renders and reset the hit/miss counters.
+    """
+    cache.clear()
@@ -132,6 +132,1274 @@ function getPointerPosition(event, svgElement) {
   return [event.clientX - rect.left, event.clientY - rect.top];
 }
 
+/**
+ * Dictionary-encoded vector: a table of unique values and, for each
+ * position, the integer code of its value in that table. Tooltip
+ * labels and groups are shipped this way by Python when it makes the
+ * payload smaller, and comparing codes is cheaper than comparing strings.
+ */
+class Categorical {
+  /**
+   * @param {Array} values - Unique values.
+   * @param {ArrayLike<number>} codes - Index in `values` of each element.
+   */
+  constructor(values, codes) {
+    this.values = values;
+    this.codes = codes instanceof Int32Array ? codes : Int32Array.from(codes);
+  }
+
+  /**
+   * Build a Categorical from a plain array, an encoded payload
+   * (`{values, codes}`) or another Categorical (returned as is).
+   *
+   * @param {Array|Object|Categorical} data - Data to encode.
+   * @returns {Categorical} Encoded data.
+   */
+  static from(data) {
+    if (data instanceof Categorical) {
+      return data;
+    }
+    if (data && Array.isArray(data.values) && data.codes) {
+      return new Categorical(data.values, data.codes);
+    }
+
+    const items = data ?? [];
+    const index = new Map();
+    const values = [];
+    const codes = new Int32Array(items.length);
+    for (let i = 0; i < items.length; i++) {
+      let code = index.get(items[i]);
+      if (code === undefined) {
+        code = values.length;
+        index.set(items[i], code);
+        values.push(items[i]);
+      }
+      codes[i] = code;
+    }
+    return new Categorical(values, codes);
+  }
+
+  get length() {
+    return this.codes.length;
+  }
+
+  /**
+   * @param {number} i - Position of the element.
+   * @returns {*} Decoded value, or `undefined` if out of range.
+   */
+  get(i) {
+    const code = this.codes[i];
+    return code === undefined ? undefined : this.values[code];
+  }
+}
+
+// [[fill]align][sign][0][width][grouping][.precision][type], the
+// subset of Python's format specification mini-language accepted by
+// `PlotJS.add_tooltip(template=...)`.
+const FORMAT_SPEC =
+  /^(?:([\s\S])?([<>^]))?([+\- ])?(0)?(\d+)?([,_])?(?:\.(\d+))?([deEfFgGs%])?$/;
+
+/**
+ * Format a value like Python's `format(value, spec)` does, for the
+ * subset of format specifications accepted by Python. Missing values
+ * are formatted as empty strings.
+ *
+ * @param {*} value - Value to format.
+ * @param {string} spec - Format specification, such as ".2f".
+ * @returns {string} Formatted value.
+ */
+function formatValue(value, spec) {
+  if (value === null || value === undefined) {
+    return "";
+  }
+  if (typeof value === "boolean") {
+    value = value ? "True" : "False";
+  }
+  const match = spec ? FORMAT_SPEC.exec(spec) : null;
+  if (!match) {
+    return String(value);
+  }
+  const [, fill, align, sign, zero, width, grouping, precision, type] = match;
+  const digits = precision === undefined ? undefined : Number(precision);
+  const isNumber = typeof value === "number" && type !== "s";
+
+  let text;
+  let prefix = "";
+  if (isNumber) {
+    let number = type === "%" ? value * 100 : value;
+    if (number < 0 || Object.is(number, -0)) {
+      prefix = "-";
+      number = -number;
+    } else if (sign === "+" || sign === " ") {
+      prefix = sign;
+    }
+
+    switch (type) {
+      case "d":
+        text = Math.round(number).toString();
+        break;
+      case "e":
+      case "E":
+        text = number
+          .toExponential(digits ?? 6)
+          .replace(/e([+-])(\d)$/, "e$10$2");
+        break;
+      case "f":
+      case "F":
+      case "%":
+        text = number.toFixed(digits ?? 6);
+        break;
+      case "g":
+      case "G":
+        text = String(Number(number.toPrecision(digits || 6)));
+        break;
+      default:
+        text =
+          digits === undefined
+            ? String(number)
+            : String(Number(number.toPrecision(digits || 1)));
+    }
+    if (type === "E" || type === "G" || type === "F") {
+      text = text.toUpperCase();
+    }
+    if (grouping) {
+      const [integer, ...rest] = text.split(".");
+      text = [integer.replace(/\B(?=(\d{3})+(?!\d))/g, grouping), ...rest].join(
+        ".",
+      );
+    }
+    if (type === "%") {
+      text += "%";
+    }
+  } else {
+    text = String(value);
+    if (digits !== undefined) {
+      text = text.slice(0, digits);
+    }
+  }
+
+  const size = Number(width ?? 0);
+  if (zero && !align && isNumber) {
+    return prefix + text.padStart(size - prefix.length, "0");
+  }
+  text = prefix + text;
+  const padding = Math.max(size - text.length, 0);
+  const fillChar = fill ?? " ";
+  switch (align ?? (isNumber ? ">" : "<")) {
+    case ">":
+      return fillChar.repeat(padding) + text;
+    case "^": {
+      const left = Math.floor(padding / 2);
+      return (
+        fillChar.repeat(left) + text + fillChar.repeat(padding - left)
+      );
+    }
+    default:
+      return text + fillChar.repeat(padding);
+  }
+}
+
+/**
+ * Tooltip labels built from a template and columns of values, sent
+ * by `PlotJS.add_tooltip(data=..., template=...)`. Labels are only
+ * formatted when they are displayed.
+ */
+class TooltipTemplate {
+  /**
+   * @param {Array<[string, string|null, string]>} template - Parts of the template, as `[literal, field, format_spec]`.
+   * @param {Object<string, Array|Object>} columns - Values of each field, plain or dictionary-encoded.
+   * @param {number} length - Number of rows.
+   * @param {string[]} extra - Labels after the rows (e.g. legend entries).
+   */
+  constructor(template, columns, length, extra = []) {
+    this.template = template;
+    this.columns = {};
+    for (const field in columns) {
+      this.columns[field] = Categorical.from(columns[field]);
+    }
+    this.rows = length;
+    this.extra = extra;
+  }
+
+  /**
+   * Build the tooltip labels from the payload: a TooltipTemplate for
+   * templates, and a Categorical otherwise.
+   *
+   * @param {Array|Object|Categorical|TooltipTemplate} data - Labels payload.
+   * @returns {TooltipTemplate|Categorical} Labels.
+   */
+  static from(data) {
+    if (data instanceof TooltipTemplate) {
+      return data;
+    }
+    if (data && Array.isArray(data.template)) {
+      return new TooltipTemplate(
+        data.template,
+        data.columns,
+        data.length,
+        data.extra,
+      );
+    }
+    return Categorical.from(data);
+  }
+
+  get length() {
+    return this.rows + this.extra.length;
+  }
+
+  /**
+   * @param {number} i - Position of the element.
+   * @returns {string|undefined} Formatted label, or `undefined` if out of range.
+   */
+  get(i) {
+    if (i >= this.rows) {
+      return this.extra[i - this.rows];
+    }
+    if (i < 0 || !Number.isInteger(i)) {
+      return undefined;
+    }
+    let label = "";
+    for (const [literal, field, spec] of this.template) {
+      label += literal;
+      if (field !== null) {
+        label += formatValue(this.columns[field].get(i), spec);
+      }
+    }
+    return label;
+  }
+}
+
+/**
+ * Decode an array sent by Python as a base64 string of little-endian
+ * values.
+ *
+ * @param {string} encoded - The base64 string.
+ * @param {Function} [Type] - Typed array constructor (`Float32Array` by default).
+ * @returns {ArrayLike<number>} The decoded array.
+ */
+function decodeArray(encoded, Type = Float32Array) {
+  const bytes = Uint8Array.from(atob(encoded), (c) => c.charCodeAt(0));
+  return new Type(bytes.buffer);
+}
+
+/**
+ * Decode the element centers sent by Python: for each SVG group id,
+ * a base64 string of little-endian float32 values.
+ *
+ * @param {Object<string, string>} [data] - Encoded centers, by group id.
+ * @returns {Map<string, Float32Array>} Decoded centers, by group id.
+ */
+function decodePositions(data) {
+  const positions = new Map();
+  for (const [groupId, encoded] of Object.entries(data ?? {})) {
+    positions.set(groupId, decodeArray(encoded));
+  }
+  return positions;
+}
+
+/**
+ * Vertices of a line downsampled by Python (see
+ * `PlotJS.add_tooltip(downsample_lines=True)`): the position of the
+ * vertices drawn, and their row in the full-resolution data of the
+ * line, used to label the vertex nearest to the mouse.
+ */
+class LineVertices {
+  /**
+   * @param {ArrayLike<number>} positions - SVG coordinates of the vertices drawn (`x0, y0, x1, y1...`).
+   * @param {ArrayLike<number>} rows - Row of each vertex drawn in the data of the line.
+   * @param {number} length - Number of rows of the data of the line.
+   */
+  constructor(positions, rows, length) {
+    this.positions = positions;
+    this.rows = rows;
+    this.length = length;
+    // built on first hover
+    this.index = null;
+  }
+
+  /**
+   * Decode the vertices sent by Python: for each SVG group id, the
+   * base64 positions (float32) and rows (uint32) of the vertices, and
+   * the number of rows of the line.
+   *
+   * @param {Object<string, {positions: string, rows: string, length: number}>} [data] - Encoded vertices, by group id.
+   * @returns {Map<string, LineVertices>} Decoded vertices, by group id.
+   */
+  static decode(data) {
+    const vertices = new Map();
+    for (const [groupId, line] of Object.entries(data ?? {})) {
+      vertices.set(
+        groupId,
+        new LineVertices(
+          decodeArray(line.positions),
+          decodeArray(line.rows, Uint32Array),
+          line.length,
+        ),
+      );
+    }
+    return vertices;
+  }
+
+  /**
+   * @param {number} x - Horizontal position, in SVG coordinates.
+   * @param {number} y - Vertical position, in SVG coordinates.
+   * @returns {number} Row of the vertex nearest to the position, or -1 if the line has no vertex.
+   */
+  nearestRow(x, y) {
+    if (!this.index) {
+      const n = this.rows.length;
+      const xs = new Float64Array(n);
+      const ys = new Float64Array(n);
+      for (let i = 0; i < n; i++) {
+        xs[i] = this.positions[2 * i];
+        ys[i] = this.positions[2 * i + 1];
+      }
+      this.index = new SpatialIndex(xs, ys);
+    }
+    const nearest = this.index.nearest(x, y);
+    return nearest === -1 ? -1 : this.rows[nearest];
+  }
+}
+
+/**
+ * Uniform grid over the centers of plot elements, used to find the
+ * element nearest to the mouse without scanning all of them. Centers
+ * are stored in typed arrays and bucketed by cell, and a query only
+ * visits rings of cells around the mouse until no unvisited cell can
+ * contain a closer center.
+ */
+class SpatialIndex {
+  /**
+   * @param {ArrayLike<number>} xs - X coordinate of each center.
+   * @param {ArrayLike<number>} ys - Y coordinate of each center (same length).
+   */
+  constructor(xs, ys) {
+    const n = xs.length;
+    this.xs = Float64Array.from(xs);
+    this.ys = Float64Array.from(ys);
+
+    let minX = Infinity;
+    let minY = Infinity;
+    let maxX = -Infinity;
+    let maxY = -Infinity;
+    let valid = 0;
+    for (let i = 0; i < n; i++) {
+      const x = this.xs[i];
+      const y = this.ys[i];
+      // elements without geometry are never the nearest
+      if (!Number.isFinite(x) || !Number.isFinite(y)) {
+        continue;
+      }
+      valid++;
+      minX = Math.min(minX, x);
+      minY = Math.min(minY, y);
+      maxX = Math.max(maxX, x);
+      maxY = Math.max(maxY, y);
+    }
+
+    // about one center per cell
+    const side = Math.max(1, Math.ceil(Math.sqrt(valid)));
+    this.size = valid;
+    this.cols = side;
+    this.rows = side;
+    this.minX = valid ? minX : 0;
+    this.minY = valid ? minY : 0;
+    this.cellWidth = valid && maxX > minX ? (maxX - minX) / side : 1;
+    this.cellHeight = valid && maxY > minY ? (maxY - minY) / side : 1;
+
+    // counting sort of the centers by cell
+    const cells = new Int32Array(n).fill(-1);
+    this.cellStart = new Int32Array(side * side + 1);
+    for (let i = 0; i < n; i++) {
+      if (Number.isFinite(this.xs[i]) && Number.isFinite(this.ys[i])) {
+        cells[i] = this.cellOf(this.xs[i], this.ys[i]);
+        this.cellStart[cells[i] + 1]++;
+      }
+    }
+    for (let c = 0; c < side * side; c++) {
+      this.cellStart[c + 1] += this.cellStart[c];
+    }
+    const fill = this.cellStart.slice(0, side * side);
+    this.items = new Int32Array(valid);
+    for (let i = 0; i < n; i++) {
+      if (cells[i] !== -1) {
+        this.items[fill[cells[i]]++] = i;
+      }
+    }
+  }
+
+  /**
+   * Build an index from the centers of elements. Centers computed by
+   * Python (see `decodePositions()`) are used when available, so
+   * that the layout is only read (with `getBBox()`) for the other
+   * elements.
+   *
+   * @param {Selection} elements - Selection of elements.
+   * @param {Map<string, Float32Array>} [positions] - Centers (`x0, y0, x1, y1...`) of the elements of each artist, by id of its SVG group.
+   * @returns {SpatialIndex} The index, in the order of the selection.
+   */
+  static fromElements(elements, positions = new Map()) {
+    const nodes = elements.nodes();
+    const xs = new Float64Array(nodes.length);
+    const ys = new Float64Array(nodes.length);
+    const ordinals = new Map();
+    nodes.forEach((node, i) => {
+      // position of the element among the elements of its artist
+      const group = node.closest ? node.closest("g[id]") : null;
+      const ordinal = ordinals.get(group) ?? 0;
+      ordinals.set(group, ordinal + 1);
+
+      const centers = group ? positions.get(group.id) : undefined;
+      if (centers && 2 * ordinal + 1 < centers.length) {
+        xs[i] = centers[2 * ordinal];
+        ys[i] = centers[2 * ordinal + 1];
+        return;
+      }
+      const bbox = node.getBBox ? node.getBBox() : null;
+      xs[i] = bbox ? bbox.x + bbox.width / 2 : NaN;
+      ys[i] = bbox ? bbox.y + bbox.height / 2 : NaN;
+    });
+    return new SpatialIndex(xs, ys);
+  }
+
+  column(x) {
+    const col = Math.floor((x - this.minX) / this.cellWidth);
+    return Math.min(this.cols - 1, Math.max(0, col));
+  }
+
+  row(y) {
+    const row = Math.floor((y - this.minY) / this.cellHeight);
+    return Math.min(this.rows - 1, Math.max(0, row));
+  }
+
+  cellOf(x, y) {
+    return this.row(y) * this.cols + this.column(x);
+  }
+
+  /**
+   * Find the center nearest to a position. Ties are resolved like a
+   * linear scan would (lowest index first).
+   *
+   * @param {number} x - X coordinate.
+   * @param {number} y - Y coordinate.
+   * @returns {number} Index of the nearest center, or -1 if the index is empty.
+   */
+  nearest(x, y) {
+    if (this.size === 0) {
+      return -1;
+    }
+    const col = this.column(x);
+    const row = this.row(y);
+    const maxRing = Math.max(this.cols, this.rows);
+
+    let best = -1;
+    let bestDist = Infinity;
+    const visit = (c, r) => {
+      const cell = r * this.cols + c;
+      for (let k = this.cellStart[cell]; k < this.cellStart[cell + 1]; k++) {
+        const i = this.items[k];
+        const dx = this.xs[i] - x;
+        const dy = this.ys[i] - y;
+        const dist = dx * dx + dy * dy;
+        if (dist < bestDist || (dist === bestDist && i < best)) {
+          best = i;
+          bestDist = dist;
+        }
+      }
+    };
+
+    for (let ring = 0; ring <= maxRing; ring++) {
+      const top = row - ring;
+      const bottom = row + ring;
+      for (let c = col - ring; c <= col + ring; c++) {
+        if (c < 0 || c >= this.cols) {
+          continue;
+        }
+        if (top >= 0) {
+          visit(c, top);
+        }
+        if (ring > 0 && bottom < this.rows) {
+          visit(c, bottom);
+        }
+      }
+      for (let r = top + 1; r < bottom; r++) {
+        if (r < 0 || r >= this.rows) {
+          continue;
+        }
+        if (col - ring >= 0) {
+          visit(col - ring, r);
+        }
+        if (col + ring < this.cols) {
+          visit(col + ring, r);
+        }
+      }
+
+      // distance from the position to the closest unvisited cell
+      const gap = Math.min(
+        x - (this.minX + (col - ring) * this.cellWidth),
+        this.minX + (col + ring + 1) * this.cellWidth - x,
+        y - (this.minY + (row - ring) * this.cellHeight),
+        this.minY + (row + ring + 1) * this.cellHeight - y,
+      );
+      if (best !== -1 && gap > 0 && gap * gap > bestDist) {
+        break;
+      }
+    }
+    return best;
+  }
+}
+
+/**
+ * Hover state of the plot elements of an axes. Elements are grouped
+ * by group code once, and moving the hover from one group to another
+ * only updates the classes of the elements of these two groups (all
+ * elements are only updated when the mouse enters or leaves).
+ */
+class HoverState {
+  /**
+   * @param {Element[]} elements - Plot elements of the axes, in document order.
+   * @param {ArrayLike<number>} groupCodes - Group code of each element.
+   * @param {CanvasMarkers|null} [markers] - Markers of the axes drawn on a canvas. They come first: the element `i` is then at index `markers.length + i`.
+   */
+  constructor(elements, groupCodes, markers = null) {
+    this.elements = elements;
+    this.groupCodes = groupCodes;
+    this.markers = markers;
+    const offset = markers?.length ?? 0;
+    this.members = new Map();
+    for (let i = 0; i < elements.length; i++) {
+      const code = groupCodes[offset + i];
+      let members = this.members.get(code);
+      if (!members) {
+        members = [];
+        this.members.set(code, members);
+      }
+      members.push(elements[i]);
+    }
+    this.index = null;
+    this.code = undefined;
+  }
+
+  /**
+   * Hover an element, or clear the hover state.
+   *
+   * @param {number|null} index - Index of the hovered element, or `null`.
+   * @returns {boolean} Whether the state changed.
+   */
+  update(index) {
+    if (index === this.index) {
+      return false;
+    }
+    const previous = this.index;
+    const previousCode = this.code;
+    this.index = index;
+    this.code = index === null ? undefined : this.groupCodes[index];
+
+    if (index === null) {
+      for (const element of this.elements) {
+        element.classList.remove("hovered", "not-hovered");
+      }
+    } else if (previous === null) {
+      const hovered = this.members.get(this.code) ?? [];
+      for (const element of this.elements) {
+        element.classList.add("not-hovered");
+      }
+      for (const element of hovered) {
+        element.classList.replace("not-hovered", "hovered");
+      }
+    } else if (this.code !== previousCode) {
+      for (const element of this.members.get(previousCode) ?? []) {
+        element.classList.replace("hovered", "not-hovered");
+      }
+      for (const element of this.members.get(this.code) ?? []) {
+        element.classList.replace("not-hovered", "hovered");
+      }
+    }
+    if (index === null || previous === null || this.code !== previousCode) {
+      this.markers?.highlight(this.groupCodes, index === null ? null : this.code);
+    }
+    return true;
+  }
+}
+
+const SVG_NAMESPACE = "http://www.w3.org/2000/svg";
+const XHTML_NAMESPACE = "http://www.w3.org/1999/xhtml";
+
+/**
+ * Markers of scatter plots drawn on canvases instead of being SVG
+ * elements (`render="canvas"` in Python). The markers of each artist
+ * are drawn on a canvas placed in its (empty) SVG group, so that they
+ * are stacked with the other elements as in the original figure, and
+ * scaled with the SVG. Markers are indexed in document order.
+ */
+class CanvasMarkers {
+  /**
+   * @param {Element} svg - The SVG element of the chart.
+   * @param {Array<[Element, Object]>} artists - Empty SVG group of each artist, with the data of its markers sent by Python (see `plotjs.canvas.marker_data()`).
+   */
+  constructor(svg, artists) {
+    this.svg = svg;
+    this.viewBox = (svg.getAttribute("viewBox") ?? "0 0 0 0")
+      .split(/[\s,]+/)
+      .map(Number);
+
+    this.layers = [];
+    let start = 0;
+    for (const [group, data] of artists) {
+      const centers = decodeArray(data["centers"]);
+      const layer = {
+        group,
+        start,
+        length: centers.length / 2,
+        centers,
+        scales: decodeArray(data["scales"]),
+        fill: CanvasMarkers.colors(decodeArray(data["fill"], Uint8Array)),
+        stroke: CanvasMarkers.colors(decodeArray(data["stroke"], Uint8Array)),
+        linewidths: decodeArray(data["linewidths"]),
+        paths: data["paths"],
+        radii: data["paths"].map(CanvasMarkers.radius),
+        clip: data["clip"],
+        foreignObject: null,
+        canvas: null,
+        overlay: null,
+        shapes: null,
+        // indices of the markers of each group code, in the layer
+        members: null,
+      };
+      this.layers.push(layer);
+      start += layer.length;
+    }
+    this.length = start;
+
+    this.xs = new Float64Array(this.length);
+    this.ys = new Float64Array(this.length);
+    for (const layer of this.layers) {
+      for (let i = 0; i < layer.length; i++) {
+        this.xs[layer.start + i] = layer.centers[2 * i];
+        this.ys[layer.start + i] = layer.centers[2 * i + 1];
+      }
+    }
+    this.index = null;
+
+    // no hover: every marker is drawn with the default opacity
+    this.groupCodes = null;
+    this.code = null;
+    this.membersOf = null;
+
+    this.view = null;
+    this.onResize = null;
+  }
+
+  /**
+   * Find the markers of an axes in the data sent by Python.
+   *
+   * @param {Element} svg - The SVG element of the chart.
+   * @param {string} axes_class - ID of the axes group.
+   * @param {Object<string, Object>} [markers] - Markers of each artist, by ID of its SVG group.
+   * @returns {CanvasMarkers} The markers of the axes.
+   */
+  static fromPlotData(svg, axes_class, markers) {
+    const artists = [];
+    for (const group of svg.querySelectorAll(`g#${axes_class} g[id]`)) {
+      const data = markers?.[group.id];
+      if (data) {
+        artists.push([group, data]);
+      }
+    }
+    return new CanvasMarkers(svg, artists);
+  }
+
+  /**
+   * @param {Uint8Array} rgba - Colors, as `r, g, b, a` bytes.
+   * @returns {string[]} CSS colors.
+   */
+  static colors(rgba) {
+    const colors = [];
+    for (let i = 0; i + 3 < rgba.length; i += 4) {
+      const alpha = rgba[i + 3] / 255;
+      colors.push(`rgba(${rgba[i]}, ${rgba[i + 1]}, ${rgba[i + 2]}, ${alpha})`);
+    }
+    return colors;
+  }
+
+  /**
+   * @param {string} path - SVG path data of a marker.
+   * @returns {number} Largest distance from the center of the marker to its path.
+   */
+  static radius(path) {
+    const numbers = path.match(/-?(?:\d+\.?\d*|\.\d+)(?:e[-+]?\d+)?/gi) ?? [];
+    return numbers.reduce((radius, n) => Math.max(radius, Math.abs(n)), 0);
+  }
+
+  /**
+   * @param {ArrayLike} values - One value per marker, or a single value for all of them.
+   * @param {number} i - Index of the marker in its artist.
+   * @returns {*} The value of the marker.
+   */
+  static valueOf(values, i) {
+    return values.length === 1 ? values[0] : values[i];
+  }
+
+  /**
+   * Create the canvases and draw the markers. They are drawn again
+   * when the window is resized, to stay sharp. Each artist has two
+   * canvases: one with all of its markers, and an overlay above it
+   * with the markers of the hovered group (see `highlight()`).
+   *
+   * @returns {CanvasMarkers} The instance, for chaining.
+   */
+  mount() {
+    const document = this.svg.ownerDocument;
+    const [x, y, width, height] = this.viewBox;
+    const createCanvas = (className) => {
+      const canvas = document.createElementNS(XHTML_NAMESPACE, "canvas");
+      canvas.setAttribute("class", className);
+      canvas.style.position = "absolute";
+      canvas.style.left = "0";
+      canvas.style.top = "0";
+      canvas.style.width = "100%";
+      canvas.style.height = "100%";
+      return canvas;
+    };
+    for (const layer of this.layers) {
+      const foreignObject = document.createElementNS(
+        SVG_NAMESPACE,
+        "foreignObject",
+      );
+      foreignObject.setAttribute("x", x);
+      foreignObject.setAttribute("y", y);
+      foreignObject.setAttribute("width", width);
+      foreignObject.setAttribute("height", height);
+      foreignObject.setAttribute("pointer-events", "none");
+      const container = document.createElementNS(XHTML_NAMESPACE, "div");
+      container.style.position = "relative";
+      container.style.width = "100%";
+      container.style.height = "100%";
+      layer.canvas = createCanvas("point-canvas");
+      layer.overlay = createCanvas("point-canvas-overlay");
+      container.append(layer.canvas, layer.overlay);
+      foreignObject.appendChild(container);
+      layer.group.appendChild(foreignObject);
+      layer.foreignObject = foreignObject;
+    }
+
+    this.view = document.defaultView;
+    this.onResize = () => this.draw();
+    this.view?.addEventListener("resize", this.onResize, { passive: true });
+    this.draw();
+    return this;
+  }
+
+  /**
+   * Remove the canvases and stop listening to the resizes of the
+   * window. The markers are not drawn until `mount()` is called again.
+   */
+  unmount() {
+    this.view?.removeEventListener("resize", this.onResize);
+    this.view = null;
+    this.onResize = null;
+    for (const layer of this.layers) {
+      layer.foreignObject?.remove();
+      layer.foreignObject = null;
+      layer.canvas = null;
+      layer.overlay = null;
+    }
+  }
+
+  /**
+   * @param {number} x - X coordinate, in SVG coordinates.
+   * @param {number} y - Y coordinate, in SVG coordinates.
+   * @returns {boolean} Whether the position is in the area where markers are drawn.
+   */
+  contains(x, y) {
+    return this.layers.some(
+      ({ clip }) =>
+        !clip ||
+        (x >= clip[0] &&
+          x <= clip[0] + clip[2] &&
+          y >= clip[1] &&
+          y <= clip[1] + clip[3]),
+    );
+  }
+
+  /**
+   * Find the marker drawn at a position.
+   *
+   * @param {number} x - X coordinate, in SVG coordinates.
+   * @param {number} y - Y coordinate, in SVG coordinates.
+   * @returns {number} Index of the marker, or -1 if there is none.
+   */
+  hit(x, y) {
+    this.index ??= new SpatialIndex(this.xs, this.ys);
+    const i = this.index.nearest(x, y);
+    if (i === -1) {
+      return -1;
+    }
+    const layer = this.layers.find(
+      (layer) => i >= layer.start && i < layer.start + layer.length,
+    );
+    const j = i - layer.start;
+    const radius =
+      Math.abs(CanvasMarkers.valueOf(layer.scales, j)) *
+        layer.radii[j % layer.radii.length] +
+      CanvasMarkers.valueOf(layer.linewidths, j) / 2;
+    const dx = x - this.xs[i];
+    const dy = y - this.ys[i];
+    return dx * dx + dy * dy <= radius * radius ? i : -1;
+  }
+
+  /**
+   * Highlight the markers of a group, or clear the highlight. Only
+   * the overlays are drawn again: the canvases with all the markers
+   * are faded out with CSS while a group is highlighted.
+   *
+   * @param {ArrayLike<number>} groupCodes - Group code of each marker.
+   * @param {number|null} code - Code of the hovered group, or `null`.
+   */
+  highlight(groupCodes, code) {
+    this.groupCodes = code === null ? null : groupCodes;
+    this.code = code;
+    this.drawHighlight();
+  }
+
+  /**
+   * Read an opacity from a CSS custom property of the SVG, so that
+   * the canvas follows the same CSS variables as SVG elements.
+   *
+   * @param {string} name - Name of the custom property.
+   * @param {number} fallback - Value used if the property is not set.
+   * @returns {number} The opacity.
+   */
+  opacity(name, fallback) {
+    const view = this.svg.ownerDocument?.defaultView;
+    const value = view?.getComputedStyle?.(this.svg).getPropertyValue(name);
+    const opacity = parseFloat(value);
+    return Number.isFinite(opacity) ? opacity : fallback;
+  }
+
+  /**
+   * Size a canvas to the current size of the chart, and clear it.
+   *
+   * @param {Element|null} canvas - The canvas.
+   * @returns {[CanvasRenderingContext2D, number]|null} Its context and the number of canvas pixels per SVG unit, or `null` if it can not be drawn.
+   */
+  prepare(canvas) {
+    const context = canvas?.getContext?.("2d");
+    const viewWidth = this.viewBox[2];
+    if (!context || typeof Path2D === "undefined" || !viewWidth) {
+      return null;
+    }
+
+    // canvas pixels per SVG unit, at the current size of the chart
+    const view = this.svg.ownerDocument?.defaultView;
+    const rect = canvas.getBoundingClientRect();
+    const k = (rect.width / viewWidth) * (view?.devicePixelRatio ?? 1) || 1;
+    const width = Math.max(1, Math.round(this.viewBox[2] * k));
+    const height = Math.max(1, Math.round(this.viewBox[3] * k));
+    if (canvas.width !== width || canvas.height !== height) {
+      canvas.width = width;
+      canvas.height = height;
+    } else {
+      context.setTransform(1, 0, 0, 1, 0, 0);
+      context.clearRect(0, 0, width, height);
+    }
+    return [context, k];
+  }
+
+  /**
+   * Draw markers of an artist on a prepared canvas.
+   *
+   * @param {Object} layer - The layer of the artist.
+   * @param {CanvasRenderingContext2D} context - Context of the canvas.
+   * @param {number} k - Canvas pixels per SVG unit.
+   * @param {ArrayLike<number>|null} indices - Indices of the markers in the artist, or `null` for all of them.
+   * @param {number} alpha - Opacity of the markers.
+   */
+  paint(layer, context, k, indices, alpha) {
+    const [viewX, viewY] = this.viewBox;
+    layer.shapes ??= layer.paths.map((path) => new Path2D(path));
+
+    context.save();
+    if (layer.clip) {
+      context.setTransform(k, 0, 0, k, -k * viewX, -k * viewY);
+      context.beginPath();
+      context.rect(...layer.clip);
+      context.clip();
+    }
+    context.globalAlpha = alpha;
+    const count = indices ? indices.length : layer.length;
+    for (let n = 0; n < count; n++) {
+      const i = indices ? indices[n] : n;
+      const scale = CanvasMarkers.valueOf(layer.scales, i);
+      if (!scale) {
+        continue;
+      }
+      context.setTransform(
+        k * scale,
+        0,
+        0,
+        k * scale,
+        k * (layer.centers[2 * i] - viewX),
+        k * (layer.centers[2 * i + 1] - viewY),
+      );
+
+      const shape = layer.shapes[i % layer.shapes.length];
+      context.fillStyle = CanvasMarkers.valueOf(layer.fill, i);
+      context.fill(shape);
+      const linewidth = CanvasMarkers.valueOf(layer.linewidths, i);
+      if (linewidth > 0) {
+        context.lineWidth = linewidth / Math.abs(scale);
+        context.strokeStyle = CanvasMarkers.valueOf(layer.stroke, i);
+        context.stroke(shape);
+      }
+    }
+    context.restore();
+  }
+
+  /**
+   * Draw all the markers, then the highlight of the hovered group
+   * (if any).
+   */
+  draw() {
+    const opacity = this.opacity("--default-opacity", 1);
+    for (const layer of this.layers) {
+      const prepared = this.prepare(layer.canvas);
+      if (prepared) {
+        this.paint(layer, ...prepared, null, opacity);
+      }
+    }
+    this.drawHighlight();
+  }
+
+  /**
+   * Fade out the canvases with all the markers and draw the markers
+   * of the hovered group on the overlays, or clear the highlight.
+   */
+  drawHighlight() {
+    const opacity = this.opacity("--default-opacity", 1);
+    const fadedOpacity = this.opacity("--default-not-hovered-opacity", 0.2);
+    if (this.code !== null && this.membersOf !== this.groupCodes) {
+      // group the markers of each layer once per set of group codes
+      for (const layer of this.layers) {
+        layer.members = new Map();
+        for (let i = 0; i < layer.length; i++) {
+          const code = this.groupCodes[layer.start + i];
+          if (!layer.members.has(code)) {
+            layer.members.set(code, []);
+          }
+          layer.members.get(code).push(i);
+        }
+      }
+      this.membersOf = this.groupCodes;
+    }
+
+    for (const layer of this.layers) {
+      if (!layer.canvas) {
+        continue;
+      }
+      layer.canvas.style.opacity =
+        this.code === null ? "" : String(opacity ? fadedOpacity / opacity : 0);
+      const prepared = this.prepare(layer.overlay);
+      const members = layer.members?.get(this.code);
+      if (prepared && this.code !== null && members) {
+        this.paint(layer, ...prepared, members, opacity);
+      }
+    }
+  }
+}
+
+/**
+ * @returns {Object} An empty bucket of candidate plot elements (see `walkSVG()`).
+ */
+function emptyBucket() {
+  return {
+    // `g[id^="patch"]` groups
+    patches: [],
+    // paths of `g[id^="patch_"]` groups
+    patchPaths: [],
+    // `<use>` in a group of a `PathCollection`, and the ones of legends
+    uses: [],
+    legendUses: [],
+    // paths of `PathCollection` groups, and the ones of legends
+    collectionPaths: [],
+    legendCollectionPaths: [],
+    // paths of `QuadMesh` groups
+    meshPaths: [],
+    // paths of `line2d` groups outside of the axis, and the ones of legends
+    linePaths: [],
+    legendLinePaths: [],
+    // paths of `FillBetweenPolyCollection` groups
+    areaPaths: [],
+    // paths of `patch` groups of legends
+    legendPatchPaths: [],
+    // elements tagged by Python (with a `data-idx`), by type
+    tagged: new Map(),
+  };
+}
+
+const TOP_CONTEXT = {
+  axes: [],
+  legend: false,
+  // 1 in a `PathCollection` group, 2 in a group inside it
+  collection: 0,
+  patch: false,
+  piePatch: false,
+  line: false,
+  axis: false,
+  mesh: false,
+  area: false,
+};
+
+/**
+ * Context of the children of a group: the axes and artists they are in.
+ *
+ * @param {Object} context - Context of the group.
+ * @param {string} id - ID of the group.
+ * @returns {Object} Context of its children.
+ */
+function enterGroup(context, id) {
+  if (!id && context.collection !== 1) {
+    return context;
+  }
+  return {
+    axes: id.startsWith("axes_") ? [...context.axes, id] : context.axes,
+    legend: context.legend || id.startsWith("legend"),
+    collection: context.collection
+      ? 2
+      : id.startsWith("PathCollection")
+        ? 1
+        : 0,
+    patch: context.patch || id.startsWith("patch"),
+    piePatch: context.piePatch || id.startsWith("patch_"),
+    line: context.line || id.startsWith("line2d"),
+    axis: context.axis || id.startsWith("matplotlib.axis"),
+    mesh: context.mesh || id.startsWith("QuadMesh"),
+    area: context.area || id.startsWith("FillBetweenPolyCollection"),
+  };
+}
+
+/**
+ * Walk an SVG once, with a TreeWalker, and bucket the candidate plot
+ * elements by axes (groups whose ID starts with "axes_") and by the
+ * kind of artist containing them, in document order. Finding the plot
+ * elements of all the axes is then linear in the number of nodes,
+ * instead of running selectors from the root of the SVG for each type
+ * of element of each axes.
+ *
+ * @param {Element} root - The SVG element.
+ * @returns {{axes: Map<string, Object>, groups: Map<string, Element>}} The bucket of each axes (see `emptyBucket()`), by axes ID, and the first group with each ID.
+ */
+function walkSVG(root) {
+  const axes = new Map();
+  const groups = new Map();
+  if (!root?.ownerDocument) {
+    return { axes, groups };
+  }
+
+  // 1 is `NodeFilter.SHOW_ELEMENT`
+  const walker = root.ownerDocument.createTreeWalker(root, 1);
+  const stack = [[root, TOP_CONTEXT]];
+  for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+    while (stack.length > 1 && stack[stack.length - 1][0] !== node.parentNode) {
+      stack.pop();
+    }
+    const context = stack[stack.length - 1][1];
+    const tag = node.localName;
+    const id = tag === "g" ? node.getAttribute("id") ?? "" : "";
+    if (id && !groups.has(id)) {
+      groups.set(id, node);
+    }
+
+    for (const axes_class of context.axes) {
+      let bucket = axes.get(axes_class);
+      if (!bucket) {
+        bucket = emptyBucket();
+        axes.set(axes_class, bucket);
+      }
+      if (node.hasAttribute("data-idx")) {
+        const type = node.classList.item(0);
+        if (!bucket.tagged.has(type)) {
+          bucket.tagged.set(type, []);
+        }
+        bucket.tagged.get(type).push(node);
+      }
+      if (tag === "g" && id.startsWith("patch")) {
+        bucket.patches.push(node);
+      } else if (tag === "use" && context.collection === 2) {
+        bucket.uses.push(node);
+        if (context.legend) {
+          bucket.legendUses.push(node);
+        }
+      } else if (tag === "path") {
+        if (context.collection) {
+          bucket.collectionPaths.push(node);
+          if (context.legend) {
+            bucket.legendCollectionPaths.push(node);
+          }
+        }
+        if (context.piePatch) {
+          bucket.patchPaths.push(node);
+        }
+        if (context.mesh) {
+          bucket.meshPaths.push(node);
+        }
+        if (context.line && !context.axis) {
+          bucket.linePaths.push(node);
+        }
+        if (context.line && context.legend) {
+          bucket.legendLinePaths.push(node);
+        }
+        if (context.area) {
+          bucket.areaPaths.push(node);
+        }
+        if (context.patch && context.legend) {
+          bucket.legendPatchPaths.push(node);
+        }
+      }
+    }
+
+    stack.push([node, tag === "g" ? enterGroup(context, id) : context]);
+  }
+  return { axes, groups };
+}
+
+/**
+ * Timings of the charts of a page, recorded with the User Timing API
+ * (`performance.mark()`/`measure()`, visible in the performance panel
+ * of the browser) and summarized for monitoring. The metrics shared
+ * by all the charts of a page are exposed as `window.plotjs.metrics`.
+ */
+class PlotMetrics {
+  // number of hover latencies kept to compute percentiles
+  static MAX_SAMPLES = 1000;
+
+  /**
+   * @param {Performance} [performance] - Timing API to use, `globalThis.performance` by default.
+   */
+  constructor(performance = globalThis.performance) {
+    this.performance = performance;
+    // duration of the phases of each chart, and of each of its axes
+    this.charts = {};
+    this.hoverCount = 0;
+    this.hoverTotal = 0;
+    this.hoverMax = 0;
+    // latest hover latencies, as a ring buffer
+    this.hoverSamples = [];
+  }
+
+  /**
+   * Current time, in milliseconds.
+   *
+   * @returns {number}
+   */
+  now() {
+    return this.performance?.now() ?? Date.now();
+  }
+
+  /**
+   * Run a phase of the initialization of a chart, and record its
+   * duration. It is also measured as `plotjs:<chart>[:<axes>]:<phase>`.
+   *
+   * @param {string} chart - ID of the chart container.
+   * @param {string|null} axes - ID of the axes, or `null` for the whole chart.
+   * @param {string} phase - Name of the phase (e.g. "findPoints"). Durations of a phase run several times are added.
+   * @param {Function} callback - Function running the phase.
+   * @returns {*} The result of `callback`.
+   */
+  time(chart, axes, phase, callback) {
+    const name = ["plotjs", chart, axes, phase].filter(Boolean).join(":");
+    const performance = this.performance;
+    const marks =
+      typeof performance?.mark === "function" &&
+      typeof performance?.measure === "function";
+    if (marks) {
+      performance.mark(`${name}:start`);
+    }
+    const start = this.now();
+    try {
+      return callback();
+    } finally {
+      const duration = this.now() - start;
+      if (marks) {
+        performance.mark(`${name}:end`);
+        performance.measure(name, `${name}:start`, `${name}:end`);
+        performance.clearMarks?.(`${name}:start`);
+        performance.clearMarks?.(`${name}:end`);
+      }
+
+      this.charts[chart] ??= { phases: {}, axes: {} };
+      const phases = axes
+        ? (this.charts[chart].axes[axes] ??= {})
+        : this.charts[chart].phases;
+      phases[phase] = (phases[phase] ?? 0) + duration;
+    }
+  }
+
+  /**
+   * Record the latency of a hover, from the pointer event to the end
+   * of the update of the chart.
+   *
+   * @param {number} latency - Latency, in milliseconds.
+   */
+  recordHover(latency) {
+    this.hoverSamples[this.hoverCount % PlotMetrics.MAX_SAMPLES] = latency;
+    this.hoverCount++;
+    this.hoverTotal += latency;
+    this.hoverMax = Math.max(this.hoverMax, latency);
+  }
+
+  /**
+   * Summarize the metrics.
+   *
+   * @returns {{charts: Object, hover: {count: number, mean: number, p50: number, p95: number, max: number}}}
+   *   The durations of the phases of each chart (in milliseconds), and
+   *   statistics of the hover latencies (percentiles are computed on
+   *   the latest ones).
+   */
+  summary() {
+    const samples = [...this.hoverSamples].sort((a, b) => a - b);
+    const percentile = (p) =>
+      samples.length === 0
+        ? 0
+        : samples[Math.min(samples.length - 1, Math.floor(p * samples.length))];
+    return {
+      charts: structuredClone(this.charts),
+      hover: {
+        count: this.hoverCount,
+        mean: this.hoverCount === 0 ? 0 : this.hoverTotal / this.hoverCount,
+        p50: percentile(0.5),
+        p95: percentile(0.95),
+        max: this.hoverMax,
+      },
+    };
+  }
+
+  /**
+   * Log the summary in the console, as tables.
+   */
+  log() {
+    const { charts, hover } = this.summary();
+    for (const [chart, { phases, axes }] of Object.entries(charts)) {
+      console.info(`PlotJS: ${chart}`);
+      console.table({ [chart]: phases, ...axes });
+    }
+    console.info("PlotJS: hover latency (ms)");
+    console.table(hover);
+  }
+}
+
+/**
+ * Get the metrics shared by all the charts of the page (created on
+ * first use), exposed as `window.plotjs.metrics`.
+ *
+ * @returns {PlotMetrics}
+ */
+function pageMetrics() {
+  globalThis.plotjs ??= {};
+  globalThis.plotjs.metrics ??= new PlotMetrics();
+  return globalThis.plotjs.metrics;
+}
+
 /**
  * Core utility for parsing and interacting with matplotlib-generated SVG outputs.
  * Provides methods to query common plot elements (bars, points, lines, areas),
@@ -146,18 +1414,442 @@ function getPointerPosition(event, svgElement) {
  */
 export default class PlotSVGParser {
   /**
-   * Create a new parser bound to an SVG figure.
+   * Create a new parser bound to an SVG figure.
+   *
+   * @param {Element|Selection} svg - The target SVG element or Selection (e.g. the entire plot).
+   * @param {Element|Selection} tooltip - The tooltip container element or Selection (e.g. a div).
+   * @param {number} tooltip_x_shift - Horizontal offset for tooltip positioning.
+   * @param {number} tooltip_y_shift - Vertical offset for tooltip positioning.
+   * @param {Map<string, Float32Array>} [positions] - Centers of the elements of each artist (see `decodePositions()`).
+   * @param {PlotMetrics} [metrics] - Where to record hover latencies, if any.
+   */
+  constructor(
+    svg,
+    tooltip,
+    tooltip_x_shift,
+    tooltip_y_shift,
+    positions,
+    metrics = null,
+  ) {
+    this.svg = svg instanceof Selection ? svg : select(svg);
+    this.tooltip = tooltip instanceof Selection ? tooltip : select(tooltip);
+    this.tooltip_x_shift = tooltip_x_shift;
+    this.tooltip_y_shift = tooltip_y_shift;
+
+    // centers of the elements computed by Python, if any
+    this.positions = positions ?? new Map();
+
+    // plot elements and spatial index of each axes, built on first use
+    this.axesCache = new Map();
+
+    // the screen transform of the SVG only changes when the page is
+    // resized or scrolled, so it is not recomputed on every mousemove
+    this.screenTransform = null;
+    const svgNode = this.svg.nodes()[0];
+    const invalidate = () => {
+      this.screenTransform = null;
+    };
+    const view = svgNode?.ownerDocument?.defaultView;
+    view?.addEventListener("resize", invalidate, { passive: true });
+    view?.addEventListener("scroll", invalidate, {
+      passive: true,
+      capture: true,
+    });
+    svgNode?.addEventListener?.("mouseenter", invalidate);
+
+    // pointer events are coalesced into one update per animation frame
+    this.view = view;
+    this.pendingUpdates = new Map();
+
+    // last values written to the tooltip, to skip identical writes
+    this.tooltipState = { display: null, content: null, transform: null };
+
+    this.metrics = metrics;
+
+    // artists of each axes, listed by Python (see `setManifest()`)
+    this.manifest = null;
+    this.tagged = false;
+
+    // vertices of the downsampled lines, by group id (see `setVertices()`)
+    this.vertices = new Map();
+
+    // candidate plot elements of each axes, found in a single walk of
+    // the SVG (see `walkSVG()`)
+    this.tree = null;
+  }
+
+  /**
+   * Run an update on the next animation frame (or right away when
+   * `requestAnimationFrame` is not available). A pending update with
+   * the same key is replaced, so that only the latest event of each
+   * frame is processed. Updates run in the order of their last call.
    *
-   * @param {Element|Selection} svg - The target SVG element or Selection (e.g. the entire plot).
-   * @param {Element|Selection} tooltip - The tooltip container element or Selection (e.g. a div).
-   * @param {number} tooltip_x_shift - Horizontal offset for tooltip positioning.
-   * @param {number} tooltip_y_shift - Vertical offset for tooltip positioning.
+   * @param {string} key - Identifier of the update (e.g. the axes ID).
+   * @param {Function} update - Function to run.
    */
-  constructor(svg, tooltip, tooltip_x_shift, tooltip_y_shift) {
-    this.svg = svg instanceof Selection ? svg : select(svg);
-    this.tooltip = tooltip instanceof Selection ? tooltip : select(tooltip);
-    this.tooltip_x_shift = tooltip_x_shift;
-    this.tooltip_y_shift = tooltip_y_shift;
+  schedule(key, update) {
+    if (typeof this.view?.requestAnimationFrame !== "function") {
+      update();
+      return;
+    }
+    const idle = this.pendingUpdates.size === 0;
+    this.pendingUpdates.delete(key);
+    this.pendingUpdates.set(key, update);
+    if (idle) {
+      this.view.requestAnimationFrame(() => {
+        const updates = [...this.pendingUpdates.values()];
+        this.pendingUpdates.clear();
+        for (const pending of updates) {
+          pending();
+        }
+      });
+    }
+  }
+
+  /**
+   * Update the tooltip, only writing to the DOM what changed. The
+   * tooltip is moved with a `transform`, which does not trigger a
+   * layout.
+   *
+   * @param {string} display - CSS display of the tooltip.
+   * @param {number} [x] - Horizontal position, in page coordinates.
+   * @param {number} [y] - Vertical position, in page coordinates.
+   * @param {string} [content] - HTML content (unchanged if undefined).
+   */
+  updateTooltip(display, x, y, content) {
+    const state = this.tooltipState;
+    if (display !== state.display) {
+      this.tooltip.style("display", display);
+      state.display = display;
+    }
+    if (display === "none") {
+      return;
+    }
+    if (content !== undefined && content !== state.content) {
+      this.tooltip.html(content);
+      state.content = content;
+    }
+    const transform = `translate3d(${x}px, ${y}px, 0)`;
+    if (transform !== state.transform) {
+      this.tooltip.style("transform", transform);
+      state.transform = transform;
+    }
+  }
+
+  /**
+   * Get the mouse position in the coordinates of the SVG, using the
+   * cached screen transform.
+   *
+   * @param {MouseEvent|{clientX: number, clientY: number}} event - The mouse event, or its client coordinates.
+   * @returns {number[]} [x, y] coordinates relative to the SVG.
+   */
+  pointerPosition(event) {
+    const svg = this.svg.nodes()[0];
+
+    if (svg && svg.createSVGPoint) {
+      this.screenTransform ??= svg.getScreenCTM().inverse();
+      const point = svg.createSVGPoint();
+      point.x = event.clientX;
+      point.y = event.clientY;
+      const transformed = point.matrixTransform(this.screenTransform);
+      return [transformed.x, transformed.y];
+    }
+
+    this.screenTransform ??= svg.getBoundingClientRect();
+    return [
+      event.clientX - this.screenTransform.left,
+      event.clientY - this.screenTransform.top,
+    ];
+  }
+
+  /**
+   * Get the plot elements of an axes (in document order), the
+   * spatial index of their centers and their hover state. They are
+   * computed once, the first time they are needed: plot elements are
+   * only selected when they are read, once all of them are classified.
+   *
+   * @param {string} axes_class - ID of the axes group.
+   * @returns {{elements: Selection, markers: CanvasMarkers|null, index: SpatialIndex|null, hover: HoverState|null, labels: Map|null|undefined, nearest: boolean}} Cached data of the axes.
+   */
+  axesElements(axes_class) {
+    let cached = this.axesCache.get(axes_class);
+    if (!cached) {
+      const axesGroup = this.svg.select(`g#${axes_class}`);
+      let elements = null;
+      cached = {
+        get elements() {
+          elements ??= axesGroup.selectAll(".plot-element");
+          return elements;
+        },
+        markers: null,
+        index: null,
+        hover: null,
+        labels: undefined,
+        nearest: false,
+      };
+      this.axesCache.set(axes_class, cached);
+    }
+    return cached;
+  }
+
+  /**
+   * Set the markers of an axes drawn on a canvas. They come before
+   * the plot elements of the axes in the index of hovered elements,
+   * so this must be called before `setHoverEffect()`.
+   *
+   * @param {string} axes_class - ID of the axes group.
+   * @param {CanvasMarkers} markers - The markers.
+   */
+  setCanvasMarkers(axes_class, markers) {
+    this.axesElements(axes_class).markers = markers;
+  }
+
+  /**
+   * Set the manifest of the interactive artists of each axes, written
+   * by Python when rendering the figure. Plot elements of the artists
+   * listed in the manifest are then found by direct lookup instead of
+   * being recognized from the SVG (only legends are still scanned).
+   *
+   * When the elements were tagged by Python, they already have their
+   * `class`, `data-idx` (position among the elements of the same type
+   * of the axes) and, for points, `data-group` attributes: they are
+   * selected by class and left untouched.
+   *
+   * @param {Object<string, Array<[string, string]>>|null} manifest - `[id, type]` of the SVG group of each artist, by axes ID, in document order. Types are "point", "line", "bar", "pie", "area" and "rectangle".
+   * @param {boolean} [tagged] - Whether the elements of the manifest were tagged by Python.
+   */
+  setManifest(manifest, tagged = false) {
+    this.manifest = manifest ? new Map(Object.entries(manifest)) : null;
+    this.tagged = this.manifest !== null && tagged;
+  }
+
+  /**
+   * Set the vertices of the lines downsampled by Python. Each vertex
+   * of these lines has its own label: in the labels of the lines of
+   * an axes, the rows of these lines replace them, one line after the
+   * other (see `vertexLabels()`).
+   *
+   * @param {Map<string, LineVertices>} vertices - Vertices of the lines, by group id (see `LineVertices.decode()`).
+   */
+  setVertices(vertices) {
+    this.vertices = vertices;
+  }
+
+  /**
+   * Index the labels of plot elements of the same type, when some of
+   * them are lines downsampled by Python (see `setVertices()`): the
+   * rows of these lines replace them in the labels.
+   *
+   * @param {Element[]} nodes - Plot elements of the same type, in document order.
+   * @param {number} offset - Index of the first element.
+   * @returns {Map<Element, {line: LineVertices|undefined, label: number}>|null} Vertices (if any) and index of the first label of each element, or `null` when none of them is a downsampled line.
+   */
+  vertexLabels(nodes, offset) {
+    if (this.vertices.size === 0) {
+      return null;
+    }
+    const labels = new Map();
+    let shift = 0;
+    let found = false;
+    nodes.forEach((node, i) => {
+      const line = this.vertices.get(node.parentNode?.id);
+      labels.set(node, { line, label: offset + i + shift });
+      if (line) {
+        shift += line.length - 1;
+        found = true;
+      }
+    });
+    return found ? labels : null;
+  }
+
+  /**
+   * Index the labels of all the plot elements of an axes (see
+   * `vertexLabels()`), for `hover_nearest`: the nearest element is
+   * found among the elements of all types of the axes.
+   *
+   * @param {string} axes_class - ID of the axes group.
+   * @returns {Map<Element, Object>|null} Labels of the elements of the axes, or `null` when none of them is a downsampled line.
+   */
+  nearestLabels(axes_class) {
+    const cached = this.axesElements(axes_class);
+    if (cached.labels === undefined) {
+      cached.labels = this.vertexLabels(
+        cached.elements.nodes(),
+        cached.markers?.length ?? 0,
+      );
+    }
+    return cached.labels;
+  }
+
+  /**
+   * Get the index of the label of a hovered element. It is the index
+   * of the element, unless its type has lines downsampled by Python
+   * (see `vertexLabels()`): the label of these lines is the one of
+   * their vertex nearest to the mouse.
+   *
+   * @param {Map<Element, Object>|null} labels - Labels of the elements of the same type (see `vertexLabels()`).
+   * @param {Element|undefined} node - The hovered element.
+   * @param {number|null} index - Index of the hovered element, or `null`.
+   * @param {{clientX: number, clientY: number}} pointer - Position of the mouse.
+   * @returns {number|null} Index of the label, or `null`.
+   */
+  labelIndex(labels, node, index, pointer) {
+    const entry = node ? labels?.get(node) : undefined;
+    if (index === null || !entry) {
+      return index;
+    }
+    if (!entry.line) {
+      return entry.label;
+    }
+    const [x, y] = this.pointerPosition(pointer);
+    const row = entry.line.nearestRow(x, y);
+    return row === -1 ? null : entry.label + row;
+  }
+
+  /**
+   * Get the plot elements of the artists of a given type, according
+   * to the manifest of an axes.
+   *
+   * @param {string} axes_class - ID of the axes group.
+   * @param {string} type - Type of the artists (e.g. "point").
+   * @returns {Element[]|null} The plot elements, in document order, or `null` when the axes has no manifest.
+   */
+  manifestElements(axes_class, type) {
+    const entries = this.manifest?.get(axes_class);
+    if (!entries) {
+      return null;
+    }
+    if (this.tagged) {
+      return [...(this.bucket(this.svg, axes_class).tagged.get(type) ?? [])];
+    }
+
+    // ids are only unique within a chart: groups are looked up in the
+    // SVG, not in the document
+    const groups = this.walk(this.svg).groups;
+    const elements = [];
+    for (const [id, entryType] of entries) {
+      const group = groups.get(id);
+      if (entryType !== type || !group) {
+        continue;
+      }
+      if (type === "bar") {
+        elements.push(group);
+      } else if (type === "point" && group.querySelector("use")) {
+        elements.push(...group.querySelectorAll("use"));
+      } else {
+        elements.push(...group.querySelectorAll("path"));
+      }
+    }
+    return elements;
+  }
+
+  /**
+   * Walk the SVG to find the candidate plot elements of all its axes,
+   * the first time it is needed (see `walkSVG()`).
+   *
+   * @param {Selection} svg - Selection of the SVG element.
+   * @returns {{axes: Map<string, Object>, groups: Map<string, Element>}} The candidate elements of each axes, and the groups of the SVG by ID.
+   */
+  walk(svg) {
+    const root = svg.nodes()[0];
+    if (this.tree?.root !== root) {
+      this.tree = { root, ...walkSVG(root) };
+    }
+    return this.tree;
+  }
+
+  /**
+   * @param {Selection} svg - Selection of the SVG element.
+   * @param {string} axes_class - ID of the axes group.
+   * @returns {Object} Candidate plot elements of the axes (see `emptyBucket()`).
+   */
+  bucket(svg, axes_class) {
+    return this.walk(svg).axes.get(axes_class) ?? emptyBucket();
+  }
+
+  /**
+   * Set the class of plot elements of a given type. Elements found
+   * from a manifest tagged by Python (which come first) already have
+   * it.
+   *
+   * @param {Selection} elements - The plot elements.
+   * @param {string} type - Type of the elements (e.g. "point").
+   * @param {Element[]|null} manifest - Elements found from the manifest, if any.
+   */
+  classify(elements, type, manifest) {
+    const nodes = elements.nodes();
+    const start = this.tagged && manifest ? manifest.length : 0;
+    for (let i = start; i < nodes.length; i++) {
+      nodes[i].setAttribute("class", `${type} plot-element`);
+    }
+  }
+
+  /**
+   * @param {string} axes_class - ID of the axes group.
+   * @returns {SpatialIndex} Spatial index of the markers drawn on a canvas and plot elements of the axes.
+   */
+  spatialIndex(axes_class) {
+    const cached = this.axesElements(axes_class);
+    if (!cached.index) {
+      const index = SpatialIndex.fromElements(cached.elements, this.positions);
+      const markers = cached.markers;
+      cached.index = markers
+        ? new SpatialIndex(
+            [...markers.xs, ...index.xs],
+            [...markers.ys, ...index.ys],
+          )
+        : index;
+    }
+    return cached.index;
+  }
+
+  /**
+   * @param {string} axes_class - ID of the axes group.
+   * @param {ArrayLike<number>} groupCodes - Group code of each plot element of the axes.
+   * @returns {HoverState} Hover state of the plot elements of the axes, shared by all their hover effects.
+   */
+  hoverState(axes_class, groupCodes) {
+    const cached = this.axesElements(axes_class);
+    cached.hover ??= new HoverState(
+      cached.elements.nodes(),
+      groupCodes,
+      cached.markers,
+    );
+    return cached.hover;
+  }
+
+  /**
+   * Hover an element of an axes (or clear the hover state), and
+   * update the tooltip accordingly.
+   *
+   * @param {string} axes_class - ID of the axes group.
+   * @param {ArrayLike<number>} groupCodes - Group code of each element.
+   * @param {TooltipTemplate} labels - Tooltip labels of the elements.
+   * @param {"block"|"none"} show_tooltip - Whether to display tooltips.
+   * @param {number|null} index - Index of the hovered element, or `null`.
+   * @param {number} [x] - Horizontal position of the tooltip.
+   * @param {number} [y] - Vertical position of the tooltip.
+   * @param {number|null} [label] - Index of the label (see `labelIndex()`), the index of the element by default.
+   */
+  hover(
+    axes_class,
+    groupCodes,
+    labels,
+    show_tooltip,
+    index,
+    x,
+    y,
+    label = index,
+  ) {
+    const changed = this.hoverState(axes_class, groupCodes).update(index);
+    if (index === null || label === null) {
+      this.updateTooltip("none");
+    } else {
+      // the label only changes with the hovered element (or vertex)
+      const content =
+        changed || label !== index ? labels.get(label) : undefined;
+      this.updateTooltip(show_tooltip, x, y, content);
+    }
   }
 
   /**
@@ -185,18 +1877,20 @@ export default class PlotSVGParser {
    * @returns {Selection} Selection of bar elements.
    */
   findBars(svg, axes_class) {
-    // select all #patch within the specific axes
-    const bars = svg
-      .selectAll(`g#${axes_class} g[id^="patch"]`)
-      .filter(function () {
-        const path = select(this).select("path");
-        // that have a clip-path attribute
-        const clip = path.attr("clip-path");
-        // starting with "url("
-        return clip && clip.startsWith("url(");
-      });
+    const manifest = this.manifestElements(axes_class, "bar");
+    // all #patch within the specific axes
+    const patches = new Selection(this.bucket(svg, axes_class).patches);
+    const bars = manifest
+      ? new Selection(manifest)
+      : patches.filter(function () {
+          const path = select(this).select("path");
+          // that have a clip-path attribute
+          const clip = path.attr("clip-path");
+          // starting with "url("
+          return clip && clip.startsWith("url(");
+        });
 
-    bars.attr("class", "bar plot-element");
+    this.classify(bars, "bar", manifest);
 
     console.log(`Found ${bars.size()} "bar" element`);
     return bars;
@@ -209,21 +1903,30 @@ export default class PlotSVGParser {
    *
    * @param {Selection} svg - Selection of the SVG element.
    * @param {string} axes_class - ID of the axes group (e.g. "axes_1").
-   * @param {string[]} tooltip_groups - Group identifiers for tooltips, parallel to points.
+   * @param {string[]|Categorical} tooltip_groups - Group identifiers for tooltips, parallel to points.
    * @returns {Selection} Selection of point elements.
    */
   findPoints(svg, axes_class, tooltip_groups) {
-    let points = svg.selectAll(`g#${axes_class} g[id^="PathCollection"] g use`);
+    const manifest = this.manifestElements(axes_class, "point");
+    const bucket = this.bucket(svg, axes_class);
+    // only the legend is scanned when the axes has a manifest
+    let found = manifest ? bucket.legendUses : bucket.uses;
 
-    if (points.empty()) {
+    if (found.length === 0) {
       // fallback: no <use> found → grab <path> instead
-      points = svg.selectAll(`g#${axes_class} g[id^="PathCollection"] path`);
+      found = manifest
+        ? bucket.legendCollectionPaths
+        : bucket.collectionPaths;
     }
+    const points = new Selection(manifest ? [...manifest, ...found] : found);
 
-    points.each(function (_, i) {
-      select(this).attr("data-group", tooltip_groups[i]);
-    });
-    points.attr("class", "point plot-element");
+    const groups = Categorical.from(tooltip_groups);
+    const nodes = points.nodes();
+    const start = this.tagged && manifest ? manifest.length : 0;
+    for (let i = start; i < nodes.length; i++) {
+      nodes[i].setAttribute("data-group", groups.get(i));
+    }
+    this.classify(points, "point", manifest);
 
     console.log(`Found ${points.size()} "point" element`);
     return points;
@@ -237,8 +1940,11 @@ export default class PlotSVGParser {
    * @returns {Selection} Selection of rectangle elements.
    */
   findRectangles(svg, axes_class) {
-    let rectangles = svg.selectAll(`g#${axes_class} g[id^="QuadMesh"] path`);
-    rectangles.attr("class", "rectangle plot-element");
+    const manifest = this.manifestElements(axes_class, "rectangle");
+    const rectangles = manifest
+      ? new Selection(manifest)
+      : new Selection(this.bucket(svg, axes_class).meshPaths);
+    this.classify(rectangles, "rectangle", manifest);
     console.log(`Found ${rectangles.size()} "rectangle" element`);
     return rectangles;
   }
@@ -251,32 +1957,39 @@ export default class PlotSVGParser {
    * @returns {Selection} Selection of pie elements.
    */
   findPies(svg, axes_class) {
+    const manifest = this.manifestElements(axes_class, "pie");
+    if (manifest) {
+      const pies = new Selection(manifest);
+      this.classify(pies, "pie", manifest);
+      console.log(`Found ${pies.size()} "pie" element`);
+      return pies;
+    }
+
     const parser = this;
-    const pies = svg
-      .selectAll(`g#${axes_class} g[id^="patch_"] path`)
-      .filter(function () {
-        const element = this;
-        const clipPath = element.getAttribute("clip-path");
-        const normalizedFill = parser.getFillValue(element);
-        const pathData = element.getAttribute("d") ?? "";
-
-        const parent = element.parentElement;
-        const grandparent = parent?.parentElement;
-        const isInLegend =
-          parent?.tagName?.toLowerCase() === "g" &&
-          grandparent?.tagName?.toLowerCase() === "g" &&
-          /^legend_\d+$/.test(grandparent.id);
-
-        return (
-          !isInLegend &&
-          !clipPath &&
-          normalizedFill !== "" &&
-          normalizedFill !== "none" &&
-          /[CQAST]/.test(pathData)
-        );
-      });
+    const candidates = new Selection(this.bucket(svg, axes_class).patchPaths);
+    const pies = candidates.filter(function () {
+      const element = this;
+      const clipPath = element.getAttribute("clip-path");
+      const normalizedFill = parser.getFillValue(element);
+      const pathData = element.getAttribute("d") ?? "";
 
-    pies.attr("class", "pie plot-element");
+      const parent = element.parentElement;
+      const grandparent = parent?.parentElement;
+      const isInLegend =
+        parent?.tagName?.toLowerCase() === "g" &&
+        grandparent?.tagName?.toLowerCase() === "g" &&
+        /^legend_\d+$/.test(grandparent.id);
+
+      return (
+        !isInLegend &&
+        !clipPath &&
+        normalizedFill !== "" &&
+        normalizedFill !== "none" &&
+        /[CQAST]/.test(pathData)
+      );
+    });
+
+    this.classify(pies, "pie", null);
 
     console.log(`Found ${pies.size()} "pie" element`);
     return pies;
@@ -291,14 +2004,15 @@ export default class PlotSVGParser {
    * @returns {Selection} Selection of line elements.
    */
   findLines(svg, axes_class) {
-    // select all <path> of Line2D elements within the specific axes
-    const lines = svg
-      .selectAll(`g#${axes_class} g[id^="line2d"] path`)
-      .filter(function () {
-        return !this.closest('g[id^="matplotlib.axis"]');
-      });
+    const manifest = this.manifestElements(axes_class, "line");
+    const bucket = this.bucket(svg, axes_class);
+    // all <path> of Line2D elements within the specific axes, except
+    // the ones of the axis
+    const lines = new Selection(
+      manifest ? [...manifest, ...bucket.legendLinePaths] : bucket.linePaths,
+    );
 
-    lines.attr("class", "line plot-element");
+    this.classify(lines, "line", manifest);
 
     console.log(`Found ${lines.size()} "line" element`);
     return lines;
@@ -315,9 +2029,9 @@ export default class PlotSVGParser {
    */
   findAreas(svg, axes_class) {
     const parser = this;
-    const plottedAreas = svg.selectAll(
-      `g#${axes_class} g[id^="FillBetweenPolyCollection"] path`,
-    );
+    const manifest = this.manifestElements(axes_class, "area");
+    const bucket = this.bucket(svg, axes_class);
+    const plottedAreas = new Selection(manifest ?? bucket.areaPaths);
     const areaFills = new Set(
       plottedAreas
         .nodes()
@@ -325,17 +2039,17 @@ export default class PlotSVGParser {
         .filter((fill) => fill && fill !== "none"),
     );
 
-    const legendAreas = svg
-      .selectAll(`g#${axes_class} g[id^="legend"] g[id^="patch"] path`)
-      .filter(function () {
+    const legendAreas = new Selection(bucket.legendPatchPaths).filter(
+      function () {
         return areaFills.size > 0 && areaFills.has(parser.getFillValue(this));
-      });
+      },
+    );
 
     const areas = new Selection([
       ...plottedAreas.nodes(),
       ...legendAreas.nodes(),
     ]);
-    areas.attr("class", "area plot-element");
+    this.classify(areas, "area", manifest);
 
     console.log(`Found ${areas.size()} "area" element`);
     return areas;
@@ -343,8 +2057,8 @@ export default class PlotSVGParser {
 
   /**
    * Compute the nearest element to the mouse cursor from a set of elements.
-   * Uses bounding box centers for distance.
-   * This function is used when the `hover_nearest` argument is true.
+   * Uses the centers of the elements (see `SpatialIndex.fromElements()`).
+   * `hover_nearest` queries a cached index per axes instead.
    *
    * @param {number} mouseX - X coordinate of the mouse relative to SVG.
    * @param {number} mouseY - Y coordinate of the mouse relative to SVG.
@@ -352,21 +2066,9 @@ export default class PlotSVGParser {
    * @returns {Element|null} The nearest DOM element or `null`.
    */
   nearestElementFromMouse(mouseX, mouseY, elements) {
-    let nearestElem = null;
-    let minDist = Infinity;
-
-    elements.each(function (_, i) {
-      const bbox = this.getBBox();
-      const cx = bbox.x + bbox.width / 2;
-      const cy = bbox.y + bbox.height / 2;
-      const dist = Math.hypot(mouseX - cx, mouseY - cy);
-      if (dist < minDist) {
-        minDist = dist;
-        nearestElem = this;
-      }
-    });
-
-    return nearestElem;
+    const index = SpatialIndex.fromElements(elements, this.positions);
+    const nearest = index.nearest(mouseX, mouseY);
+    return nearest === -1 ? null : elements.nodes()[nearest];
   }
 
   /**
@@ -375,8 +2077,8 @@ export default class PlotSVGParser {
    *
    * @param {Selection} plot_element - Selection of plot elements (points, lines, etc.).
    * @param {string} axes_class - ID of the axes group.
-   * @param {string[]} tooltip_labels - Tooltip labels for each element.
-   * @param {string[]} tooltip_groups - Group identifiers for each element.
+   * @param {string[]|Categorical|TooltipTemplate} tooltip_labels - Tooltip labels for each element.
+   * @param {string[]|Categorical} tooltip_groups - Group identifiers for each element.
    * @param {"block"|"none"} show_tooltip - Whether to display tooltips.
    * @param {boolean} hover_nearest - If true, highlight nearest element instead of hovered one.
    */
@@ -389,61 +2091,507 @@ export default class PlotSVGParser {
     hover_nearest,
   ) {
     const self = this;
+    const labels = TooltipTemplate.from(tooltip_labels);
+    const groupCodes = Categorical.from(tooltip_groups).codes;
     const axesGroup = this.svg.select(`g#${axes_class}`);
-    const getHoveredIndex = hover_nearest
-      ? (event) => {
-          const svgNode = self.svg.nodes()[0];
-          const [mouseX, mouseY] = getPointerPosition(event, svgNode);
-          const allElements = axesGroup.selectAll(".plot-element");
-          const nearestElem = self.nearestElementFromMouse(
-            mouseX,
-            mouseY,
-            allElements,
-          );
-          return nearestElem ? allElements.nodes().indexOf(nearestElem) : null;
-        }
-      : (event) => plot_element.nodes().indexOf(event.currentTarget);
+    const axesNode = axesGroup.nodes()[0];
 
-    const mousemoveHandler = (event) => {
-      const hoveredIndex = getHoveredIndex(event);
-      const allElements = axesGroup.selectAll(".plot-element");
-
-      allElements.classed("hovered", false).classed("not-hovered", false);
+    // events are delegated to the axes group: the hovered element is
+    // found from the event target, walking up to the axes if needed.
+    // Markers drawn on a canvas come first in the index.
+    const offset = this.axesElements(axes_class).markers?.length ?? 0;
+    // elements tagged by Python hold their index in `data-idx`, only
+    // the other ones (which come last) are indexed here
+    const nodes = plot_element.nodes();
+    const type = nodes[0]?.classList.item(0);
+    const elementIndex = new WeakMap();
+    for (let i = nodes.length - 1; i >= 0; i--) {
+      if (nodes[i].hasAttribute("data-idx")) {
+        break;
+      }
+      elementIndex.set(nodes[i], offset + i);
+    }
+    const targetElement = (target) => {
+      for (
+        let node = target;
+        node && node !== axesNode;
+        node = node.parentNode
+      ) {
+        const index = elementIndex.get(node);
+        if (index !== undefined) {
+          return { node, index };
+        }
+        const idx = node.getAttribute?.("data-idx");
+        if (idx != null && node.classList.contains(type)) {
+          return { node, index: offset + Number(idx) };
+        }
+      }
+      return null;
+    };
+    // lines downsampled by Python are labeled by vertex, among the
+    // elements of the same type (or of the axes, for `hover_nearest`)
+    const vertexLabels = hover_nearest
+      ? null
+      : this.vertexLabels(nodes, offset);
 
-      if (hoveredIndex !== null) {
-        const hoveredGroup = tooltip_groups[hoveredIndex];
+    const getHovered = hover_nearest
+      ? (pointer) => {
+          const [mouseX, mouseY] = self.pointerPosition(pointer);
+          const nearest = self.spatialIndex(axes_class).nearest(mouseX, mouseY);
+          if (nearest === -1) {
+            return { node: undefined, index: null };
+          }
+          const elements = self.axesElements(axes_class).elements.nodes();
+          return { node: elements[nearest - offset], index: nearest };
+        }
+      : (pointer) => pointer.hovered;
 
-        allElements
-          .filter((_, j) => tooltip_groups[j] === hoveredGroup)
-          .classed("hovered", true);
+    const hideTooltip = () => {
+      self.schedule(axes_class, () => {
+        self.hover(axes_class, groupCodes, labels, show_tooltip, null);
+      });
+    };
 
-        allElements
-          .filter((_, j) => tooltip_groups[j] !== hoveredGroup)
-          .classed("not-hovered", true);
+    const mousemoveHandler = (event, hovered = null) => {
+      // the event is read now, but the update may run later
+      const pointer = {
+        clientX: event.clientX,
+        clientY: event.clientY,
+        hovered,
+      };
+      const x = event.pageX + self.tooltip_x_shift;
+      const y = event.pageY + self.tooltip_y_shift;
+      const start = self.metrics?.now();
 
-        self.tooltip
-          .style("display", show_tooltip)
-          .style("left", event.pageX + self.tooltip_x_shift + "px")
-          .style("top", event.pageY + self.tooltip_y_shift + "px")
-          .html(tooltip_labels[hoveredIndex]);
-      } else {
-        self.tooltip.style("display", "none");
-      }
+      self.schedule(axes_class, () => {
+        const { node, index } = getHovered(pointer);
+        const label = self.labelIndex(
+          hover_nearest ? self.nearestLabels(axes_class) : vertexLabels,
+          node,
+          index,
+          pointer,
+        );
+        self.hover(
+          axes_class,
+          groupCodes,
+          labels,
+          show_tooltip,
+          index,
+          x,
+          y,
+          label,
+        );
+        self.metrics?.recordHover(self.metrics.now() - start);
+      });
     };
 
     if (hover_nearest) {
-      axesGroup.on("mousemove", mousemoveHandler).on("mouseout", () => {
-        axesGroup
-          .selectAll(".plot-element")
-          .classed("hovered", false)
-          .classed("not-hovered", false);
-        self.tooltip.style("display", "none");
+      // the nearest element is looked up among the elements of all
+      // types of the axes, so a single listener handles all of them
+      const cached = this.axesElements(axes_class);
+      if (cached.nearest) {
+        return;
+      }
+      cached.nearest = true;
+      axesGroup.on("mousemove", mousemoveHandler).on("mouseout", (event) => {
+        // mouseout also fires when moving between children of the axes
+        if (!axesNode?.contains(event.relatedTarget)) {
+          hideTooltip();
+        }
       });
     } else {
-      plot_element.on("mouseover", mousemoveHandler).on("mouseout", () => {
-        plot_element.classed("hovered", false).classed("not-hovered", false);
-        self.tooltip.style("display", "none");
+      // other kinds of elements of the axes have their own listeners
+      axesGroup
+        .on("mouseover", (event) => {
+          const hovered = targetElement(event.target);
+          if (hovered !== null) {
+            mousemoveHandler(event, hovered);
+          }
+        })
+        .on("mouseout", (event) => {
+          if (targetElement(event.target) !== null) {
+            hideTooltip();
+          }
+        });
+      if (vertexLabels) {
+        // downsampled lines are labeled by vertex: the label follows
+        // the mouse along the line
+        axesGroup.on("mousemove", (event) => {
+          const hovered = targetElement(event.target);
+          if (hovered?.node && vertexLabels.get(hovered.node)?.line) {
+            mousemoveHandler(event, hovered);
+          }
+        });
+      }
+    }
+  }
+
+  /**
+   * Attach hover interaction and tooltip display to the markers of an
+   * axes drawn on a canvas (see `setCanvasMarkers()`). Markers behave
+   * like points: they are hovered directly (or the nearest one, if
+   * enabled), and highlighted with the rest of their group.
+   *
+   * @param {string} axes_class - ID of the axes group.
+   * @param {string[]|Categorical|TooltipTemplate} tooltip_labels - Tooltip labels for each element.
+   * @param {string[]|Categorical} tooltip_groups - Group identifiers for each element.
+   * @param {"block"|"none"} show_tooltip - Whether to display tooltips.
+   * @param {boolean} hover_nearest - If true, highlight nearest element instead of hovered one.
+   */
+  setCanvasHoverEffect(
+    axes_class,
+    tooltip_labels,
+    tooltip_groups,
+    show_tooltip,
+    hover_nearest,
+  ) {
+    const self = this;
+    const labels = TooltipTemplate.from(tooltip_labels);
+    const groupCodes = Categorical.from(tooltip_groups).codes;
+    const markers = this.axesElements(axes_class).markers;
+    const svgNode = this.svg.nodes()[0];
+    // canvases do not receive events: they are handled by the SVG,
+    // under a key of their own to not replace the updates of elements
+    const key = `${axes_class}-canvas`;
+
+    // leave elements hovered through their own listeners alone
+    const hoversMarker = () => {
+      const index = self.hoverState(axes_class, groupCodes).index;
+      return index !== null && index < markers.length;
+    };
+
+    svgNode.addEventListener("mousemove", (event) => {
+      const pointer = { clientX: event.clientX, clientY: event.clientY };
+      const x = event.pageX + self.tooltip_x_shift;
+      const y = event.pageY + self.tooltip_y_shift;
+      const start = self.metrics?.now();
+
+      self.schedule(key, () => {
+        const [mouseX, mouseY] = self.pointerPosition(pointer);
+        let index = -1;
+        if (markers.contains(mouseX, mouseY)) {
+          index = hover_nearest
+            ? self.spatialIndex(axes_class).nearest(mouseX, mouseY)
+            : markers.hit(mouseX, mouseY);
+        }
+        if (index !== -1) {
+          self.hover(axes_class, groupCodes, labels, show_tooltip, index, x, y);
+          self.metrics?.recordHover(self.metrics.now() - start);
+        } else if (hoversMarker()) {
+          self.hover(axes_class, groupCodes, labels, show_tooltip, null);
+        }
       });
+    });
+    svgNode.addEventListener("mouseleave", () => {
+      self.schedule(key, () => {
+        if (hoversMarker()) {
+          self.hover(axes_class, groupCodes, labels, show_tooltip, null);
+        }
+      });
+    });
+  }
+}
+
+/**
+ * Make one chart interactive.
+ *
+ * @param {HTMLElement} container - Element containing the SVG of the chart and its tooltip.
+ * @param {Object} plot_data - Configuration sent by Python (tooltip offsets and, for each axes, labels, groups and options).
+ * @param {PlotMetrics} [metrics] - Where to record the duration of each phase (and hover latencies), shared by the page by default.
+ * @returns {PlotSVGParser} The parser of the chart.
+ */
+function initPlot(container, plot_data, metrics = pageMetrics()) {
+  console.log(`PlotJS: Initializing interactive plot "${container.id}"`);
+  const timed = (axes_class, phase, callback) =>
+    metrics.time(container.id, axes_class, phase, callback);
+
+  const tooltip = container.querySelector(".tooltip");
+  const svg = container.querySelector("svg");
+  console.log(`PlotJS: SVG and tooltip elements loaded`);
+
+  const tooltip_x_shift = plot_data["tooltip_x_shift"];
+  const tooltip_y_shift = -plot_data["tooltip_y_shift"];
+  const axes = plot_data["axes"];
+  console.log(
+    `PlotJS: Configuration - tooltip offset: (${tooltip_x_shift}, ${tooltip_y_shift})`,
+  );
+  console.log(
+    `PlotJS: Found ${Object.keys(axes).length} axes to process`,
+  );
+
+  const plotParser = timed(
+    null,
+    "setup",
+    () =>
+      new PlotSVGParser(
+        svg,
+        tooltip,
+        tooltip_x_shift,
+        tooltip_y_shift,
+        decodePositions(plot_data["positions"]),
+        metrics,
+      ),
+  );
+  plotParser.setManifest(
+    plot_data["manifest"] ?? null,
+    plot_data["tagged"] ?? false,
+  );
+  plotParser.setVertices(LineVertices.decode(plot_data["vertices"]));
+  // candidate plot elements of all the axes are found in a single walk
+  timed(null, "walk", () => plotParser.walk(plotParser.svg));
+  console.log("PlotJS: Parser created successfully");
+
+  // Process each axes that has tooltip configuration
+  for (const axes_class in axes) {
+    if (axes.hasOwnProperty(axes_class)) {
+      console.log(`PlotJS: Processing axes "${axes_class}"`);
+
+      const axe_data = axes[axes_class];
+      const tooltip_labels = TooltipTemplate.from(
+        axe_data["tooltip_labels"],
+      );
+      const tooltip_groups = Categorical.from(axe_data["tooltip_groups"]);
+      const hover_nearest = axe_data["hover_nearest"] === "true";
+      const show_tooltip = tooltip_labels.length === 0 ? "none" : "block";
+      const on = axe_data["on"] ?? null; // null/undefined means all elements, otherwise array of element types
+
+      console.log(`PlotJS: ${tooltip_labels.length} tooltip labels`);
+      console.log(`PlotJS: ${tooltip_groups.length} tooltip groups`);
+      console.log(`PlotJS: Hover nearest: ${hover_nearest}`);
+      console.log(`PlotJS: Show tooltips: ${show_tooltip === "block"}`);
+      console.log(
+        `PlotJS: Element filter (on): ${on === null ? "all" : on.join(", ")}`,
+      );
+
+      // Helper to check if an element type should be processed
+      const shouldProcess = (elementType) =>
+        on === null || on.includes(elementType);
+
+      const lines = shouldProcess("line")
+        ? timed(axes_class, "findLines", () =>
+            plotParser.findLines(plotParser.svg, axes_class),
+          )
+        : new Selection([]);
+      const rectangles = shouldProcess("rect")
+        ? timed(axes_class, "findRectangles", () =>
+            plotParser.findRectangles(plotParser.svg, axes_class),
+          )
+        : new Selection([]);
+      const pies = shouldProcess("pie")
+        ? timed(axes_class, "findPies", () =>
+            plotParser.findPies(plotParser.svg, axes_class),
+          )
+        : new Selection([]);
+      const bars = shouldProcess("bar")
+        ? timed(axes_class, "findBars", () =>
+            plotParser.findBars(plotParser.svg, axes_class),
+          )
+        : new Selection([]);
+      // scatter plots drawn on a canvas (`render="canvas"`)
+      const markers =
+        axe_data["render"] === "canvas" && shouldProcess("point")
+          ? CanvasMarkers.fromPlotData(svg, axes_class, plot_data["markers"])
+          : null;
+      if (markers && markers.length > 0) {
+        timed(axes_class, "mountCanvas", () =>
+          plotParser.setCanvasMarkers(axes_class, markers.mount()),
+        );
+      }
+
+      const points = shouldProcess("point")
+        ? timed(axes_class, "findPoints", () =>
+            plotParser.findPoints(plotParser.svg, axes_class, tooltip_groups),
+          )
+        : new Selection([]);
+      const areas = shouldProcess("area")
+        ? timed(axes_class, "findAreas", () =>
+            plotParser.findAreas(plotParser.svg, axes_class),
+          )
+        : new Selection([]);
+
+      const totalElements =
+        lines.size() +
+        bars.size() +
+        points.size() +
+        areas.size() +
+        rectangles.size() +
+        pies.size();
+      console.log(
+        `PlotJS: Total elements: ${totalElements} (${lines.size()} lines, ${bars.size()} bars, ${points.size()} points, ${areas.size()} areas, ${pies.size()} pies, ${rectangles.size()} rectangles)`,
+      );
+
+      if (markers && markers.length > 0) {
+        timed(axes_class, "setCanvasHoverEffect", () =>
+          plotParser.setCanvasHoverEffect(
+            axes_class,
+            tooltip_labels,
+            tooltip_groups,
+            show_tooltip,
+            hover_nearest,
+          ),
+        );
+        console.log(
+          `PlotJS: Hover effects attached to ${markers.length} canvas points`,
+        );
+      }
+
+      if (points.size() > 0) {
+        timed(axes_class, "setHoverEffect", () =>
+          plotParser.setHoverEffect(
+            points,
+            axes_class,
+            tooltip_labels,
+            tooltip_groups,
+            show_tooltip,
+            hover_nearest,
+          ),
+        );
+        console.log(
+          `PlotJS: Hover effects attached to ${points.size()} points`,
+        );
+      }
+
+      if (lines.size() > 0) {
+        timed(axes_class, "setHoverEffect", () =>
+          plotParser.setHoverEffect(
+            lines,
+            axes_class,
+            tooltip_labels,
+            tooltip_groups,
+            show_tooltip,
+            hover_nearest,
+          ),
+        );
+        console.log(
+          `PlotJS: Hover effects attached to ${lines.size()} lines`,
+        );
+      }
+
+      if (rectangles.size() > 0) {
+        timed(axes_class, "setHoverEffect", () =>
+          plotParser.setHoverEffect(
+            rectangles,
+            axes_class,
+            tooltip_labels,
+            tooltip_groups,
+            show_tooltip,
+            hover_nearest,
+          ),
+        );
+        console.log(
+          `PlotJS: Hover effects attached to ${rectangles.size()} rectangles`,
+        );
+      }
+
+      if (pies.size() > 0) {
+        timed(axes_class, "setHoverEffect", () =>
+          plotParser.setHoverEffect(
+            pies,
+            axes_class,
+            tooltip_labels,
+            tooltip_groups,
+            show_tooltip,
+            hover_nearest,
+          ),
+        );
+        console.log(
+          `PlotJS: Hover effects attached to ${pies.size()} pies`,
+        );
+      }
+
+      if (bars.size() > 0) {
+        timed(axes_class, "setHoverEffect", () =>
+          plotParser.setHoverEffect(
+            bars,
+            axes_class,
+            tooltip_labels,
+            tooltip_groups,
+            show_tooltip,
+            hover_nearest,
+          ),
+        );
+        console.log(
+          `PlotJS: Hover effects attached to ${bars.size()} bars`,
+        );
+      }
+
+      if (areas.size() > 0) {
+        timed(axes_class, "setHoverEffect", () =>
+          plotParser.setHoverEffect(
+            areas,
+            axes_class,
+            tooltip_labels,
+            tooltip_groups,
+            show_tooltip,
+            hover_nearest,
+          ),
+        );
+        console.log(
+          `PlotJS: Hover effects attached to ${areas.size()} areas`,
+        );
+      }
+
+      console.log(`PlotJS: Finished processing axes "${axes_class}"`);
+    }
+  }
+
+  console.log(`PlotJS: Finished initializing "${container.id}"`);
+  return plotParser;
+}
+
+/**
+ * Make all the charts of a document interactive. Each chart is a
+ * container followed by a `<script type="application/json">` with its
+ * configuration, whose `data-plotjs` attribute is the container ID.
+ * Charts already initialized are skipped, so several plotjs outputs can
+ * share a page.
+ *
+ * The duration of each phase of the initialization is recorded in
+ * `window.plotjs.metrics` (see `PlotMetrics`), along with the latency
+ * of hovers. They are logged on demand, with
+ * `window.plotjs.metrics.log()`.
+ *
+ * @param {Document|HTMLElement} root - Where to look for charts.
+ * @param {PlotMetrics} [metrics] - Where to record metrics, shared by the page by default.
+ * @returns {PlotSVGParser[]} The parsers of the newly initialized charts.
+ */
+function initPlots(root = document, metrics = pageMetrics()) {
+  const parsers = [];
+  const payloads = root.querySelectorAll(
+    'script[type="application/json"][data-plotjs]',
+  );
+  for (const payload of payloads) {
+    const container = (root.ownerDocument ?? root).getElementById(
+      payload.dataset.plotjs,
+    );
+    if (!container || container.dataset.plotjsReady) {
+      continue;
     }
+    container.dataset.plotjsReady = "true";
+    const plot_data = metrics.time(container.id, null, "parse", () =>
+      JSON.parse(payload.textContent),
+    );
+    parsers.push(
+      metrics.time(container.id, null, "init", () =>
+        initPlot(container, plot_data, metrics),
+      ),
+    );
   }
+  console.log(`PlotJS: ${parsers.length} interactive plot(s) initialized`);
+  return parsers;
 }
+
+export {
+  CanvasMarkers,
+  Categorical,
+  HoverState,
+  LineVertices,
+  PlotMetrics,
+  SpatialIndex,
+  decodePositions,
+  TooltipTemplate,
+  formatValue,
+  initPlot,
+  initPlots,
+  walkSVG,
+};
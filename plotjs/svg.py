@@ -0,0 +1,316 @@
+import base64
+import html
+import re
+from collections.abc import Iterator
+from typing import NamedTuple
+
+# attributes holding coordinates, safe to round. `transform` is left
+# untouched on purpose: it contains scale factors (e.g. for glyphs)
+# that need full precision.
+_GEOMETRY_ATTRIBUTE = re.compile(
+    r'(\s(?:d|x|y|x1|y1|x2|y2|cx|cy|r|width|height|points)=")([^"]*)(")'
+)
+# elements whose coordinates are rounded: shapes and uses of markers.
+# The size of the document (root `<svg>`) and images are left exact.
+_GEOMETRY_ELEMENT = re.compile(
+    r"<(?:path|rect|line|circle|ellipse|polyline|polygon|use)\b[^>]*>"
+)
+_STYLE_ATTRIBUTE = re.compile(r'(\sstyle=")([^"]*)(")')
+_DECIMAL = re.compile(r"-?\d*\.\d+(?:[eE][-+]?\d+)?")
+_PROLOG = re.compile(r"<\?xml[^>]*\?>\s*|<!DOCTYPE[^>]*>\s*")
+_METADATA = re.compile(r"<metadata>.*?</metadata>\s*", re.DOTALL)
+_COMMENT = re.compile(r"<!--.*?-->\s*", re.DOTALL)
+_TEXT_ELEMENT = re.compile(r"(<text\b.*?</text>)", re.DOTALL)
+_WHITESPACE_BETWEEN_TAGS = re.compile(r">\s+<")
+_CLIP_PATH = re.compile(r'<clipPath id="([^"]+)">(.*?)</clipPath>', re.DOTALL)
+_PATH_DEF = re.compile(r'<path id="([^"]+)"((?:\s[^>]*?)?)/>')
+_EMPTY_DEFS = re.compile(r"<defs>\s*</defs>")
+# start and end tags of elements: matplotlib escapes "<" and ">" in
+# attribute values, texts and comments
+_TAG = re.compile(r"<(/?)([A-Za-z_][\w.:-]*)([^>]*)>")
+_ID_ATTRIBUTE = re.compile(r'\sid="([^"]*)"')
+
+
+class SVGOptimization(NamedTuple):
+    original_bytes: int
+    optimized_bytes: int
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_bytes - self.optimized_bytes
+
+
+def _round_numbers(value: str, precision: int) -> str:
+    def _round(match: re.Match) -> str:
+        number: str = f"{float(match.group(0)):.{precision}f}"
+        if "." in number:
+            number = number.rstrip("0").rstrip(".")
+        return "0" if number == "-0" else number
+
+    return _DECIMAL.sub(_round, value)
+
+
+def _dedupe(svg: str, pattern: re.Pattern) -> str:
+    """
+    Remove elements matched by `pattern` (with the id as first group
+    and the content as second group) whose content is identical to a
+    previous one, and point references to the kept element.
+    """
+    first_id_by_content: dict[str, str] = {}
+    replaced_ids: dict[str, str] = {}
+
+    def _keep_first(match: re.Match) -> str:
+        element_id, content = match.group(1), match.group(2)
+        kept_id = first_id_by_content.setdefault(content, element_id)
+        if kept_id == element_id:
+            return match.group(0)
+        replaced_ids[element_id] = kept_id
+        return ""
+
+    svg = pattern.sub(_keep_first, svg)
+    if replaced_ids:
+        alternatives: str = "|".join(re.escape(i) for i in replaced_ids)
+        svg = re.sub(
+            rf"#({alternatives})(?=[\"')])",
+            lambda match: "#" + replaced_ids[match.group(1)],
+            svg,
+        )
+    return svg
+
+
+def optimize_svg(svg: str, precision: int = 2) -> tuple[str, SVGOptimization]:
+    """
+    Shrink a matplotlib SVG before embedding it in HTML. This:
+
+    - removes the XML prolog, metadata and comments
+    - rounds coordinates of shapes to `precision` decimals
+    - collapses whitespace in path data and between tags
+    - compacts inline styles
+    - removes duplicated clip paths and path definitions
+
+    The structure of the document (and especially the `id` of groups,
+    such as `axes_1` or `PathCollection_1`, used by the parser) is
+    left untouched.
+
+    Args:
+        svg: The SVG content, as produced by `fig.savefig(format="svg")`.
+        precision: Number of decimals kept for coordinates.
+
+    Returns:
+        A tuple with the optimized SVG and a report with the size
+        before and after optimization.
+
+    Examples:
+        ```python
+        from plotjs.svg import optimize_svg
+
+        svg, report = optimize_svg(svg, precision=1)
+        print(f"{report.saved_bytes} bytes saved")
+        ```
+    """
+    if precision < 0:
+        raise ValueError("`precision` must be a positive integer.")
+
+    original_bytes: int = len(svg.encode("utf-8"))
+
+    svg = _PROLOG.sub("", svg)
+    svg = _METADATA.sub("", svg)
+    svg = _COMMENT.sub("", svg)
+
+    def _round_geometry(element: re.Match) -> str:
+        return _GEOMETRY_ATTRIBUTE.sub(
+            lambda m: (
+                m.group(1)
+                + " ".join(_round_numbers(m.group(2), precision).split())
+                + m.group(3)
+            ),
+            element.group(0),
+        )
+
+    svg = _GEOMETRY_ELEMENT.sub(_round_geometry, svg)
+    svg = _STYLE_ATTRIBUTE.sub(
+        lambda m: (
+            m.group(1) + re.sub(r"\s*([:;])\s*", r"\1", m.group(2).strip()) + m.group(3)
+        ),
+        svg,
+    )
+
+    svg = _dedupe(svg, _CLIP_PATH)
+    svg = _dedupe(svg, _PATH_DEF)
+    svg = _EMPTY_DEFS.sub("", svg)
+
+    # whitespace inside <text> elements may be meaningful
+    svg = "".join(
+        part if i % 2 else _WHITESPACE_BETWEEN_TAGS.sub("><", part)
+        for i, part in enumerate(_TEXT_ELEMENT.split(svg))
+    ).strip()
+
+    return svg, SVGOptimization(original_bytes, len(svg.encode("utf-8")))
+
+
+def insert_backdrop(svg: str, png: bytes) -> str:
+    """
+    Insert a PNG image covering the whole figure, below all other
+    elements of a matplotlib SVG.
+
+    Args:
+        svg: The SVG content.
+        png: The PNG image, as bytes.
+
+    Returns:
+        The SVG content with the image.
+    """
+    view_box = re.search(r'viewBox="([^"]+)"', svg)
+    first_group = re.search(r"<g\b[^>]*>", svg)
+    if view_box is None or first_group is None:
+        raise ValueError("Could not find where to insert the backdrop in the SVG.")
+
+    x, y, width, height = view_box.group(1).split()
+    image: str = (
+        f'<image id="plotjs-backdrop" x="{x}" y="{y}" width="{width}" '
+        f'height="{height}" preserveAspectRatio="none" '
+        f'xlink:href="data:image/png;base64,{base64.b64encode(png).decode("ascii")}"/>'
+    )
+    return svg[: first_group.end()] + image + svg[first_group.end() :]
+
+
+def _js_string(value) -> str:
+    """
+    Convert a value to the string JavaScript gets when setting it as
+    an attribute, once sent in the JSON payload.
+    """
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _tag_insertions(
+    svg: str,
+    manifest: dict[str, list[list[str]]],
+    groups: dict[str, list],
+) -> list[tuple[int, str]]:
+    """
+    Find where to insert the attributes of the plot elements of an
+    SVG (see `tag_elements()`), as `(offset, attributes)` pairs sorted
+    by offset in the string.
+    """
+    artists: dict[str, tuple[str, str]] = {
+        group_id: (axes_class, kind)
+        for axes_class, entries in manifest.items()
+        for group_id, kind in entries
+    }
+    counts: dict[tuple[str, str], int] = {}
+    insertions: list[tuple[int, str]] = []
+    # [axes ID, type, depth, <use> and <path> elements] of the open artist
+    current: list | None = None
+    depth: int = 0
+
+    def _tag(offset: int, name: str, axes_class: str, kind: str) -> None:
+        idx: int = counts.get((axes_class, kind), 0)
+        counts[(axes_class, kind)] = idx + 1
+        attributes: str = f' class="{kind} plot-element" data-idx="{idx}"'
+        axes_groups: list = groups.get(axes_class, [])
+        if kind == "point" and idx < len(axes_groups):
+            value: str = html.escape(_js_string(axes_groups[idx]))
+            attributes += f' data-group="{value}"'
+        insertions.append((offset + 1 + len(name), attributes))
+
+    for match in _TAG.finditer(svg):
+        if current is None and not artists:
+            break
+        closing, name, attributes = match.groups()
+        if not closing:
+            depth += 1
+            if current is not None:
+                if name in ("use", "path"):
+                    current[3][name].append((match.start(), name))
+            elif name == "g" and artists:
+                group_id = _ID_ATTRIBUTE.search(attributes)
+                artist = artists.pop(group_id.group(1), None) if group_id else None
+                if artist is not None and artist[1] == "bar":
+                    _tag(match.start(), name, *artist)
+                elif artist is not None:
+                    current = [*artist, depth, {"use": [], "path": []}]
+            if not attributes.endswith("/"):
+                continue
+        if current is not None and current[2] == depth:
+            axes_class, kind, _, elements = current
+            tagged = elements["use"] if kind == "point" else []
+            for offset, element in tagged or elements["path"]:
+                _tag(offset, element, axes_class, kind)
+            current = None
+        depth -= 1
+
+    insertions.sort()
+    return insertions
+
+
+def iter_tagged_svg(
+    svg: str,
+    manifest: dict[str, list[list[str]]],
+    groups: dict[str, list] | None = None,
+    chunk_size: int = 1 << 16,
+) -> Iterator[str]:
+    """
+    Same as `tag_elements()`, but the tagged SVG is yielded in parts
+    (slices of at most `chunk_size` characters of the SVG, and the
+    inserted attributes) instead of being built, so that it is never
+    held in memory along with the original one.
+
+    Args:
+        svg: The SVG content.
+        manifest: `[id, type]` of the SVG group of each artist to tag,
+            by axes ID, in document order (see `plotjs.rendering`).
+        groups: Tooltip groups of each axes, by axes ID, parallel to
+            the points of the axes.
+        chunk_size: Maximum number of characters of the slices of the SVG.
+
+    Returns:
+        An iterator of parts of the tagged SVG.
+    """
+    previous: int = 0
+    for offset, attributes in _tag_insertions(svg, manifest, groups or {}):
+        for start in range(previous, offset, chunk_size):
+            yield svg[start : min(start + chunk_size, offset)]
+        yield attributes
+        previous = offset
+    for start in range(previous, len(svg), chunk_size):
+        yield svg[start : start + chunk_size]
+
+
+def tag_elements(
+    svg: str,
+    manifest: dict[str, list[list[str]]],
+    groups: dict[str, list] | None = None,
+) -> str:
+    """
+    Write the attributes set by the parser on plot elements directly
+    in the SVG, so that they don't have to be set in the browser:
+
+    - `class`: the type of the element and `plot-element` (for
+      example `"point plot-element"`)
+    - `data-idx`: the position of the element among the elements of
+      the same type of its axes
+    - `data-group`: the tooltip group of points
+
+    Elements are found as the parser does from the manifest: the group
+    of a bar, the `<use>` (or `<path>`, if there are none) of points,
+    and the `<path>` of other types. Tags are found in a single pass
+    over the SVG and attributes are inserted after the tag name of the
+    elements, the rest of the document is left as is.
+
+    Args:
+        svg: The SVG content.
+        manifest: `[id, type]` of the SVG group of each artist to tag,
+            by axes ID, in document order (see `plotjs.rendering`).
+        groups: Tooltip groups of each axes, by axes ID, parallel to
+            the points of the axes.
+
+    Returns:
+        The SVG content with tagged elements.
+    """
+    return "".join(iter_tagged_svg(svg, manifest, groups, chunk_size=len(svg) + 1))
@@ -2,7 +2,21 @@ import numpy as np
 import narwhals.stable.v2 as nw
 from narwhals.stable.v2.dependencies import is_numpy_array, is_into_series
 
+import json
 import re
+import string
+from collections.abc import Iterable, Iterator
+
+# subset of the format specification mini-language that the parser
+# implements: [[fill]align][sign][0][width][grouping][.precision][type]
+_FORMAT_SPEC = re.compile(
+    r"^(?:.?[<>^])?[+\- ]?0?\d*[,_]?(?:\.\d+)?[deEfFgGs%]?$", re.DOTALL
+)
+
+# same escaping as the `tojson` filter of jinja2
+_HTML_SAFE_JSON: dict[int, str] = str.maketrans(
+    {"<": "\\u003c", ">": "\\u003e", "&": "\\u0026", "'": "\\u0027"}
+)
 
 
 def _is_missing(value) -> bool:
@@ -19,6 +33,104 @@ def _is_missing(value) -> bool:
     return False
 
 
+# element-wise `_is_missing()` for arrays of Python objects
+_is_missing_object = np.frompyfunc(_is_missing, 1, 1)
+
+
+def _to_columnar(vector, name: str) -> np.ndarray | nw.Series:
+    """
+    Convert an iterable to a 1D numpy array, or to a narwhals
+    Series for dataframe backends, without copying values to a
+    Python list.
+    """
+    if is_numpy_array(vector):
+        if vector.ndim > 1:
+            raise ValueError(
+                f"{name} must be one-dimensional, got an array of shape {vector.shape}."
+            )
+        return vector.ravel()
+    if isinstance(vector, (list, tuple)):
+        # object dtype keeps original values (no casting of mixed types)
+        array: np.ndarray = np.empty(len(vector), dtype=object)
+        array[:] = vector
+        return array
+    if is_into_series(vector):
+        return nw.from_native(vector, series_only=True)
+    raise ValueError(
+        f"{name} must be a Series or a valid iterable (list, tuple, ndarray...)."
+    )
+
+
+def _missing_mask(vector: np.ndarray | nw.Series) -> np.ndarray:
+    """
+    Compute a boolean mask of the missing values (None, null, NaN
+    and NaT) of a columnar vector.
+    """
+    if isinstance(vector, nw.Series):
+        mask = vector.is_null()
+        if vector.dtype.is_float():
+            mask = mask | vector.is_nan().fill_null(False)
+        return mask.to_numpy().astype(bool)
+
+    kind: str = vector.dtype.kind
+    if kind in "fc":
+        return np.isnan(vector)
+    if kind in "mM":
+        return np.isnat(vector)
+    if kind == "O":
+        return _is_missing_object(vector).astype(bool)
+    return np.zeros(len(vector), dtype=bool)
+
+
+def _to_list(vector: np.ndarray | nw.Series, keep: np.ndarray | None) -> list:
+    if isinstance(vector, nw.Series):
+        if keep is not None:
+            vector = vector.filter(
+                nw.new_series("keep", keep, nw.Boolean(), backend=vector.implementation)
+            )
+        return vector.to_list()
+    if keep is not None:
+        vector = vector[keep]
+    return vector.tolist()
+
+
+def _vectors_to_lists(*vectors, name="labels and groups") -> list[list | None]:
+    """
+    Convert several iterables (for example labels and groups) to
+    lists, dropping the positions where any of them has a missing
+    value so that they stay aligned.
+
+    Missing values are found with vectorized operations (narwhals
+    null/NaN masks, numpy masks) and data stays columnar until the
+    final conversion to lists.
+
+    Args:
+        vectors: Valid iterables, or `None`.
+        name: The name passed to the error message when type is
+            invalid.
+
+    Returns:
+        A list with, for each vector, a list (or `None` if the
+        vector is `None`).
+    """
+    columns = [
+        None if vector is None else _to_columnar(vector, name) for vector in vectors
+    ]
+    masks = [_missing_mask(column) for column in columns if column is not None]
+
+    if len({len(mask) for mask in masks}) > 1:
+        # vectors of different lengths can't be aligned: sanitize each one
+        missings = masks
+    else:
+        missings = [np.logical_or.reduce(masks)] * len(masks)
+    keeps_iter = iter(None if not missing.any() else ~missing for missing in missings)
+
+    return [
+        None if column is None else _to_list(column, next(keeps_iter))
+        for column in columns
+    ]
+
+
 def _vector_to_list(vector, name="labels and groups") -> list:
     """
     Function used to easily convert various kind of iterables to
@@ -27,8 +139,6 @@ def _vector_to_list(vector, name="labels and groups") -> list:
     It accepts all backend series from narwhals and common objects
     such as numpy arrays.
 
-    Todo: test this extensively to make sure it behaves as expected.
-
     Args:
         vector: A valid iterable.
         name: The name passed to the error message when type is
@@ -37,19 +147,147 @@ def _vector_to_list(vector, name="labels and groups") -> list:
     Returns:
         A list
     """
-    if isinstance(vector, (list, tuple)) or is_numpy_array(vector):
-        vector_sanitized: list = list(vector)
-    elif is_into_series(vector):
-        vector_sanitized: list = nw.from_native(vector, allow_series=True).to_list()
-    else:
-        raise ValueError(
-            f"{name} must be a Series or a valid iterable (list, tuple, ndarray...)."
-        )
-
     # Drop NaNs to avoid JSON parsing error
     # https://github.com/y-sunflower/plotjs/issues/67
-    vector_sanitized = [x for x in vector_sanitized if not _is_missing(x)]
-    return vector_sanitized
+    return _vectors_to_lists(vector, name=name)[0]
+
+
+def _dictionary_encode(values: list) -> list | dict:
+    """
+    Dictionary-encode a list for the JSON payload: a table of
+    unique values and, for each element, the index of its value in
+    that table. This is only done when it makes the payload smaller
+    (e.g. for categorical groups), otherwise the list is returned
+    as is. The parser handles both forms.
+
+    Args:
+        values: A list of JSON serializable values.
+
+    Returns:
+        Either `values`, or a dictionnary with `values` and `codes`.
+    """
+    index: dict = {}
+    uniques: list = []
+    codes: list[int] = []
+    try:
+        for value in values:
+            # the type is part of the key so that 1 and True stay distinct
+            key = (value.__class__, value)
+            code = index.get(key)
+            if code is None:
+                code = index[key] = len(uniques)
+                uniques.append(value)
+            codes.append(code)
+    except TypeError:  # unhashable values
+        return values
+
+    if not values or len(uniques) * 2 > len(values):
+        return values
+    return {"values": uniques, "codes": codes}
+
+
+def _drop_indices(values: list, indices: Iterable[int]) -> list:
+    """
+    Remove elements of a list by index, keeping the order of the
+    other ones. Indices past the end of the list are ignored.
+
+    Args:
+        values: A list.
+        indices: Indices of the elements to remove.
+
+    Returns:
+        A new list.
+    """
+    dropped: set[int] = set(indices)
+    if not dropped:
+        return list(values)
+    return [value for index, value in enumerate(values) if index not in dropped]
+
+
+def _parse_template(template: str) -> list[list]:
+    """
+    Split a tooltip template, such as `"{name}: {value:.2f}"`, into
+    `[literal, field, format_spec]` parts that the parser formats
+    at hover time. `field` is `None` for a trailing literal.
+
+    Args:
+        template: A `str.format()` template with named fields.
+
+    Returns:
+        A list of parts.
+    """
+    parts: list[list] = []
+    literal_buffer: str = ""
+    try:
+        parsed = list(string.Formatter().parse(template))
+    except ValueError as e:
+        raise ValueError(f"Invalid tooltip template: {e}") from None
+
+    for literal, field, format_spec, conversion in parsed:
+        # escaped braces split literals: merge them
+        literal_buffer += literal
+        if field is None:
+            continue
+        if not field or field.isdigit() or "." in field or "[" in field:
+            raise ValueError(
+                f"Tooltip template fields must be column names, got '{{{field}}}'."
+            )
+        if conversion is not None:
+            raise ValueError(
+                "Conversions (such as '!r') are not supported in tooltip "
+                f"templates, got '!{conversion}'."
+            )
+        if "{" in format_spec or not _FORMAT_SPEC.match(format_spec):
+            raise ValueError(
+                f"Unsupported format specification '{format_spec}' for field '{field}'."
+            )
+        parts.append([literal_buffer, field, format_spec])
+        literal_buffer = ""
+    if literal_buffer:
+        parts.append([literal_buffer, None, ""])
+    return parts
+
+
+def _frame_to_columns(data, columns: list[str]) -> tuple[dict[str, list], int]:
+    """
+    Project and collect the given columns of a dataframe, and
+    convert each of them to a list. Missing values are kept (as
+    `None`) so that rows stay aligned with the plot elements, and
+    temporal values are converted to strings.
+
+    Args:
+        data: A narwhals-compatible DataFrame or LazyFrame.
+        columns: Names of the columns to keep.
+
+    Returns:
+        A tuple with a dictionnary of lists (by column name) and the
+        number of rows.
+    """
+    try:
+        frame = nw.from_native(data)
+    except TypeError:
+        raise ValueError("`data` must be a DataFrame or a LazyFrame.") from None
+
+    available: list[str] = frame.collect_schema().names()
+    missing: list[str] = [column for column in columns if column not in available]
+    if missing:
+        raise ValueError(f"Column(s) not found in `data`: {', '.join(missing)}.")
+
+    frame = frame.select(columns)
+    if isinstance(frame, nw.LazyFrame):
+        frame = frame.collect()
+
+    result: dict[str, list] = {}
+    for column in columns:
+        series = frame.get_column(column)
+        mask: np.ndarray = _missing_mask(series)
+        if series.dtype.is_temporal():
+            series = series.cast(nw.String())
+        values: list = series.to_list()
+        for i in np.flatnonzero(mask):
+            values[i] = None
+        result[column] = values
+    return result, len(frame)
 
 
 def _get_and_sanitize_js(file_path, after_pattern):
@@ -72,3 +310,33 @@ def _get_and_sanitize_js(file_path, after_pattern):
         return js_code
     else:
         raise ValueError(f"Could not find '{after_pattern}' in the file")
+
+
+def _iter_json(obj) -> Iterator[str]:
+    """
+    Serialize an object to JSON chunk by chunk, with the same
+    output as the `tojson` jinja2 filter (sorted keys and
+    HTML-safe escaping), without building the whole string.
+
+    Args:
+        obj: A JSON serializable object.
+
+    Returns:
+        An iterator of JSON chunks.
+    """
+    for chunk in json.JSONEncoder(sort_keys=True).iterencode(obj):
+        yield chunk.translate(_HTML_SAFE_JSON)
+
+
+def _buffered(parts: Iterable[str], chunk_size: int) -> Iterator[str]:
+    buffer: list[str] = []
+    buffer_size: int = 0
+    for part in parts:
+        buffer.append(part)
+        buffer_size += len(part)
+        if buffer_size >= chunk_size:
+            yield "".join(buffer)
+            buffer.clear()
+            buffer_size = 0
+    if buffer:
+        yield "".join(buffer)
@@ -0,0 +1,171 @@
+import { expect, test, describe } from "bun:test";
+import { JSDOM } from "jsdom";
+import PlotSVGParser, {
+  CanvasMarkers,
+  HoverState,
+} from "../../plotjs/static/plotparser.js";
+
+const encode = (Type, values) =>
+  Buffer.from(new Type(values).buffer).toString("base64");
+
+// two markers of radius 5 (unit circle-like path scaled by 10), red and blue
+const markers = {
+  centers: encode(Float32Array, [10, 10, 50, 40]),
+  scales: encode(Float32Array, [10]),
+  fill: encode(Uint8Array, [255, 0, 0, 255, 0, 0, 255, 255]),
+  stroke: encode(Uint8Array, [0, 0, 0, 0]),
+  linewidths: encode(Float32Array, [0]),
+  paths: ["M0 -0.5L0.5 0L0 0.5L-0.5 0Z"],
+  clip: [0, 0, 60, 50],
+};
+
+function makeSvg() {
+  const dom = new JSDOM(`<html><body>
+    <svg viewBox="0 0 100 80">
+      <g id="axes_1">
+        <g id="PathCollection_1"></g>
+        <g id="line2d_1"><path></path></g>
+      </g>
+    </svg>
+  </body></html>`);
+  return dom.window.document.querySelector("svg");
+}
+
+describe("CanvasMarkers", () => {
+  test("decodes the markers of an axes", () => {
+    const canvas = CanvasMarkers.fromPlotData(makeSvg(), "axes_1", {
+      PathCollection_1: markers,
+    });
+
+    expect(canvas.length).toBe(2);
+    expect(Array.from(canvas.xs)).toEqual([10, 50]);
+    expect(Array.from(canvas.ys)).toEqual([10, 40]);
+    expect(canvas.layers[0].fill).toEqual([
+      "rgba(255, 0, 0, 1)",
+      "rgba(0, 0, 255, 1)",
+    ]);
+    expect(canvas.layers[0].radii).toEqual([0.5]);
+  });
+
+  test("finds the marker under the mouse", () => {
+    const canvas = CanvasMarkers.fromPlotData(makeSvg(), "axes_1", {
+      PathCollection_1: markers,
+    });
+
+    expect(canvas.hit(12, 11)).toBe(0);
+    expect(canvas.hit(50, 44)).toBe(1);
+    expect(canvas.hit(30, 25)).toBe(-1);
+    expect(canvas.contains(30, 25)).toBe(true);
+    expect(canvas.contains(70, 25)).toBe(false);
+  });
+
+  test("mounts a canvas in the group of the artist", () => {
+    const svg = makeSvg();
+    CanvasMarkers.fromPlotData(svg, "axes_1", {
+      PathCollection_1: markers,
+    }).mount();
+
+    const foreignObject = svg.querySelector("#PathCollection_1 foreignObject");
+    expect(foreignObject.getAttribute("width")).toBe("100");
+    expect(foreignObject.getAttribute("height")).toBe("80");
+    expect(foreignObject.querySelector("canvas")).not.toBeNull();
+  });
+
+  test("fades the markers out with CSS while a group is highlighted", () => {
+    const svg = makeSvg();
+    const canvas = CanvasMarkers.fromPlotData(svg, "axes_1", {
+      PathCollection_1: markers,
+    }).mount();
+    const [layer] = canvas.layers;
+    expect(
+      svg.querySelector("#PathCollection_1 .point-canvas-overlay"),
+    ).not.toBeNull();
+
+    canvas.highlight([0, 1], 1);
+    expect(layer.canvas.style.opacity).toBe("0.2");
+    expect(layer.members.get(1)).toEqual([1]);
+
+    canvas.highlight([0, 1], null);
+    expect(layer.canvas.style.opacity).toBe("");
+  });
+
+  test("stops drawing on resize once unmounted", () => {
+    const svg = makeSvg();
+    const window = svg.ownerDocument.defaultView;
+    const canvas = CanvasMarkers.fromPlotData(svg, "axes_1", {
+      PathCollection_1: markers,
+    }).mount();
+    let draws = 0;
+    canvas.draw = () => draws++;
+
+    window.dispatchEvent(new window.Event("resize"));
+    expect(draws).toBe(1);
+
+    canvas.unmount();
+    window.dispatchEvent(new window.Event("resize"));
+    expect(draws).toBe(1);
+    expect(svg.querySelector("#PathCollection_1 foreignObject")).toBeNull();
+  });
+
+  test("is highlighted by the hover state of the axes", () => {
+    const svg = makeSvg();
+    const canvas = CanvasMarkers.fromPlotData(svg, "axes_1", {
+      PathCollection_1: markers,
+    });
+    const line = svg.querySelector("#line2d_1 path");
+    const state = new HoverState([line], [0, 1, 1], canvas);
+
+    state.update(2);
+    expect(canvas.code).toBe(1);
+    expect(line.classList.contains("hovered")).toBe(true);
+
+    state.update(0);
+    expect(canvas.code).toBe(0);
+    expect(line.classList.contains("not-hovered")).toBe(true);
+
+    state.update(null);
+    expect(canvas.code).toBe(null);
+  });
+
+  test("leaves legend markers found after mounting hoverable", () => {
+    const dom = new JSDOM(`<html><body>
+      <div id="tooltip" style="display: none;"></div>
+      <svg viewBox="0 0 100 80">
+        <g id="axes_1">
+          <g id="PathCollection_1"></g>
+          <g id="legend_1">
+            <g id="PathCollection_2"><g><use></use></g></g>
+          </g>
+        </g>
+      </svg>
+    </body></html>`);
+    const svg = dom.window.document.querySelector("svg");
+    const tooltip = dom.window.document.querySelector("#tooltip");
+    const parser = new PlotSVGParser(svg, tooltip, 0, 0);
+    const canvas = CanvasMarkers.fromPlotData(svg, "axes_1", {
+      PathCollection_1: markers,
+    });
+
+    // markers are set before the legend markers are classified
+    parser.setCanvasMarkers("axes_1", canvas);
+    const groups = [0, 1, 0];
+    const points = parser.findPoints(parser.svg, "axes_1", groups);
+    parser.setHoverEffect(
+      points,
+      "axes_1",
+      ["A", "B", "Legend A"],
+      groups,
+      "block",
+      false,
+    );
+
+    const legend = svg.querySelector("#legend_1 use");
+    expect(parser.axesElements("axes_1").elements.nodes()).toContain(legend);
+    legend.dispatchEvent(
+      new dom.window.MouseEvent("mouseover", { bubbles: true }),
+    );
+    expect(legend.classList.contains("hovered")).toBe(true);
+    expect(canvas.code).toBe(0);
+    expect(tooltip.innerHTML).toBe("Legend A");
+  });
+});
@@ -0,0 +1,79 @@
+import { expect, test, describe } from "bun:test";
+import { JSDOM } from "jsdom";
+import PlotSVGParser, { Categorical } from "../../plotjs/static/plotparser.js";
+
+describe("Categorical", () => {
+  test("encodes a plain array", () => {
+    const groups = Categorical.from(["a", "b", "a", 1, "1"]);
+
+    expect(groups.values).toEqual(["a", "b", 1, "1"]);
+    expect(Array.from(groups.codes)).toEqual([0, 1, 0, 2, 3]);
+    expect(groups.length).toBe(5);
+    expect(groups.get(2)).toBe("a");
+    expect(groups.get(10)).toBeUndefined();
+  });
+
+  test("decodes the payload sent by Python", () => {
+    const groups = Categorical.from({ values: ["x", "y"], codes: [1, 0, 1] });
+
+    expect(groups.codes).toBeInstanceOf(Int32Array);
+    expect(groups.length).toBe(3);
+    expect(groups.get(0)).toBe("y");
+    expect(groups.get(1)).toBe("x");
+    expect(Categorical.from(groups)).toBe(groups);
+  });
+
+  test("handles missing data", () => {
+    expect(Categorical.from(undefined).length).toBe(0);
+  });
+});
+
+describe("Encoded tooltip data", () => {
+  test("findPoints sets decoded data-group", () => {
+    const dom = new JSDOM(`<svg>
+      <g id="axes_1">
+        <g id="PathCollection_1"><g><use></use><use></use></g></g>
+      </g>
+    </svg>`);
+    const svg = dom.window.document.querySelector("svg");
+    const parser = new PlotSVGParser(svg, null, 0, 0);
+
+    const points = parser.findPoints(parser.svg, "axes_1", {
+      values: ["setosa", "virginica"],
+      codes: [1, 0],
+    });
+
+    expect(points.nodes()[0].getAttribute("data-group")).toBe("virginica");
+    expect(points.nodes()[1].getAttribute("data-group")).toBe("setosa");
+  });
+
+  test("setHoverEffect works with encoded labels and groups", () => {
+    const dom = new JSDOM(`<html><body>
+      <div id="tooltip" style="display: none;"></div>
+      <svg>
+        <g id="axes_1">
+          <g id="PathCollection_1"><g><use></use><use></use><use></use></g></g>
+        </g>
+      </svg>
+    </body></html>`);
+    const document = dom.window.document;
+    const svg = document.querySelector("svg");
+    const tooltip = document.querySelector("#tooltip");
+    const parser = new PlotSVGParser(svg, tooltip, 0, 0);
+
+    const labels = { values: ["first", "second"], codes: [0, 1, 0] };
+    const groups = { values: ["A", "B"], codes: [0, 1, 0] };
+    const points = parser.findPoints(parser.svg, "axes_1", groups);
+    parser.setHoverEffect(points, "axes_1", labels, groups, "block", false);
+
+    const nodes = points.nodes();
+    nodes[2].dispatchEvent(
+      new dom.window.MouseEvent("mouseover", { bubbles: true }),
+    );
+
+    expect(nodes[0].classList.contains("hovered")).toBe(true);
+    expect(nodes[1].classList.contains("not-hovered")).toBe(true);
+    expect(nodes[2].classList.contains("hovered")).toBe(true);
+    expect(tooltip.innerHTML).toBe("first");
+  });
+});
@@ -0,0 +1,69 @@
+import { expect, test, describe } from "bun:test";
+import { JSDOM } from "jsdom";
+import { HoverState } from "../../plotjs/static/plotparser.js";
+
+function makeElements(n) {
+  const dom = new JSDOM(`<html><body><svg></svg></body></html>`);
+  const svg = dom.window.document.querySelector("svg");
+  return Array.from({ length: n }, () =>
+    svg.appendChild(
+      dom.window.document.createElementNS("http://www.w3.org/2000/svg", "path"),
+    ),
+  );
+}
+
+const classes = (elements) =>
+  elements.map((el) =>
+    el.classList.contains("hovered")
+      ? "h"
+      : el.classList.contains("not-hovered")
+        ? "n"
+        : "-",
+  );
+
+describe("HoverState", () => {
+  test("highlights the group of the hovered element", () => {
+    const elements = makeElements(4);
+    const state = new HoverState(elements, [0, 1, 0, 1]);
+
+    expect(state.update(0)).toBe(true);
+    expect(classes(elements)).toEqual(["h", "n", "h", "n"]);
+
+    expect(state.update(1)).toBe(true);
+    expect(classes(elements)).toEqual(["n", "h", "n", "h"]);
+
+    expect(state.update(null)).toBe(true);
+    expect(classes(elements)).toEqual(["-", "-", "-", "-"]);
+  });
+
+  test("skips updates when the hovered element does not change", () => {
+    const elements = makeElements(2);
+    const state = new HoverState(elements, [0, 1]);
+
+    state.update(0);
+    expect(state.update(0)).toBe(false);
+    expect(state.update(null)).toBe(true);
+    expect(state.update(null)).toBe(false);
+  });
+
+  test("only touches the elements of the two groups", () => {
+    const elements = makeElements(3);
+    const state = new HoverState(elements, [0, 1, 2]);
+
+    state.update(0);
+    elements[2].classList.add("marker");
+    elements[2].classList.remove("not-hovered");
+    state.update(1);
+
+    expect(classes(elements)).toEqual(["n", "h", "-"]);
+  });
+
+  test("keeps elements of the same group hovered", () => {
+    const elements = makeElements(3);
+    const state = new HoverState(elements, [0, 0, 1]);
+
+    state.update(0);
+    expect(state.update(1)).toBe(true);
+    expect(classes(elements)).toEqual(["h", "h", "n"]);
+  });
+});
@@ -0,0 +1,56 @@
+import { expect, test, describe } from "bun:test";
+import { JSDOM } from "jsdom";
+import { initPlots } from "../../plotjs/static/plotparser.js";
+
+const chart = (id, labels) => `
+  <div id="plot-container-${id}" class="plotjs-chart">
+    <svg>
+      <g id="axes_1">
+        <g id="PathCollection_1"><g><use></use><use></use></g></g>
+      </g>
+    </svg>
+    <div class="tooltip" id="tooltip-${id}"></div>
+  </div>
+  <script type="application/json" data-plotjs="plot-container-${id}">${JSON.stringify(
+    {
+      tooltip_x_shift: 0,
+      tooltip_y_shift: 0,
+      hover_nearest: false,
+      axes: {
+        axes_1: {
+          tooltip_labels: labels,
+          tooltip_groups: [0, 1],
+          hover_nearest: "false",
+          on: null,
+        },
+      },
+    },
+  )}</script>`;
+
+describe("initPlots", () => {
+  test("initializes each chart of a page with its own data", () => {
+    const dom = new JSDOM(
+      `<html><body>${chart("a", ["A1", "A2"])}${chart("b", ["B1", "B2"])}</body></html>`,
+    );
+    const document = dom.window.document;
+
+    const parsers = initPlots(document);
+    expect(parsers.length).toBe(2);
+
+    const point = document.querySelector("#plot-container-b use");
+    point.dispatchEvent(
+      new dom.window.MouseEvent("mouseover", { bubbles: true }),
+    );
+
+    expect(document.querySelector("#tooltip-b").innerHTML).toBe("B1");
+    expect(document.querySelector("#tooltip-a").innerHTML).toBe("");
+  });
+
+  test("skips charts that are already initialized", () => {
+    const dom = new JSDOM(`<html><body>${chart("a", ["A1", "A2"])}</body></html>`);
+    const document = dom.window.document;
+
+    expect(initPlots(document).length).toBe(1);
+    expect(initPlots(document).length).toBe(0);
+  });
+});
@@ -0,0 +1,35 @@
+import { expect, test, describe } from "bun:test";
+import { LineVertices } from "../../plotjs/static/plotparser.js";
+
+const encode = (array) => Buffer.from(array.buffer).toString("base64");
+
+describe("LineVertices", () => {
+  test("should decode the vertices sent by Python", () => {
+    const vertices = LineVertices.decode({
+      line2d_1: {
+        positions: encode(new Float32Array([0, 0, 10, 0, 20, 5])),
+        rows: encode(new Uint32Array([0, 7, 9])),
+        length: 10,
+      },
+    });
+
+    const line = vertices.get("line2d_1");
+    expect(line.length).toBe(10);
+    expect([...line.rows]).toEqual([0, 7, 9]);
+    expect(LineVertices.decode(undefined).size).toBe(0);
+  });
+
+  test("should find the row of the nearest vertex", () => {
+    const line = new LineVertices([0, 0, 10, 0, 20, 5], [0, 7, 9], 10);
+
+    expect(line.nearestRow(1, 1)).toBe(0);
+    expect(line.nearestRow(11, -2)).toBe(7);
+    expect(line.nearestRow(100, 100)).toBe(9);
+  });
+
+  test("should return -1 for a line without vertices", () => {
+    const line = new LineVertices([], [], 0);
+
+    expect(line.nearestRow(0, 0)).toBe(-1);
+  });
+});
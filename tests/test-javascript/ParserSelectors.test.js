@@ -1,6 +1,6 @@
 import { expect, test, describe } from "bun:test";
 import { JSDOM } from "jsdom";
-import PlotSVGParser from "../../plotjs/static/plotparser.js";
+import PlotSVGParser, { walkSVG } from "../../plotjs/static/plotparser.js";
 
 describe("findBars", () => {
   test("should select only patches with clip-path starting with url(", () => {
@@ -447,6 +447,88 @@ describe("findAreas", () => {
   });
 });
 
+describe("setManifest", () => {
+  const dom = () =>
+    new JSDOM(`<svg>
+      <g id="axes_1">
+        <g id="patch_3"><path clip-path="url(#c)" d="M 0 0 L 1 1"></path></g>
+        <g id="text_1">
+          <g id="patch_4"><path style="fill: #fff" d="M 0 0 C 1 1 2 2 3 3"></path></g>
+        </g>
+        <g id="PathCollection_1"><g><use></use><use></use></g></g>
+        <g id="line2d_1"><path d="M 0 0 L 1 1"></path></g>
+        <g id="legend_1">
+          <g id="patch_5"><path d="M 0 0 L 1 1"></path></g>
+          <g id="line2d_2"><path d="M 0 0 L 1 1"></path></g>
+          <g id="PathCollection_2"><g><use></use></g></g>
+        </g>
+      </g>
+    </svg>`);
+  const manifest = {
+    axes_1: [
+      ["patch_3", "bar"],
+      ["PathCollection_1", "point"],
+      ["line2d_1", "line"],
+    ],
+  };
+
+  test("should find plot elements of the manifest and of the legend", () => {
+    const svg = dom().window.document.querySelector("svg");
+    const parser = new PlotSVGParser(svg, null, 0, 0);
+    parser.setManifest(manifest);
+
+    const bars = parser.findBars(parser.svg, "axes_1");
+    expect(bars.nodes().map((node) => node.id)).toEqual(["patch_3"]);
+
+    const points = parser.findPoints(parser.svg, "axes_1", [0, 1, 2]);
+    expect(points.size()).toBe(3);
+    expect(points.nodes()[2].closest("g[id^=legend]")).not.toBeNull();
+
+    const lines = parser.findLines(parser.svg, "axes_1");
+    expect(lines.nodes().map((node) => node.parentNode.id)).toEqual([
+      "line2d_1",
+      "line2d_2",
+    ]);
+
+    // the curved box of the text is not in the manifest
+    expect(parser.findPies(parser.svg, "axes_1").size()).toBe(0);
+    expect(parser.findAreas(parser.svg, "axes_1").size()).toBe(0);
+  });
+
+  test("should select elements tagged by Python and only tag the legend", () => {
+    const svg = new JSDOM(`<svg>
+      <g id="axes_1">
+        <g id="PathCollection_1"><g>
+          <use class="point plot-element" data-idx="0" data-group="a"></use>
+          <use class="point plot-element" data-idx="1" data-group="b"></use>
+        </g></g>
+        <g id="legend_1">
+          <g id="PathCollection_2"><g><use></use></g></g>
+        </g>
+      </g>
+    </svg>`).window.document.querySelector("svg");
+    const parser = new PlotSVGParser(svg, null, 0, 0);
+    parser.setManifest({ axes_1: [["PathCollection_1", "point"]] }, true);
+
+    const points = parser.findPoints(parser.svg, "axes_1", ["x", "y", "z"]);
+    const groups = points.nodes().map((node) => node.getAttribute("data-group"));
+    expect(groups).toEqual(["a", "b", "z"]);
+    expect(points.nodes()[2].getAttribute("class")).toBe(
+      "point plot-element",
+    );
+    expect(points.nodes()[2].hasAttribute("data-idx")).toBe(false);
+  });
+
+  test("should fall back to scanning the SVG without a manifest", () => {
+    const svg = dom().window.document.querySelector("svg");
+    const parser = new PlotSVGParser(svg, null, 0, 0);
+    parser.setManifest(manifest);
+    parser.setManifest(null);
+
+    expect(parser.findPies(parser.svg, "axes_1").size()).toBe(1);
+  });
+});
+
 describe("nearestElementFromMouse", () => {
   test("should return nearest element by bounding box center", () => {
     const dom = new JSDOM(`<svg xmlns="http://www.w3.org/2000/svg">
@@ -526,3 +608,55 @@ describe("nearestElementFromMouse", () => {
     expect(nearest.id).toBe("single");
   });
 });
+
+describe("walkSVG", () => {
+  test("should bucket candidate elements by axes in a single pass", () => {
+    const svg = new JSDOM(`<svg>
+      <g id="axes_1">
+        <g id="patch_1"><path clip-path="url(#c)"></path></g>
+        <g id="PathCollection_1"><g><use data-idx="0" class="point plot-element"></use></g></g>
+        <g id="matplotlib.axis_1"><g id="line2d_1"><path></path></g></g>
+        <g id="line2d_2"><path></path></g>
+        <g id="legend_1">
+          <g id="line2d_3"><path></path></g>
+          <g id="PathCollection_2"><g><use></use></g></g>
+        </g>
+      </g>
+      <g id="axes_2">
+        <g id="QuadMesh_1"><path></path></g>
+      </g>
+    </svg>`).window.document.querySelector("svg");
+
+    const { axes, groups } = walkSVG(svg);
+    expect([...axes.keys()]).toEqual(["axes_1", "axes_2"]);
+
+    const bucket = axes.get("axes_1");
+    expect(bucket.patches.map((node) => node.id)).toEqual(["patch_1"]);
+    expect(bucket.uses.length).toBe(2);
+    expect(bucket.legendUses.length).toBe(1);
+    // lines of the axis are left out
+    expect(bucket.linePaths.map((node) => node.parentNode.id)).toEqual([
+      "line2d_2",
+      "line2d_3",
+    ]);
+    expect(bucket.legendLinePaths.length).toBe(1);
+    expect(bucket.tagged.get("point").length).toBe(1);
+    expect(bucket.meshPaths.length).toBe(0);
+    expect(axes.get("axes_2").meshPaths.length).toBe(1);
+
+    expect(groups.get("legend_1").tagName).toBe("g");
+  });
+
+  test("should be shared by the find methods of all the axes", () => {
+    const svg = new JSDOM(`<svg>
+      <g id="axes_1"><g id="line2d_1"><path></path></g></g>
+      <g id="axes_2"><g id="line2d_2"><path></path></g></g>
+    </svg>`).window.document.querySelector("svg");
+    const parser = new PlotSVGParser(svg, null, 0, 0);
+
+    expect(parser.findLines(parser.svg, "axes_1").size()).toBe(1);
+    const tree = parser.tree;
+    expect(parser.findLines(parser.svg, "axes_2").size()).toBe(1);
+    expect(parser.tree).toBe(tree);
+  });
+});
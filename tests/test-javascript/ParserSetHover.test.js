@@ -1,6 +1,6 @@
 import { expect, test, describe, beforeEach } from "bun:test";
 import { JSDOM } from "jsdom";
-import PlotSVGParser from "../../plotjs/static/plotparser.js";
+import PlotSVGParser, { LineVertices } from "../../plotjs/static/plotparser.js";
 
 describe("setHoverEffect", () => {
   test("should toggle hovered class and tooltip on direct hover", () => {
@@ -80,8 +80,8 @@ describe("setHoverEffect", () => {
     Object.defineProperty(event, "pageY", { value: 100 });
     pointElement.dispatchEvent(event);
 
-    expect(tooltip.style.left).toBe("65px"); // 50 + 15
-    expect(tooltip.style.top).toBe("75px"); // 100 + (-25)
+    // 50 + 15, 100 + (-25)
+    expect(tooltip.style.transform).toBe("translate3d(65px, 75px, 0)");
   });
 
   test("should highlight elements with same group", () => {
@@ -264,6 +264,97 @@ describe("setHoverEffect", () => {
     expect(tooltip.innerHTML).toBe("Bar 1");
   });
 
+  test("should find bars from events on their path", () => {
+    const dom = new JSDOM(`<html><body>
+      <div id="tooltip" style="display: none;"></div>
+      <svg>
+        <g id="axes_1">
+          <g id="patch_1"><path clip-path="url(#c1)"></path></g>
+          <g id="patch_2"><path clip-path="url(#c2)"></path></g>
+        </g>
+      </svg>
+    </body></html>`);
+
+    const document = dom.window.document;
+    const svg = document.querySelector("svg");
+    const tooltip = document.querySelector("#tooltip");
+    const parser = new PlotSVGParser(svg, tooltip, 0, 0);
+
+    const bars = parser.findBars(parser.svg, "axes_1");
+    parser.setHoverEffect(
+      bars,
+      "axes_1",
+      ["Bar 1", "Bar 2"],
+      ["G1", "G2"],
+      "block",
+      false,
+    );
+
+    const path = document.querySelector("#patch_2 path");
+    path.dispatchEvent(
+      new dom.window.MouseEvent("mouseover", { bubbles: true }),
+    );
+
+    expect(bars.nodes()[1].classList.contains("hovered")).toBe(true);
+    expect(bars.nodes()[0].classList.contains("not-hovered")).toBe(true);
+    expect(tooltip.innerHTML).toBe("Bar 2");
+
+    // events on other elements of the axes are ignored
+    document
+      .querySelector("#axes_1")
+      .dispatchEvent(new dom.window.MouseEvent("mouseout", { bubbles: true }));
+    expect(tooltip.style.display).toBe("block");
+  });
+
+  test("should index elements tagged by Python from their data-idx", () => {
+    const dom = new JSDOM(`<html><body>
+      <div id="tooltip" style="display: none;"></div>
+      <svg>
+        <g id="axes_1">
+          <g id="line2d_1"><path class="line plot-element" data-idx="0"></path></g>
+          <g id="patch_1" class="bar plot-element" data-idx="0"><path></path></g>
+          <g id="patch_2" class="bar plot-element" data-idx="1"><path></path></g>
+        </g>
+      </svg>
+    </body></html>`);
+
+    const document = dom.window.document;
+    const svg = document.querySelector("svg");
+    const tooltip = document.querySelector("#tooltip");
+    const parser = new PlotSVGParser(svg, tooltip, 0, 0);
+    parser.setManifest(
+      {
+        axes_1: [
+          ["line2d_1", "line"],
+          ["patch_1", "bar"],
+          ["patch_2", "bar"],
+        ],
+      },
+      true,
+    );
+
+    const bars = parser.findBars(parser.svg, "axes_1");
+    parser.setHoverEffect(
+      bars,
+      "axes_1",
+      ["Bar 1", "Bar 2"],
+      ["G1", "G2"],
+      "block",
+      false,
+    );
+
+    document
+      .querySelector("#patch_2 path")
+      .dispatchEvent(new dom.window.MouseEvent("mouseover", { bubbles: true }));
+    expect(tooltip.innerHTML).toBe("Bar 2");
+
+    // tagged elements of other types have their own listeners
+    document
+      .querySelector("#line2d_1 path")
+      .dispatchEvent(new dom.window.MouseEvent("mouseout", { bubbles: true }));
+    expect(tooltip.style.display).toBe("block");
+  });
+
   test("should work with line elements", () => {
     const dom = new JSDOM(`<html><body>
       <div id="tooltip" style="display: none;"></div>
@@ -303,6 +394,119 @@ describe("setHoverEffect", () => {
     expect(tooltip.innerHTML).toBe("Line 1");
   });
 
+  test("should label downsampled lines by their nearest vertex", () => {
+    const dom = new JSDOM(`<html><body>
+      <div id="tooltip" style="display: none;"></div>
+      <svg>
+        <g id="axes_1">
+          <g id="line2d_1"><path d="M0,0 L10,0"></path></g>
+          <g id="line2d_2"><path d="M0,5 L10,5"></path></g>
+        </g>
+      </svg>
+    </body></html>`);
+
+    const document = dom.window.document;
+    const svg = document.querySelector("svg");
+    const tooltip = document.querySelector("#tooltip");
+    const parser = new PlotSVGParser(svg, tooltip, 0, 0);
+    // the first line has 3 rows, the vertices of rows 0 and 2 are drawn
+    parser.setVertices(
+      new Map([
+        [
+          "line2d_1",
+          new LineVertices(new Float32Array([0, 0, 10, 0]), [0, 2], 3),
+        ],
+      ]),
+    );
+
+    const lines = parser.findLines(parser.svg, "axes_1");
+    parser.setHoverEffect(
+      lines,
+      "axes_1",
+      ["a", "b", "c", "Line 2"],
+      ["Series1", "Series2"],
+      "block",
+      false,
+    );
+
+    const [first, second] = lines.nodes();
+    const move = (target, type, clientX) =>
+      target.dispatchEvent(
+        new dom.window.MouseEvent(type, { bubbles: true, clientX }),
+      );
+
+    move(first, "mouseover", 1);
+    expect(tooltip.innerHTML).toBe("a");
+    move(first, "mousemove", 9);
+    expect(first.classList.contains("hovered")).toBe(true);
+    expect(tooltip.innerHTML).toBe("c");
+
+    // other elements come after the rows of the line
+    move(first, "mouseout", 9);
+    move(second, "mouseover", 5);
+    expect(second.classList.contains("hovered")).toBe(true);
+    expect(tooltip.innerHTML).toBe("Line 2");
+  });
+
+  test("should label downsampled lines drawn after other elements", () => {
+    // points come first in the SVG, and both kinds are tagged by Python
+    const dom = new JSDOM(`<html><body>
+      <div id="tooltip" style="display: none;"></div>
+      <svg>
+        <g id="axes_1">
+          <g id="PathCollection_1">
+            <g clip-path="url(#p1)">
+              <use class="point plot-element" data-idx="0" data-group="0"></use>
+              <use class="point plot-element" data-idx="1" data-group="1"></use>
+            </g>
+          </g>
+          <g id="line2d_17">
+            <path class="line plot-element" data-idx="0" d="M0,0 L10,0"></path>
+          </g>
+        </g>
+      </svg>
+    </body></html>`);
+
+    const document = dom.window.document;
+    const svg = document.querySelector("svg");
+    const tooltip = document.querySelector("#tooltip");
+    const parser = new PlotSVGParser(svg, tooltip, 0, 0);
+    parser.setManifest(
+      {
+        axes_1: [
+          ["PathCollection_1", "point"],
+          ["line2d_17", "line"],
+        ],
+      },
+      true,
+    );
+    parser.setVertices(
+      new Map([
+        [
+          "line2d_17",
+          new LineVertices(new Float32Array([0, 0, 10, 0]), [0, 2], 3),
+        ],
+      ]),
+    );
+
+    const labels = ["v0", "v1", "v2"];
+    const groups = [0, 1, 2];
+    const points = parser.findPoints(parser.svg, "axes_1", groups);
+    const lines = parser.findLines(parser.svg, "axes_1");
+    parser.setHoverEffect(points, "axes_1", labels, groups, "block", false);
+    parser.setHoverEffect(lines, "axes_1", labels, groups, "block", false);
+
+    const line = lines.nodes()[0];
+    line.dispatchEvent(
+      new dom.window.MouseEvent("mouseover", { bubbles: true, clientX: 9 }),
+    );
+    expect(tooltip.innerHTML).toBe("v2");
+    line.dispatchEvent(
+      new dom.window.MouseEvent("mousemove", { bubbles: true, clientX: 1 }),
+    );
+    expect(tooltip.innerHTML).toBe("v0");
+  });
+
   test("should work with area elements", () => {
     const dom = new JSDOM(`<html><body>
       <div id="tooltip" style="display: none;"></div>
@@ -604,6 +808,126 @@ describe("setHoverEffect with hover_nearest", () => {
     expect(points.classed("hovered")).toBe(false);
     expect(tooltip.style.display).toBe("none");
   });
+
+  test("should label downsampled lines next to other kinds of elements", () => {
+    // the area comes first in the SVG, and both kinds are tagged by Python
+    const dom = new JSDOM(`<html><body>
+      <div id="tooltip" style="display: none;"></div>
+      <svg>
+        <g id="axes_1">
+          <g id="FillBetweenPolyCollection_1">
+            <path class="area plot-element" data-idx="0" d="M40,40 L60,60"></path>
+          </g>
+          <g id="line2d_17">
+            <path class="line plot-element" data-idx="0" d="M0,0 L10,0"></path>
+          </g>
+        </g>
+      </svg>
+    </body></html>`);
+
+    const document = dom.window.document;
+    const svg = document.querySelector("svg");
+    const tooltip = document.querySelector("#tooltip");
+    const positions = new Map([
+      ["FillBetweenPolyCollection_1", new Float32Array([50, 50])],
+      ["line2d_17", new Float32Array([5, 0])],
+    ]);
+    const parser = new PlotSVGParser(svg, tooltip, 0, 0, positions);
+    parser.setManifest(
+      {
+        axes_1: [
+          ["FillBetweenPolyCollection_1", "area"],
+          ["line2d_17", "line"],
+        ],
+      },
+      true,
+    );
+    parser.setVertices(
+      new Map([
+        [
+          "line2d_17",
+          new LineVertices(new Float32Array([0, 0, 10, 0]), [0, 2], 3),
+        ],
+      ]),
+    );
+
+    const labels = ["Area", "v0", "v1", "v2"];
+    const groups = [0, 1, 2, 3];
+    const lines = parser.findLines(parser.svg, "axes_1");
+    const areas = parser.findAreas(parser.svg, "axes_1");
+    // same order as initPlot(): lines, then areas
+    parser.setHoverEffect(lines, "axes_1", labels, groups, "block", true);
+    parser.setHoverEffect(areas, "axes_1", labels, groups, "block", true);
+
+    const axesGroup = document.querySelector("#axes_1");
+    const move = (clientX, clientY) =>
+      axesGroup.dispatchEvent(
+        new dom.window.MouseEvent("mousemove", {
+          bubbles: true,
+          clientX,
+          clientY,
+        }),
+      );
+
+    move(9, 0);
+    expect(lines.nodes()[0].classList.contains("hovered")).toBe(true);
+    expect(tooltip.innerHTML).toBe("v2");
+    move(1, 0);
+    expect(tooltip.innerHTML).toBe("v0");
+    move(50, 50);
+    expect(areas.nodes()[0].classList.contains("hovered")).toBe(true);
+    expect(tooltip.innerHTML).toBe("Area");
+  });
+});
+
+describe("setHoverEffect batching", () => {
+  test("should apply only the last event of each animation frame", () => {
+    const dom = new JSDOM(`<html><body>
+      <div id="tooltip" style="display: none;"></div>
+      <svg>
+        <g id="axes_1">
+          <g id="PathCollection_1">
+            <g><use></use><use></use></g>
+          </g>
+        </g>
+      </svg>
+    </body></html>`);
+
+    const frames = [];
+    dom.window.requestAnimationFrame = (callback) => frames.push(callback);
+
+    const document = dom.window.document;
+    const svg = document.querySelector("svg");
+    const tooltip = document.querySelector("#tooltip");
+    const parser = new PlotSVGParser(svg, tooltip, 0, 0);
+
+    const points = parser.findPoints(parser.svg, "axes_1", ["G1", "G2"]);
+    parser.setHoverEffect(
+      points,
+      "axes_1",
+      ["L1", "L2"],
+      ["G1", "G2"],
+      "block",
+      false,
+    );
+
+    const nodes = points.nodes();
+    for (const node of nodes) {
+      node.dispatchEvent(
+        new dom.window.MouseEvent("mouseover", { bubbles: true }),
+      );
+    }
+
+    expect(frames.length).toBe(1);
+    expect(tooltip.style.display).toBe("none");
+
+    frames.shift()();
+
+    expect(nodes[0].classList.contains("not-hovered")).toBe(true);
+    expect(nodes[1].classList.contains("hovered")).toBe(true);
+    expect(tooltip.style.display).toBe("block");
+    expect(tooltip.innerHTML).toBe("L2");
+  });
 });
 
 describe("PlotSVGParser constructor", () => {
@@ -0,0 +1,103 @@
+import { expect, test, describe } from "bun:test";
+import { JSDOM } from "jsdom";
+import { PlotMetrics, initPlots } from "../../plotjs/static/plotparser.js";
+
+describe("PlotMetrics", () => {
+  test("records the duration of each phase", () => {
+    const metrics = new PlotMetrics();
+
+    expect(metrics.time("chart", null, "parse", () => 42)).toBe(42);
+    metrics.time("chart", "axes_1", "setHoverEffect", () => null);
+    metrics.time("chart", "axes_1", "setHoverEffect", () => null);
+
+    const { charts } = metrics.summary();
+    expect(Object.keys(charts.chart.phases)).toEqual(["parse"]);
+    expect(Object.keys(charts.chart.axes.axes_1)).toEqual(["setHoverEffect"]);
+    expect(charts.chart.axes.axes_1.setHoverEffect).toBeGreaterThanOrEqual(0);
+
+    const measures = performance
+      .getEntriesByType("measure")
+      .map((entry) => entry.name);
+    expect(measures).toContain("plotjs:chart:parse");
+    expect(measures).toContain("plotjs:chart:axes_1:setHoverEffect");
+  });
+
+  test("records the phase of a failing callback", () => {
+    const metrics = new PlotMetrics();
+    expect(() =>
+      metrics.time("chart", null, "init", () => {
+        throw new Error("boom");
+      }),
+    ).toThrow("boom");
+    expect(metrics.charts.chart.phases.init).toBeGreaterThanOrEqual(0);
+  });
+
+  test("summarizes hover latencies", () => {
+    const metrics = new PlotMetrics();
+    expect(metrics.summary().hover).toEqual({
+      count: 0,
+      mean: 0,
+      p50: 0,
+      p95: 0,
+      max: 0,
+    });
+
+    for (let i = 0; i < PlotMetrics.MAX_SAMPLES + 100; i++) {
+      metrics.recordHover(i % 100);
+    }
+    const { hover } = metrics.summary();
+    expect(hover.count).toBe(PlotMetrics.MAX_SAMPLES + 100);
+    expect(metrics.hoverSamples.length).toBe(PlotMetrics.MAX_SAMPLES);
+    expect(hover.mean).toBeCloseTo(49.5);
+    expect(hover.p50).toBe(50);
+    expect(hover.p95).toBe(95);
+    expect(hover.max).toBe(99);
+  });
+
+  test("is filled by initPlots and hovers", () => {
+    const dom = new JSDOM(`<html><body>
+      <div id="plot-container-a" class="plotjs-chart">
+        <svg>
+          <g id="axes_1">
+            <g id="PathCollection_1"><g><use></use><use></use></g></g>
+          </g>
+        </svg>
+        <div class="tooltip" id="tooltip-a"></div>
+      </div>
+      <script type="application/json" data-plotjs="plot-container-a">${JSON.stringify(
+        {
+          tooltip_x_shift: 0,
+          tooltip_y_shift: 0,
+          hover_nearest: false,
+          axes: {
+            axes_1: {
+              tooltip_labels: ["A", "B"],
+              tooltip_groups: [0, 1],
+              hover_nearest: "false",
+              on: null,
+            },
+          },
+        },
+      )}</script>
+    </body></html>`);
+    const document = dom.window.document;
+    const metrics = new PlotMetrics();
+
+    initPlots(document, metrics);
+    const chart = metrics.summary().charts["plot-container-a"];
+    expect(Object.keys(chart.phases)).toEqual(["parse", "setup", "init"]);
+    expect(chart.axes.axes_1).toHaveProperty("findPoints");
+    expect(chart.axes.axes_1).toHaveProperty("setHoverEffect");
+
+    document
+      .querySelector("use")
+      .dispatchEvent(new dom.window.MouseEvent("mouseover", { bubbles: true }));
+    expect(metrics.summary().hover.count).toBe(1);
+  });
+
+  test("is shared by the page by default", () => {
+    const dom = new JSDOM(`<html><body></body></html>`);
+    initPlots(dom.window.document);
+    expect(globalThis.plotjs.metrics).toBeInstanceOf(PlotMetrics);
+  });
+});
@@ -0,0 +1,145 @@
+import { expect, test, describe } from "bun:test";
+import { JSDOM } from "jsdom";
+import PlotSVGParser, {
+  SpatialIndex,
+  decodePositions,
+} from "../../plotjs/static/plotparser.js";
+
+const bruteForceNearest = (xs, ys, x, y) => {
+  let best = -1;
+  let bestDist = Infinity;
+  for (let i = 0; i < xs.length; i++) {
+    const dist = Math.hypot(xs[i] - x, ys[i] - y);
+    if (dist < bestDist) {
+      best = i;
+      bestDist = dist;
+    }
+  }
+  return best;
+};
+
+describe("SpatialIndex", () => {
+  test("returns -1 when empty", () => {
+    expect(new SpatialIndex([], []).nearest(0, 0)).toBe(-1);
+  });
+
+  test("matches a linear scan", () => {
+    // deterministic pseudo-random points, with duplicates
+    let seed = 42;
+    const random = () => {
+      seed = (seed * 16807) % 2147483647;
+      return seed / 2147483647;
+    };
+    const xs = Array.from({ length: 500 }, () => Math.round(random() * 50));
+    const ys = Array.from({ length: 500 }, () => random() * 100);
+    const index = new SpatialIndex(xs, ys);
+
+    for (let q = 0; q < 200; q++) {
+      const x = random() * 80 - 15;
+      const y = random() * 130 - 15;
+      expect(index.nearest(x, y)).toBe(bruteForceNearest(xs, ys, x, y));
+    }
+  });
+
+  test("ignores elements without geometry", () => {
+    const index = new SpatialIndex([NaN, 10, 0], [NaN, 10, 0]);
+    expect(index.nearest(-1, -1)).toBe(2);
+    expect(index.nearest(9, 9)).toBe(1);
+  });
+
+  test("resolves ties with the first element", () => {
+    const index = new SpatialIndex([0, 10, 0], [0, 0, 0]);
+    expect(index.nearest(0, 0)).toBe(0);
+    expect(index.nearest(5, 0)).toBe(0);
+  });
+});
+
+describe("hover_nearest", () => {
+  test("reads the layout and the screen transform only once", () => {
+    const dom = new JSDOM(`<html><body>
+      <div id="tooltip" style="display: none;"></div>
+      <svg>
+        <g id="axes_1">
+          <g id="PathCollection_1"><g><use></use><use></use></g></g>
+        </g>
+      </svg>
+    </body></html>`);
+    const document = dom.window.document;
+    const svg = document.querySelector("svg");
+    const tooltip = document.querySelector("#tooltip");
+    const parser = new PlotSVGParser(svg, tooltip, 0, 0);
+
+    let rectCalls = 0;
+    svg.getBoundingClientRect = () => {
+      rectCalls++;
+      return { left: 0, top: 0 };
+    };
+
+    const points = parser.findPoints(parser.svg, "axes_1", ["A", "B"]);
+    let bboxCalls = 0;
+    points.nodes().forEach((node, i) => {
+      node.getBBox = () => {
+        bboxCalls++;
+        return { x: i * 100, y: 0, width: 10, height: 10 };
+      };
+    });
+    parser.setHoverEffect(points, "axes_1", ["A", "B"], ["A", "B"], "block", true);
+
+    const axesGroup = document.querySelector("#axes_1");
+    for (const clientX of [0, 110, 5]) {
+      axesGroup.dispatchEvent(
+        new dom.window.MouseEvent("mousemove", { bubbles: true, clientX }),
+      );
+    }
+
+    expect(tooltip.innerHTML).toBe("A");
+    expect(bboxCalls).toBe(2);
+    expect(rectCalls).toBe(1);
+
+    dom.window.dispatchEvent(new dom.window.Event("resize"));
+    axesGroup.dispatchEvent(
+      new dom.window.MouseEvent("mousemove", { bubbles: true, clientX: 110 }),
+    );
+    expect(tooltip.innerHTML).toBe("B");
+    expect(rectCalls).toBe(2);
+  });
+});
+
+describe("positions from Python", () => {
+  test("decodePositions reads little-endian float32 values", () => {
+    // [1.5, 2, 3, 4]
+    const positions = decodePositions({ PathCollection_1: "AADAPwAAAEAAAEBAAACAQA==" });
+    expect(Array.from(positions.get("PathCollection_1"))).toEqual([1.5, 2, 3, 4]);
+  });
+
+  test("fromElements uses positions instead of the layout", () => {
+    const dom = new JSDOM(`<svg>
+      <g id="axes_1">
+        <g id="PathCollection_1"><g><use></use><use></use></g></g>
+        <g id="line2d_1"><path></path></g>
+      </g>
+    </svg>`);
+    const svg = dom.window.document.querySelector("svg");
+    const parser = new PlotSVGParser(svg, null, 0, 0);
+    parser.findPoints(parser.svg, "axes_1", ["A", "B"]);
+    parser.findLines(parser.svg, "axes_1");
+
+    let bboxCalls = 0;
+    svg.querySelectorAll(".plot-element").forEach((node) => {
+      node.getBBox = () => {
+        bboxCalls++;
+        return { x: 40, y: 40, width: 20, height: 20 };
+      };
+    });
+
+    const elements = parser.axesElements("axes_1").elements;
+    const index = SpatialIndex.fromElements(
+      elements,
+      new Map([["PathCollection_1", new Float32Array([0, 0, 100, 0])]]),
+    );
+
+    expect(bboxCalls).toBe(1); // only the line
+    expect(index.nearest(90, 0)).toBe(1);
+    expect(index.nearest(50, 50)).toBe(2);
+  });
+});
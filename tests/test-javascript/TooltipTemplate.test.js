@@ -0,0 +1,61 @@
+import { expect, test, describe } from "bun:test";
+import {
+  TooltipTemplate,
+  Categorical,
+  formatValue,
+} from "../../plotjs/static/plotparser.js";
+
+describe("formatValue", () => {
+  test.each([
+    [3.14159, ".2f", "3.14"],
+    [1234567.891, ",.2f", "1,234,567.89"],
+    [0.1234, ".1%", "12.3%"],
+    [42, "05d", "00042"],
+    [3.5, "+.1f", "+3.5"],
+    [0.000123, ".2e", "1.23e-04"],
+    ["abc", ">6", "   abc"],
+    ["abc", "*^7", "**abc**"],
+    ["hello", ".3", "hel"],
+    [true, "", "True"],
+    [7, "", "7"],
+  ])("format(%p, %p) is %p", (value, spec, expected) => {
+    expect(formatValue(value, spec)).toBe(expected);
+  });
+
+  test("missing values are empty", () => {
+    expect(formatValue(null, ".2f")).toBe("");
+    expect(formatValue(undefined, "")).toBe("");
+  });
+});
+
+describe("TooltipTemplate", () => {
+  const payload = {
+    template: [
+      ["<b>", "name", ""],
+      ["</b>: ", "value", ".1f"],
+    ],
+    columns: {
+      name: { values: ["a", "b"], codes: [0, 1, 0] },
+      value: [1, 2.5, null],
+    },
+    length: 3,
+    extra: ["legend"],
+  };
+
+  test("formats labels on demand", () => {
+    const labels = TooltipTemplate.from(payload);
+
+    expect(labels.length).toBe(4);
+    expect(labels.get(0)).toBe("<b>a</b>: 1.0");
+    expect(labels.get(1)).toBe("<b>b</b>: 2.5");
+    expect(labels.get(2)).toBe("<b>a</b>: ");
+    expect(labels.get(3)).toBe("legend");
+    expect(labels.get(4)).toBeUndefined();
+  });
+
+  test("falls back to Categorical for plain labels", () => {
+    expect(TooltipTemplate.from(["a", "b"])).toBeInstanceOf(Categorical);
+    const labels = TooltipTemplate.from(payload);
+    expect(TooltipTemplate.from(labels)).toBe(labels);
+  });
+});
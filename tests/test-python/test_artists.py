@@ -0,0 +1,111 @@
+import base64
+import re
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from plotjs import PlotJS
+from plotjs.artists import element_type, hidden, resolve_bbox_inches, split_artists
+
+
+def test_split_artists():
+    fig, ax = plt.subplots()
+    points = ax.scatter([1, 2, 3], [1, 2, 3], label="points")
+    bars = ax.bar([1, 2], [1, 2])
+    (line,) = ax.plot([1, 2], [2, 1])
+    legend = ax.legend()
+    title = ax.set_title("Title")
+    image = ax.imshow(np.zeros((2, 2)))
+
+    interactive, static = split_artists(fig)
+
+    for artist in [points, *bars, line, legend]:
+        assert artist in interactive
+    for artist in [title, image, ax.patch, ax.xaxis, ax.yaxis, fig.patch]:
+        assert artist in static
+    assert ax not in interactive and ax not in static
+
+    plt.close(fig)
+
+
+def test_element_type():
+    fig, (ax1, ax2) = plt.subplots(ncols=2)
+    points = ax1.scatter([1, 2], [1, 2], label="points")
+    bars = ax1.bar([1, 2], [1, 2])
+    (line,) = ax1.plot([1, 2], [2, 1])
+    area = ax1.fill_between([1, 2], [1, 2])
+    mesh = ax1.pcolormesh(np.zeros((2, 2)))
+    legend = ax1.legend()
+    wedges, _ = ax2.pie([1, 2])
+    circle = ax2.add_patch(plt.Circle((0, 0), 1, fill=False, clip_on=False))
+
+    assert element_type(points) == "point"
+    assert element_type(bars[0]) == "bar"
+    assert element_type(line) == "line"
+    assert element_type(area) == "area"
+    assert element_type(mesh) == "rectangle"
+    assert element_type(wedges[0]) == "pie"
+    assert element_type(circle) is None
+    assert element_type(legend) is None
+
+    plt.close(fig)
+
+
+def test_hidden_restores_visibility():
+    fig, ax = plt.subplots()
+    (visible,) = ax.plot([1, 2], [2, 1])
+    (invisible,) = ax.plot([1, 2], [1, 2], visible=False)
+
+    with hidden([visible, invisible]):
+        assert not visible.get_visible()
+        assert not invisible.get_visible()
+
+    assert visible.get_visible()
+    assert not invisible.get_visible()
+
+    plt.close(fig)
+
+
+def test_resolve_bbox_inches():
+    fig, ax = plt.subplots()
+    ax.plot([1, 2], [2, 1])
+
+    assert resolve_bbox_inches(fig, {"dpi": 100}) == {"dpi": 100}
+
+    savefig_kws = resolve_bbox_inches(fig, {"bbox_inches": "tight", "pad_inches": 0})
+    assert "pad_inches" not in savefig_kws
+    bbox = savefig_kws["bbox_inches"]
+    assert bbox.width < fig.get_figwidth()
+    assert bbox.height < fig.get_figheight()
+
+    plt.close(fig)
+
+
+def test_rasterize_static():
+    fig, ax = plt.subplots()
+    ax.scatter([1, 2, 3], [1, 2, 3], label="points")
+    ax.bar([1, 2], [1, 2])
+    ax.plot([1, 2], [2, 1])
+    ax.legend()
+    ax.set_title("A title that should be rasterized")
+    ax.grid(True)
+
+    vector = PlotJS(fig)._svg_content
+    hybrid = PlotJS(fig, rasterize_static=True, raster_dpi=50)._svg_content
+
+    assert hybrid.count("<image") == 1
+    png = re.search(r'xlink:href="data:image/png;base64,([^"]+)"', hybrid).group(1)
+    assert base64.b64decode(png).startswith(b"\x89PNG")
+
+    assert 'id="matplotlib.axis_1"' in vector
+    assert 'id="matplotlib.axis_1"' not in hybrid
+    assert 'id="text_' in vector
+    for group_id in ["axes_1", "PathCollection_1", "line2d_1", "legend_1"]:
+        assert f'<g id="{group_id}"' in hybrid
+    assert hybrid.count("<use") < vector.count("<use")
+
+    # the figure is left untouched
+    assert ax.title.get_visible()
+    assert ax.xaxis.get_visible()
+
+    plt.close(fig)
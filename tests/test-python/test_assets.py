@@ -0,0 +1,123 @@
+import os
+import re
+
+import matplotlib.pyplot as plt
+import pytest
+from jinja2 import Template
+
+from plotjs import PlotJS, assets
+
+
+def test_assets_are_loaded_once():
+    assets.clear_cache()
+
+    css = assets.get_default_css()
+    js = assets.get_js_parser()
+    template = assets.get_template()
+
+    assert "--default-opacity" in css
+    assert js.startswith("class Selection")
+    assert "export default" not in js
+    assert isinstance(template, Template)
+    assert assets.cache_info() == assets.CacheInfo(hits=0, misses=3, currsize=3)
+
+    assert assets.get_default_css() is css
+    assert assets.get_js_parser() is js
+    assert assets.get_template() is template
+    assert assets.cache_info() == assets.CacheInfo(hits=3, misses=3, currsize=3)
+
+
+def test_plotjs_instances_share_cached_assets():
+    assets.clear_cache()
+
+    fig, ax = plt.subplots()
+    ax.scatter([1, 2, 3], [1, 2, 3])
+
+    first = PlotJS(fig=fig)
+    second = PlotJS(fig=fig)
+
+    # only the template is loaded by instances, other assets on export
+    assert first._template is second._template
+    assert assets.cache_info() == assets.CacheInfo(hits=1, misses=1, currsize=1)
+
+    first.as_html()
+    misses = assets.cache_info().misses
+    second.as_html()
+    assert assets.cache_info().misses == misses
+
+    plt.close(fig)
+
+
+def test_asset_is_reloaded_when_mtime_changes(tmp_path):
+    registry = assets.AssetRegistry()
+    path = tmp_path / "style.css"
+    path.write_text(".a{color:red;}")
+
+    assert registry.get("css", str(path), assets._read_file) == ".a{color:red;}"
+
+    path.write_text(".a{color:blue;}")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert registry.get("css", str(path), assets._read_file) == ".a{color:blue;}"
+    assert registry.cache_info() == assets.CacheInfo(hits=0, misses=2, currsize=1)
+
+    registry.get("css", str(path), assets._read_file)
+    assert registry.cache_info().hits == 1
+
+    registry.clear()
+    assert registry.cache_info() == assets.CacheInfo(hits=0, misses=0, currsize=0)
+
+
+def test_external_assets_are_content_hashed():
+    js = assets.get_external_js()
+    css = assets.get_external_css()
+
+    assert re.fullmatch(r"plotjs-[0-9a-f]{16}\.js", js.file_name)
+    assert re.fullmatch(r"plotjs-[0-9a-f]{16}\.css", css.file_name)
+    assert "class PlotSVGParser" in js.content
+    assert "initPlots(document);" in js.content
+    assert "export " not in js.content
+    assert css.content == assets.get_default_css()
+    assert assets.get_external_js() is js
+
+
+def test_save_with_external_assets(tmp_path):
+    fig, ax = plt.subplots()
+    ax.scatter([1, 2, 3], [1, 2, 3])
+
+    asset_dir = tmp_path / "static"
+    for name in ("first", "second"):
+        PlotJS(fig=fig).add_tooltip(labels=["A", "B", "C"]).save(
+            str(tmp_path / name),
+            assets="external",
+            asset_dir=str(asset_dir),
+        )
+
+    js = assets.get_external_js()
+    css = assets.get_external_css()
+    assert sorted(os.listdir(asset_dir)) == sorted([js.file_name, css.file_name])
+    assert (asset_dir / js.file_name).read_text(encoding="utf-8") == js.content
+
+    html = (tmp_path / "first.html").read_text(encoding="utf-8")
+    assert f'<script defer src="static/{js.file_name}"></script>' in html
+    assert f'<link rel="stylesheet" href="static/{css.file_name}" />' in html
+    assert "class PlotSVGParser" not in html
+    assert "--default-opacity" not in html
+
+    plt.close(fig)
+
+
+def test_save_with_external_assets_next_to_html(tmp_path):
+    fig, ax = plt.subplots()
+    ax.scatter([1, 2, 3], [1, 2, 3])
+
+    PlotJS(fig=fig).save(str(tmp_path / "chart.html"), assets="external")
+
+    assert (tmp_path / assets.get_external_js().file_name).exists()
+    assert (tmp_path / assets.get_external_css().file_name).exists()
+
+    with pytest.raises(ValueError, match="`assets` must be either"):
+        PlotJS(fig=fig).save(str(tmp_path / "chart.html"), assets="cdn")
+
+    plt.close(fig)
@@ -0,0 +1,81 @@
+import os
+import pickle
+
+import matplotlib.pyplot as plt
+
+from plotjs import ExportJob, ExportResult, save_many
+
+
+def make_scatter():
+    fig, ax = plt.subplots()
+    ax.scatter([1, 2, 3], [1, 2, 3])
+    return fig
+
+
+def make_nothing():
+    return "not a figure"
+
+
+def test_save_many(tmp_path):
+    fig = make_scatter()
+    jobs = [
+        ExportJob(
+            figure=make_scatter,
+            file_path=str(tmp_path / "factory.html"),
+            tooltips={"labels": ["A", "B", "C"]},
+            plot_kws={"bbox_inches": "tight"},
+            save_kws={"production": True},
+        ),
+        ExportJob(
+            figure=fig,
+            file_path=str(tmp_path / "figure.html"),
+            tooltips=[{"labels": ["A", "B", "C"], "ax": 0}],
+            css=".tooltip{color: red;}",
+        ),
+        {
+            "figure": pickle.dumps(fig),
+            "file_path": str(tmp_path / "pickled.html"),
+            "save_kws": {"document_title": "Pickled"},
+        },
+    ]
+
+    results = list(save_many(jobs, max_workers=2))
+
+    assert len(results) == 3
+    assert sorted(result.index for result in results) == [0, 1, 2]
+    for result in results:
+        assert isinstance(result, ExportResult)
+        assert result.ok, result.error
+        assert result.elapsed > 0
+        assert os.path.exists(result.file_path)
+        assert result.profile.sizes["total"] == os.path.getsize(result.file_path)
+
+    with open(tmp_path / "figure.html") as f:
+        assert ".tooltip{color: red;}" in f.read()
+    with open(tmp_path / "pickled.html") as f:
+        assert "<title>Pickled</title>" in f.read()
+
+    plt.close(fig)
+
+
+def test_save_many_isolates_errors(tmp_path):
+    jobs = [
+        ExportJob(figure=make_nothing, file_path=str(tmp_path / "bad.html")),
+        ExportJob(
+            figure=make_scatter,
+            file_path=str(tmp_path / "bad-tooltip.html"),
+            tooltips={"labels": ["A"], "on": "circle"},
+        ),
+        ExportJob(figure=make_scatter, file_path=str(tmp_path / "good.html")),
+    ]
+
+    results = {result.index: result for result in save_many(jobs, max_workers=2)}
+
+    assert not results[0].ok
+    assert "TypeError" in results[0].error
+    assert results[0].profile is None
+    assert not results[1].ok
+    assert "Invalid element type 'circle'" in results[1].error
+    assert results[2].ok
+    assert os.path.exists(tmp_path / "good.html")
+    assert not os.path.exists(tmp_path / "bad.html")
@@ -0,0 +1,93 @@
+import base64
+import re
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from plotjs import PlotJS, rendering
+from plotjs.canvas import _path_data, supports_canvas
+
+
+def _decode(encoded: str, dtype: str = "<f4") -> np.ndarray:
+    return np.frombuffer(base64.b64decode(encoded), dtype=dtype)
+
+
+@pytest.fixture
+def scatter():
+    fig, ax = plt.subplots()
+    ax.scatter(
+        [1, 2, np.nan, 3],
+        [1, 2, 3, 5],
+        c=[1, 2, 3, 4],
+        s=[10, 20, 30, 40],
+    )
+    ax.plot([1, 3], [1, 5])
+    yield fig
+    plt.close(fig)
+
+
+@pytest.mark.parametrize("savefig_kws", [{}, {"bbox_inches": "tight"}])
+@pytest.mark.parametrize("rasterize_static", [False, True])
+def test_markers_match_svg(scatter, savefig_kws, rasterize_static):
+    kws = {"rasterize_static": rasterize_static, "savefig_kws": savefig_kws}
+    svg = rendering.render_svg(scatter, **kws)
+    canvas = rendering.render_svg(scatter, canvas_axes=(0,), **kws)
+
+    # positions of SVG elements are checked against the SVG in test_positions
+    markers = canvas.markers["PathCollection_1"]
+    np.testing.assert_allclose(
+        _decode(markers["centers"]),
+        _decode(svg.positions["PathCollection_1"]),
+        atol=1e-3,
+    )
+
+    # one value per drawn marker, the one with a missing value is not drawn
+    assert len(_decode(markers["scales"])) == 3
+    assert len(_decode(markers["fill"], "u1")) == 3 * 4
+    # a single value is shared by all markers
+    assert len(_decode(markers["linewidths"])) == 1
+
+    # markers are replaced by an empty group, other ids do not change
+    assert '<g id="PathCollection_1"/>' in canvas.svg
+    assert re.findall(r'<g id="([^"]+)"', canvas.svg) == re.findall(
+        r'<g id="([^"]+)"', svg.svg
+    )
+    assert "PathCollection_1" not in canvas.positions
+
+
+def test_supports_canvas(scatter):
+    collection, line = scatter.axes[0].collections[0], scatter.axes[0].lines[0]
+    assert supports_canvas(collection)
+    assert not supports_canvas(line)
+
+
+def test_path_data():
+    path = plt.matplotlib.path.Path(
+        [[0, 0], [1, 0], [1, 1], [0, 0]],
+        [
+            plt.matplotlib.path.Path.MOVETO,
+            plt.matplotlib.path.Path.LINETO,
+            plt.matplotlib.path.Path.LINETO,
+            plt.matplotlib.path.Path.CLOSEPOLY,
+        ],
+    )
+    assert _path_data(path) == "M0 -0L1 -0L1 -1Z"
+
+
+def test_render_canvas(scatter):
+    plot = PlotJS(fig=scatter).add_tooltip(labels=["A", "B", "C"])
+    plot.as_html()
+    assert "markers" not in plot.plot_data_json
+    assert "render" not in plot.plot_data_json["axes"]["axes_1"]
+
+    plot = PlotJS(fig=scatter).add_tooltip(labels=["A", "B", "C"], render="canvas")
+    html = plot.as_html()
+    assert list(plot.plot_data_json["markers"]) == ["PathCollection_1"]
+    assert plot.plot_data_json["axes"]["axes_1"]["render"] == "canvas"
+    assert '<g id="PathCollection_1"/>' in html
+
+
+def test_render_invalid(scatter):
+    with pytest.raises(ValueError, match="`render` must be either"):
+        PlotJS(fig=scatter).add_tooltip(labels=["A"], render="webgl")
@@ -0,0 +1,80 @@
+import base64
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from plotjs import PlotJS, rendering
+from plotjs.downsample import lttb, simplified_vertices, supports_downsampling
+
+
+def _decode(encoded: str, dtype: str = "<f4") -> np.ndarray:
+    return np.frombuffer(base64.b64decode(encoded), dtype=dtype)
+
+
+@pytest.fixture
+def series():
+    fig, ax = plt.subplots()
+    y = np.cumsum(np.random.default_rng(0).normal(size=100_000))
+    ax.plot(y)
+    ax.plot([0, 10], [0, 1], marker="o")
+    yield fig
+    plt.close(fig)
+
+
+def test_lttb():
+    points = np.array([[0, 0], [1, 5], [2, 0], [3, 0], [4, -5], [5, 0]], float)
+    # the peaks are kept, along with the first and last vertices
+    assert lttb(points, 4).tolist() == [0, 1, 4, 5]
+    assert lttb(points, 10).tolist() == list(range(6))
+
+
+def test_simplified_vertices():
+    points = np.column_stack([np.arange(1000.0), np.sin(np.arange(1000.0))])
+    points[500:510] = np.nan
+    kept = simplified_vertices(points, 100)
+    assert len(kept) == pytest.approx(100, abs=5)
+    assert {0, 499, 510, 999} <= set(kept.tolist())
+    # the line is still broken between the two runs
+    assert not np.isfinite(points[kept[(kept > 499) & (kept < 510)]]).any()
+    assert len(kept[(kept > 499) & (kept < 510)]) == 1
+
+
+def test_supports_downsampling(series):
+    line, markers = series.axes[0].lines
+    assert supports_downsampling(line)
+    assert not supports_downsampling(markers)
+    assert not supports_downsampling(series.axes[0].patch)
+
+
+def test_render_downsampled(series):
+    full = rendering.render_svg(series)
+    render = rendering.render_svg(series, downsample_axes=(0,))
+    assert full.vertices == {}
+    assert len(render.svg) < len(full.svg)
+
+    line_id = render.manifest["axes_1"][0][0]
+    vertices = render.vertices[line_id]
+    rows = _decode(vertices["rows"], "<u4")
+    assert vertices["length"] == 100_000
+    assert 100 < len(rows) < 2000
+    assert rows[0] == 0 and rows[-1] == 99_999
+    assert len(_decode(vertices["positions"])) == 2 * len(rows)
+    # lines with markers are left as is
+    assert list(render.vertices) == [line_id]
+    # the figure itself is not changed
+    assert len(series.axes[0].lines[0].get_xdata()) == 100_000
+
+
+def test_plotjs_downsample_lines(series):
+    plot = PlotJS(series).add_tooltip(
+        labels=[f"row {i}" for i in range(100_000)], downsample_lines=True
+    )
+    plot.as_html()
+    line_id = plot.plot_data_json["manifest"]["axes_1"][0][0]
+    assert set(plot.plot_data_json["vertices"]) == {line_id}
+    assert "downsample_lines" not in plot.plot_data_json["axes"]["axes_1"]
+
+    plot = PlotJS(series).add_tooltip(labels=["a", "b"])
+    plot.as_html()
+    assert "vertices" not in plot.plot_data_json
@@ -0,0 +1,170 @@
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from plotjs import assets
+from plotjs.minify import minify_js, tokenize
+
+
+def test_removes_comments_and_whitespace():
+    source = """
+    // a comment
+    const a = 1; /* another
+    comment */
+    function f(x, y) {
+      return x + y;
+    }
+    """
+    assert minify_js(source) == "const a=1;function f(x,y){return x+y;}"
+
+
+def test_keeps_literals():
+    source = (
+        "const s = 'a // b', t = \"/* c */\";\n"
+        "const r = /[/\\]]+ /g;\n"
+        "const u = `x ${ {a: 1}.a + `${y}` }  z`;\n"
+    )
+    assert minify_js(source) == (
+        "const s='a // b',t=\"/* c */\";const r=/[/\\]]+ /g;"
+        "const u=`x ${ {a: 1}.a + `${y}` }  z`;"
+    )
+    assert minify_js("const half = a / 2 / b;") == "const half=a/2/b;"
+
+
+def test_keeps_line_breaks_used_by_semicolon_insertion():
+    assert minify_js("a = b\nc()") == "a=b\nc()"
+    assert minify_js("function f() {\n  return\n  x\n}") == "function f(){return\nx}"
+    assert minify_js("a\n++b") == "a\n++b"
+    assert minify_js("a = b +\n  c;\nd();") == "a=b+c;d();"
+    assert minify_js("a = b\n  .c();") == "a=b.c();"
+
+
+def test_keeps_spaces_between_operators():
+    assert minify_js("a + +b - -c + ++d") == "a+ +b- -c+ ++d"
+
+
+def test_keeps_space_between_integer_and_member_access():
+    assert minify_js("x = 1 .toString()") == "x=1 .toString()"
+    assert minify_js("x = 1.5 .toFixed(1) + 1e3 .toString()") == (
+        "x=1.5.toFixed(1)+1e3.toString()"
+    )
+    assert minify_js("x = a .b") == "x=a.b"
+
+
+def test_strip_logging():
+    source = """
+    console.log(`value: ${f({ a: 1 })}`);
+    if (x) console.log("x");
+    const y = () => console.log(1)
+    console.warn("kept");
+    """
+    assert minify_js(source, strip_logging=True) == (
+        'if(x)void 0;const y=()=>void 0\nconsole.warn("kept");'
+    )
+    assert "console.log" in minify_js(source)
+
+
+def test_tokenize_errors():
+    with pytest.raises(ValueError, match="Unterminated string"):
+        tokenize("const a = 'b;")
+    with pytest.raises(ValueError, match="Unterminated comment"):
+        tokenize("/* a")
+
+
+def test_production_assets_are_cached():
+    assets.clear_cache()
+
+    js = assets.get_js_bootstrap(production=True)
+    assert "console.log" not in js
+    assert js.endswith("initPlots(document);})();")
+    assert assets.get_js_bootstrap(production=True) is js
+    assert "console.log" in assets.get_js_bootstrap(production=True, debug=True)
+    assert len(js) < len(assets.get_js_bootstrap()) / 1.5
+
+    external = assets.get_external_js(production=True)
+    assert external.content == js
+    assert external.file_name != assets.get_external_js().file_name
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+@pytest.mark.parametrize("production", [False, True])
+def test_bootstrap_is_valid_javascript(tmp_path, production):
+    path = tmp_path / "plotjs.js"
+    path.write_text(assets.get_js_bootstrap(production=production))
+    subprocess.run(["node", "--check", str(path)], check=True)
+
+
+# calls to the parts of the parser that do not need a DOM, run on the
+# original and minified parsers
+_PARSER_CALLS = """
+import { pathToFileURL } from "node:url";
+
+const run = (parser) => {
+  const results = [];
+  const call = (f) => {
+    try {
+      results.push(f());
+    } catch (error) {
+      results.push(`${error.name}: ${error.message}`);
+    }
+  };
+  for (const value of [1234.5678, -0.5, 42, 0, "text", true, null]) {
+    for (const spec of ["", ".2f", ">10", "+,.1f", ".1%", "e", "_d", "^9s", "08.3g"]) {
+      call(() => parser.formatValue(value, spec));
+    }
+  }
+  const labels = parser.TooltipTemplate.from({
+    template: [["Name: ", "name", ""], [" (", "value", ".1f"], [")", null, ""]],
+    columns: { name: ["a", "b"], value: { values: [1.25, 2.5], codes: [0, 1] } },
+    length: 2,
+    extra: ["legend"],
+  });
+  for (let i = 0; i < 4; i++) {
+    call(() => labels.get(i));
+  }
+  const groups = parser.Categorical.from(["a", "b", "a", 1]);
+  call(() => [...groups.codes, groups.values]);
+  call(() => [...parser.decodePositions({ line2d_1: "AACAPwAAAEAAAEBA" })]);
+  const xs = Array.from({ length: 50 }, (_, i) => (i * 37) % 11);
+  const ys = Array.from({ length: 50 }, (_, i) => (i * 13) % 7);
+  const index = new parser.SpatialIndex(xs, ys);
+  const line = new parser.LineVertices(
+    new Float32Array([0, 0, 10, 0, 20, 5]),
+    [0, 4, 9],
+    10,
+  );
+  for (let x = -2; x < 22; x += 1.5) {
+    call(() => [index.nearest(x, x / 3), line.nearestRow(x, 1)]);
+  }
+  return results;
+};
+
+const [original, minified] = await Promise.all(
+  process.argv.slice(2).map((path) => import(pathToFileURL(path))),
+);
+console.log(JSON.stringify([run(original), run(minified)]));
+"""
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+def test_minified_parser_behaves_the_same(tmp_path):
+    original = tmp_path / "original.mjs"
+    minified = tmp_path / "minified.mjs"
+    script = tmp_path / "calls.mjs"
+    original.write_text(Path(assets.JS_PARSER_PATH).read_text())
+    minified.write_text(minify_js(original.read_text(), strip_logging=True))
+    script.write_text(_PARSER_CALLS)
+
+    subprocess.run(["node", "--check", str(minified)], check=True)
+    output = subprocess.run(
+        ["node", str(script), str(original), str(minified)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    expected, actual = json.loads(output)
+    assert len(expected) > 80
+    assert actual == expected
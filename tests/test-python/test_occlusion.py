@@ -0,0 +1,104 @@
+import base64
+import io
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+from matplotlib.backends.backend_svg import RendererSVG
+
+from plotjs import PlotJS, rendering
+from plotjs.occlusion import occluded_markers
+
+
+def _occluded(fig) -> np.ndarray:
+    renderer = RendererSVG(*fig.get_size_inches(), io.StringIO())
+    return occluded_markers(fig.axes[0].collections[0], renderer)
+
+
+def _n_points(render: rendering.Render) -> int:
+    encoded = (
+        render.positions.get("PathCollection_1")
+        or (render.markers["PathCollection_1"]["centers"])
+    )
+    return len(base64.b64decode(encoded)) // 8
+
+
+@pytest.fixture
+def scatter():
+    fig, ax = plt.subplots()
+    # 1 is under 3, 0 is under 2 (a bigger marker), 4 is alone
+    ax.scatter(
+        [1, 1, 1, 1, 3],
+        [1, 2, 1, 2, 3],
+        s=[10, 20, 40, 20, 20],
+    )
+    yield fig
+    plt.close(fig)
+
+
+def test_occluded_markers(scatter):
+    assert _occluded(scatter).tolist() == [True, True, False, False, False]
+
+
+def test_occluded_markers_transparent(scatter):
+    scatter.axes[0].collections[0].set_alpha(0.5)
+    assert not _occluded(scatter).any()
+
+
+def test_occluded_markers_bigger_on_top():
+    fig, ax = plt.subplots()
+    # the bigger marker is drawn last, the smaller one is not hidden
+    ax.scatter([1, 1], [1, 1], s=[40, 10])
+    assert _occluded(fig).tolist() == [False, False]
+    plt.close(fig)
+
+
+def test_occluded_markers_unfilled():
+    fig, ax = plt.subplots()
+    ax.scatter([1, 1], [1, 1], s=[10, 40], facecolors="none")
+    # the bigger ring does not hide the smaller one inside of it
+    assert not _occluded(fig).any()
+    plt.close(fig)
+
+
+@pytest.mark.parametrize("canvas_axes", [(), (0,)])
+def test_render_thinned(scatter, canvas_axes):
+    full = rendering.render_svg(scatter, canvas_axes=canvas_axes)
+    thin = rendering.render_svg(scatter, canvas_axes=canvas_axes, thin_axes=(0,))
+    assert full.thinned == {}
+    assert thin.thinned == {"axes_1": [0, 1]}
+    assert _n_points(full) == 5
+    assert _n_points(thin) == 3
+    # the figure itself is not changed
+    assert len(scatter.axes[0].collections[0].get_offsets()) == 5
+
+
+def test_plotjs_thin_occluded(scatter):
+    plot = PlotJS(scatter).add_tooltip(
+        labels=list("abcde"), groups=[1, 1, 2, 2, 3], thin_occluded=True
+    )
+    html = plot.as_html()
+    axes = plot.plot_data_json["axes"]["axes_1"]
+    assert axes["tooltip_labels"] == list("cde")
+    assert axes["tooltip_groups"] == [2, 2, 3]
+    assert "thin_occluded" not in axes
+    assert plot.thinned_markers == {"axes_1": 2}
+    assert html.count('class="point plot-element"') == 3
+    assert 'data-idx="2" data-group="3"' in html
+    # the labels of the instance are left untouched
+    assert plot._axes_tooltip["axes_1"]["tooltip_labels"] == list("abcde")
+
+
+def test_plotjs_thin_occluded_template(scatter):
+    data = pd.DataFrame({"name": list("abcde"), "value": [1, 2, 3, 4, 5]})
+    plot = PlotJS(scatter).add_tooltip(
+        data=data, template="{name}: {value}", thin_occluded=True
+    )
+    plot.as_html()
+    labels = plot.plot_data_json["axes"]["axes_1"]["tooltip_labels"]
+    assert labels["length"] == 3
+    assert labels["columns"] == {
+        "name": ["c", "d", "e"],
+        "value": [3, 4, 5],
+    }
@@ -1,6 +1,11 @@
 import pytest
 import re
-from plotjs.utils import _vector_to_list
+from plotjs.utils import (
+    _dictionary_encode,
+    _parse_template,
+    _vector_to_list,
+    _vectors_to_lists,
+)
 import pandas as pd
 import polars as pl
 import numpy as np
@@ -44,3 +49,77 @@ def test_vector_to_list_error(wrong_vector):
         ),
     ):
         _vector_to_list(wrong_vector)
+
+
+@pytest.mark.parametrize(
+    "input, output_expected",
+    [
+        (pd.Series([1.0, np.nan, 3.0]), [1.0, 3.0]),
+        (pd.Series(["a", None, np.nan, "d"]), ["a", "d"]),
+        (pl.Series([1.0, None, float("nan"), 4.0]), [1.0, 4.0]),
+        (pl.Series(["a", None, "c"]), ["a", "c"]),
+        (np.array([1.0, np.nan, 3.0]), [1.0, 3.0]),
+        (
+            np.array(["2020-01-01", "NaT"], dtype="datetime64[D]"),
+            [np.datetime64("2020-01-01").item()],
+        ),
+        (["a", None, float("nan"), 1, "b"], ["a", 1, "b"]),
+        ([], []),
+    ],
+)
+def test_vector_to_list_drops_missing_values(input, output_expected):
+    assert _vector_to_list(input) == output_expected
+
+
+def test_vector_to_list_rejects_2d_arrays():
+    with pytest.raises(ValueError, match=re.escape("shape (2, 2)")):
+        _vector_to_list(np.array([[1, 2], [3, 4]]))
+
+
+def test_vector_to_list_returns_python_scalars():
+    values = _vector_to_list(np.array([1, 2, 3]))
+    assert values == [1, 2, 3]
+    assert all(type(value) is int for value in values)
+
+
+def test_vectors_to_lists_keeps_labels_and_groups_aligned():
+    labels = pl.Series(["a", None, "c", "d"])
+    groups = pd.Series(["g1", "g2", np.nan, "g4"])
+
+    assert _vectors_to_lists(labels, groups) == [["a", "d"], ["g1", "g4"]]
+    assert _vectors_to_lists(labels, None) == [["a", "c", "d"], None]
+    assert _vectors_to_lists(None, None) == [None, None]
+
+    # different lengths can't be aligned
+    assert _vectors_to_lists([1, None], [None, 2, 3]) == [[1], [2, 3]]
+
+
+def test_dictionary_encode():
+    assert _dictionary_encode(["a", "b", "a", "a"]) == {
+        "values": ["a", "b"],
+        "codes": [0, 1, 0, 0],
+    }
+    assert _dictionary_encode([1, True, 1, True]) == {
+        "values": [1, True],
+        "codes": [0, 1, 0, 1],
+    }
+    # not worth it when values are mostly unique
+    assert _dictionary_encode(["a", "b", "c"]) == ["a", "b", "c"]
+    assert _dictionary_encode([]) == []
+    assert _dictionary_encode([[1], [1]]) == [[1], [1]]
+
+
+def test_parse_template():
+    assert _parse_template("{name}: {value:,.2f}{{x}}") == [
+        ["", "name", ""],
+        [": ", "value", ",.2f"],
+        ["{x}", None, ""],
+    ]
+    assert _parse_template("no fields") == [["no fields", None, ""]]
+
+    with pytest.raises(ValueError, match="Conversions"):
+        _parse_template("{name!r}")
+    with pytest.raises(ValueError, match="must be column names"):
+        _parse_template("{name.attr}")
+    with pytest.raises(ValueError, match="Invalid tooltip template"):
+        _parse_template("{name")
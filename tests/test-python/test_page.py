@@ -0,0 +1,89 @@
+import re
+
+import matplotlib.pyplot as plt
+import pytest
+
+from plotjs import Page, PlotJS
+
+
+@pytest.fixture
+def fig():
+    fig, ax = plt.subplots()
+    ax.scatter([1, 2, 3], [1, 2, 3])
+    yield fig
+    plt.close(fig)
+
+
+def test_charts_get_unique_ids(fig):
+    first = PlotJS(fig=fig)
+    second = PlotJS(fig=fig)
+    # ids do not depend on the charts created before
+    assert first._uuid == second._uuid
+    assert first.as_html() == second.as_html()
+
+    html = Page().add(first, second).as_html()
+    assert html.count(f'id="plot-container-{first._uuid}"') == 1
+    assert html.count(f'id="plot-container-{first._uuid}-2"') == 1
+
+
+def test_page_shares_assets(fig):
+    plots = [
+        PlotJS(fig=fig).add_tooltip(labels=[f"{i}-A", f"{i}-B", f"{i}-C"])
+        for i in range(3)
+    ]
+    html = Page(document_title="Dashboard").add(*plots).as_html()
+
+    assert html.count("class Selection") == 1
+    assert html.count("--default-opacity: 1;") == 1
+    assert html.count("<title>Dashboard</title>") == 1
+    assert html.count("initPlots(document)") == 1
+    for chart_id in Page().add(*plots)._chart_ids().values():
+        assert html.count(f'id="plot-container-{chart_id}"') == 1
+        assert html.count(f'data-plotjs="plot-container-{chart_id}"') == 1
+
+    single = plots[0].as_html()
+    assert len(html) < 3 * len(single)
+
+
+def test_page_deduplicates_additional_css_and_javascript(fig):
+    first = PlotJS(fig=fig).add_css(".point{fill:red;}").add_javascript("let a;")
+    second = PlotJS(fig=fig).add_css(".point{fill:red;}").add_javascript("let b;")
+
+    html = Page().add(first, second).as_html()
+
+    assert html.count(".point{fill:red;}") == 1
+    assert html.count("let a;") == 1
+    assert html.count("let b;") == 1
+    # user code runs after the charts are initialized
+    assert html.index("initPlots(document)") < html.index("let a;")
+
+
+def test_page_keeps_items_order(fig):
+    plot = PlotJS(fig=fig)
+    html = Page().add_html("<h1>Title</h1>").add(plot).add_html("<p>End</p>")
+
+    html = html.as_html()
+    assert (
+        html.index("<h1>Title</h1>")
+        < html.index(f"plot-container-{plot._uuid}")
+        < html.index("<p>End</p>")
+    )
+
+
+def test_page_rejects_invalid_charts(fig):
+    plot = PlotJS(fig=fig)
+    page = Page().add(plot)
+
+    with pytest.raises(ValueError, match="already been added"):
+        page.add(plot)
+    with pytest.raises(TypeError, match="Expected a PlotJS instance"):
+        page.add("<p>not a chart</p>")
+
+
+def test_page_save_matches_as_html(fig, tmp_path):
+    page = Page().add(PlotJS(fig=fig), PlotJS(fig=fig))
+    page.save(str(tmp_path / "page"))
+
+    html = (tmp_path / "page.html").read_text(encoding="utf-8")
+    assert html == page.as_html()
+    assert len(re.findall(r'class="plotjs-chart"', html)) == 2
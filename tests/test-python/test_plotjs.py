@@ -6,6 +6,7 @@ from unittest.mock import patch
 import pytest
 
 from plotjs import PlotJS, data
+from plotjs.profiling import ExportProfile
 
 
 def test_add_css_method_chaining():
@@ -394,16 +395,17 @@ def test_add_tooltip_without_axes_raises_clear_error():
     plt.close(fig)
 
 
-def test_init_restores_svg_rcparams_if_savefig_fails():
+def test_render_restores_svg_rcparams_if_savefig_fails():
     fig, ax = plt.subplots()
     ax.scatter([1, 2, 3], [1, 2, 3])
 
     old_svg_hashsalt = plt.rcParams["svg.hashsalt"]
     old_svg_id = plt.rcParams["svg.id"]
 
+    # the figure is rendered lazily, when the HTML is built
     with patch.object(fig, "savefig", side_effect=RuntimeError("boom")):
         with pytest.raises(RuntimeError, match="boom"):
-            PlotJS(fig=fig)
+            PlotJS(fig=fig).as_html()
 
     assert plt.rcParams["svg.hashsalt"] == old_svg_hashsalt
     assert plt.rcParams["svg.id"] == old_svg_id
@@ -556,3 +558,126 @@ def test_warning_message_for_labels_and_groups():
         UserWarning, match="Either `labels` or `groups` must not be `None`."
     ):
         PlotJS(fig=fig).add_tooltip()
+
+
+def test_iter_html_matches_as_html(tmp_path):
+    fig, ax = plt.subplots()
+    ax.scatter([1, 2, 3], [1, 2, 3])
+
+    mp = PlotJS(fig=fig).add_tooltip(labels=["<b>A</b>", "B & 'b'", "C"])
+    chunks = list(mp.iter_html(chunk_size=1024))
+
+    assert len(chunks) > 1
+    assert all(len(chunk) > 0 for chunk in chunks)
+    assert "".join(chunks) == mp.as_html()
+    assert "".join(mp._iter_svg(mp._svg_content, 1024, ExportProfile())) in mp.html
+    assert "\\u003cb\\u003eA\\u003c/b\\u003e" in mp.html
+    assert "\\u0026 \\u0027b\\u0027" in mp.html
+
+    html_path = tmp_path / "streamed.html"
+    mp.save(str(html_path))
+    assert html_path.read_text(encoding="utf-8") == mp.html
+
+    plt.close(fig)
+
+
+def test_plot_data_json_is_dictionary_encoded():
+    fig, ax = plt.subplots()
+    ax.scatter([1, 2, 3, 4], [1, 2, 3, 4])
+
+    mp = PlotJS(fig=fig).add_tooltip(
+        labels=["A", "B", "C", "D"], groups=["g1", "g2", "g1", "g1"]
+    )
+    mp.as_html()
+
+    assert mp.plot_data_json["axes"]["axes_1"]["tooltip_labels"] == [
+        "A",
+        "B",
+        "C",
+        "D",
+    ]
+    assert mp.plot_data_json["axes"]["axes_1"]["tooltip_groups"] == {
+        "values": ["g1", "g2"],
+        "codes": [0, 1, 0, 0],
+    }
+    # raw values are left untouched
+    assert mp._axes_tooltip["axes_1"]["tooltip_groups"] == ["g1", "g2", "g1", "g1"]
+
+    plt.close(fig)
+
+
+@pytest.mark.parametrize("backend", ["pandas", "polars", "polars-lazy"])
+def test_add_tooltip_with_template(backend):
+    import pandas as pd
+    import polars as pl
+
+    records = {
+        "name": ["a", "b", "c"],
+        "value": [1.5, None, 3.25],
+        "group": ["x", "y", "x"],
+        "unused": [0, 0, 0],
+    }
+    if backend == "pandas":
+        df = pd.DataFrame(records)
+    elif backend == "polars":
+        df = pl.DataFrame(records)
+    else:
+        df = pl.LazyFrame(records)
+
+    fig, ax = plt.subplots()
+    ax.scatter([1, 2, 3], [1, 2, 3])
+    mp = PlotJS(fig=fig).add_tooltip(
+        data=df, template="<b>{name}</b>: {value:.1f}", groups="group"
+    )
+
+    labels = mp._axes_tooltip["axes_1"]["tooltip_labels"]
+    assert labels == {
+        "template": [["<b>", "name", ""], ["</b>: ", "value", ".1f"]],
+        "columns": {"name": ["a", "b", "c"], "value": [1.5, None, 3.25]},
+        "length": 3,
+        "extra": [],
+    }
+    # missing values are kept so that rows stay aligned
+    assert mp._axes_tooltip["axes_1"]["tooltip_groups"] == ["x", "y", "x"]
+    assert "unused" not in mp.as_html()
+
+    plt.close(fig)
+
+
+def test_add_tooltip_with_template_invalid_arguments():
+    import pandas as pd
+
+    df = pd.DataFrame({"name": ["a", "b"]})
+    fig, ax = plt.subplots()
+    ax.scatter([1, 2], [1, 2])
+    mp = PlotJS(fig=fig)
+
+    with pytest.raises(ValueError, match="can't be used together"):
+        mp.add_tooltip(data=df, template="{name}", labels=["a", "b"])
+    with pytest.raises(ValueError, match="`data` is required"):
+        mp.add_tooltip(template="{name}")
+    with pytest.raises(ValueError, match="not found"):
+        mp.add_tooltip(data=df, template="{other}")
+    with pytest.raises(ValueError, match="Unsupported format"):
+        mp.add_tooltip(data=df, template="{name:%Y}")
+    with pytest.raises(ValueError, match="must be column names"):
+        mp.add_tooltip(data=df, template="{0}")
+    with pytest.raises(ValueError, match="DataFrame or a LazyFrame"):
+        mp.add_tooltip(data=[1, 2], template="{name}")
+
+    plt.close(fig)
+
+
+def test_as_html_production():
+    fig, ax = plt.subplots()
+    ax.scatter([1, 2], [1, 2])
+    mp = PlotJS(fig=fig).add_tooltip(labels=["a", "b"])
+
+    html = mp.as_html()
+    production = mp.as_html(production=True)
+    assert "console.log" in html
+    assert "console.log" not in production
+    assert len(production) < len(html)
+    assert "".join(mp.iter_html(production=True)) == production
+
+    plt.close(fig)
@@ -0,0 +1,110 @@
+import base64
+import re
+from unittest.mock import patch
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from plotjs import PlotJS, rendering
+from plotjs.positions import encode_positions
+
+
+def _decode(encoded: str) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(encoded), dtype="<f4").reshape(-1, 2)
+
+
+def test_encode_positions():
+    encoded = encode_positions(np.array([[1.5, 2.0], [3.0, 4.0]]))
+    assert _decode(encoded).tolist() == [[1.5, 2.0], [3.0, 4.0]]
+
+
+@pytest.mark.parametrize("savefig_kws", [{}, {"bbox_inches": "tight"}])
+@pytest.mark.parametrize("rasterize_static", [False, True])
+def test_point_positions_match_svg(savefig_kws, rasterize_static):
+    fig, ax = plt.subplots()
+    ax.scatter([1, 2, np.nan, 3], [1, 2, 3, 5])
+    ax.bar(["a", "b"], [3, 4])
+
+    render = rendering.render_svg(
+        fig, rasterize_static=rasterize_static, savefig_kws=savefig_kws
+    )
+    points = _decode(render.positions["PathCollection_1"])
+
+    group = render.svg[render.svg.index('<g id="PathCollection_1"') :]
+    uses = re.findall(r'<use [^>]*x="([-\d.]+)" y="([-\d.]+)"', group)[:3]
+    # the point with a missing value is not drawn
+    assert points.shape == (3, 2)
+    np.testing.assert_allclose(points, np.array(uses, dtype=float), atol=1e-3)
+
+    bars = [key for key in render.positions if key.startswith("patch")]
+    assert len(bars) == 2
+    for key in bars:
+        assert f'<g id="{key}"' in render.svg
+
+    plt.close(fig)
+
+
+def test_positions_are_only_sent_for_hover_nearest():
+    fig, ax = plt.subplots()
+    ax.scatter([1, 2, 3], [1, 2, 3])
+
+    plot = PlotJS(fig=fig).add_tooltip(labels=["A", "B", "C"])
+    plot.as_html()
+    assert "positions" not in plot.plot_data_json
+
+    plot = PlotJS(fig=fig).add_tooltip(labels=["A", "B", "C"], hover_nearest=True)
+    plot.as_html()
+    assert list(plot.plot_data_json["positions"]) == ["PathCollection_1"]
+
+    plt.close(fig)
+
+
+def test_drawing_is_only_hooked_when_needed():
+    rendering.clear_cache()
+    fig, ax = plt.subplots()
+    ax.scatter([1, 2, 3], [1, 2, 3])
+
+    with patch.object(
+        rendering, "record_positions", wraps=rendering.record_positions
+    ) as record_positions:
+        plot = PlotJS(fig=fig)
+        plot.as_html()
+        assert record_positions.call_count == 0
+        assert "manifest" not in plot.plot_data_json
+
+        plot = PlotJS(fig=fig).add_tooltip(labels=["A", "B", "C"])
+        plot.as_html()
+        assert record_positions.call_count == 1
+        assert plot.plot_data_json["manifest"] == {
+            "axes_1": [["PathCollection_1", "point"]]
+        }
+
+    plt.close(fig)
+
+
+@pytest.mark.parametrize("rasterize_static", [False, True])
+def test_manifest(rasterize_static):
+    fig, (ax1, ax2) = plt.subplots(ncols=2)
+    ax1.bar(["a", "b"], [3, 4], label="bars")
+    ax1.scatter([1, 2], [1, 2], label="points")
+    ax1.annotate("note", (0, 0), bbox={"boxstyle": "round"})
+    ax1.legend()
+    ax2.pie([1, 2])
+    ax2.plot([1, 2], [1, 2])
+
+    render = rendering.render_svg(fig, rasterize_static=rasterize_static)
+    # the rounded box of the annotation is not a pie
+    assert [kind for _, kind in render.manifest["axes_1"]] == ["bar", "bar", "point"]
+    for group_id, _ in render.manifest["axes_1"]:
+        assert f'<g id="{group_id}"' in render.svg
+    assert [kind for _, kind in render.manifest["axes_2"]] == ["pie", "pie", "line"]
+    # groups are in the order of the SVG
+    ids = [group_id for group_id, _ in render.manifest["axes_2"]]
+    assert ids == sorted(ids, key=lambda group_id: render.svg.index(f'"{group_id}"'))
+
+    plot = PlotJS(fig=fig, rasterize_static=rasterize_static)
+    plot.as_html()
+    assert plot.plot_data_json["manifest"] == render.manifest
+
+    plt.close(fig)
@@ -0,0 +1,88 @@
+import time
+
+import matplotlib.pyplot as plt
+import pytest
+
+from plotjs import Page, PlotJS, profiling
+from plotjs.profiling import ExportProfile
+
+
+@pytest.fixture
+def fig():
+    fig, ax = plt.subplots()
+    ax.scatter([1, 2, 3], [1, 2, 3])
+    yield fig
+    plt.close(fig)
+
+
+def test_profile_of_an_export(fig):
+    plot = PlotJS(fig=fig).add_tooltip(labels=["A", "B", "C"], hover_nearest=True)
+    assert plot.profile is None
+
+    html = plot.as_html()
+    profile = plot.profile
+    assert profile.exports == 1
+    assert {"data", "render", "assets", "payload", "tag", "json", "template"} <= set(
+        profile.stages
+    )
+    assert profile.sizes["total"] == len(html.encode("utf-8"))
+    assert profile.sizes["svg"] == len(
+        "".join(plot._iter_svg(plot._svg_content, 64, ExportProfile())).encode("utf-8")
+    )
+    assert 0 < profile.sizes["payload"] < profile.sizes["total"]
+    assert profile.sizes["js"] > 0 and profile.sizes["css"] > 0
+    assert profile.wall == pytest.approx(
+        sum(timing.wall for timing in profile.stages.values())
+    )
+
+    # tooltip data is only reported by the first export
+    plot.as_html()
+    assert "data" not in plot.profile.stages
+    assert plot.profile is not profile
+
+
+def test_profile_callback_and_save(fig, tmp_path):
+    profiles = []
+    plot = PlotJS(fig=fig, profile_callback=profiles.append)
+    plot.save(str(tmp_path / "chart.html"), assets="external")
+
+    assert profiles == [plot.profile]
+    assert plot.profile.stages["write"].calls > 0
+    assert plot.profile.sizes["total"] == (tmp_path / "chart.html").stat().st_size
+    js = next(tmp_path.glob("plotjs-*.js"))
+    assert plot.profile.sizes["js"] == js.stat().st_size
+
+    # streamed exports are recorded once fully consumed
+    chunks = plot.iter_html(chunk_size=64)
+    next(chunks)
+    assert len(profiles) == 1
+    list(chunks)
+    assert len(profiles) == 2
+
+
+def test_collect(fig):
+    page = Page().add(PlotJS(fig=fig), PlotJS(fig=fig))
+    with profiling.collect() as total:
+        with profiling.collect() as inner:
+            PlotJS(fig=fig).as_html()
+        page.as_html()
+    PlotJS(fig=fig).as_html()
+
+    assert inner.exports == 1
+    assert total.exports == 2
+    assert page.profile.stages["payload"].calls == 2
+    assert total.sizes["total"] == (inner.sizes["total"] + page.profile.sizes["total"])
+    assert total.as_dict()["exports"] == 2
+
+
+def test_nested_stages_are_exclusive():
+    profile = ExportProfile()
+    with profile.stage("outer"), profile.stage("inner"):
+        time.sleep(0.02)
+
+    assert profile.stages["inner"].wall >= 0.02
+    assert profile.stages["outer"].wall < 0.01
+    assert profile.stages["outer"].calls == 1
+
+    assert list(profile.iterate("iterate", ["a", "b"])) == ["a", "b"]
+    assert profile.stages["iterate"].calls == 3
@@ -0,0 +1,115 @@
+from unittest.mock import patch
+
+import matplotlib.pyplot as plt
+
+from plotjs import PlotJS, rendering
+
+
+def test_svg_is_rendered_lazily():
+    fig, ax = plt.subplots()
+    ax.scatter([1, 2, 3], [1, 2, 3])
+
+    with patch.object(fig, "savefig", wraps=fig.savefig) as savefig:
+        plot = PlotJS(fig=fig).add_tooltip(labels=["A", "B", "C"]).add_css("svg {}")
+        assert savefig.call_count == 0
+
+        plot.as_html()
+        assert savefig.call_count == 1
+
+    plt.close(fig)
+
+
+def test_identical_figures_render_once():
+    rendering.clear_cache()
+    fig, ax = plt.subplots()
+    ax.scatter([1, 2, 3], [1, 2, 3])
+
+    labels = PlotJS(fig=fig).add_tooltip(labels=["A", "B", "C"])
+    groups = PlotJS(fig=fig).add_tooltip(groups=["a", "b", "a"])
+
+    assert labels._svg_content is groups._svg_content
+    assert rendering.cache_info() == rendering.CacheInfo(hits=1, misses=1, currsize=1)
+
+    # other options are rendered separately
+    PlotJS(fig=fig, bbox_inches="tight")._render()
+    assert rendering.cache_info() == rendering.CacheInfo(hits=1, misses=2, currsize=2)
+
+    plt.close(fig)
+
+
+def test_export_renders_once():
+    rendering.clear_cache()
+    fig, ax = plt.subplots()
+    ax.scatter([1, 2, 3], [1, 2, 3])
+
+    PlotJS(fig=fig).add_tooltip(
+        labels=["A", "B", "C"], hover_nearest=True, render="canvas"
+    ).as_html()
+    assert rendering.cache_info() == rendering.CacheInfo(hits=0, misses=1, currsize=1)
+
+    PlotJS(fig=fig).add_tooltip(groups=["a", "b", "a"]).as_html()
+    assert rendering.cache_info() == rendering.CacheInfo(hits=0, misses=2, currsize=2)
+    PlotJS(fig=fig).add_tooltip(labels=["A", "B", "C"]).as_html()
+    assert rendering.cache_info() == rendering.CacheInfo(hits=1, misses=2, currsize=2)
+
+    plt.close(fig)
+
+
+def test_modified_figure_is_rendered_again():
+    rendering.clear_cache()
+    fig, ax = plt.subplots()
+    ax.scatter([1, 2, 3], [1, 2, 3])
+
+    plot = PlotJS(fig=fig)
+    before = plot._svg_content
+    ax.set_title("A brand new title")
+    after = plot._svg_content
+
+    assert "A brand new title" not in before
+    assert "A brand new title" in after
+    assert rendering.cache_info().misses == 2
+
+    plt.close(fig)
+
+
+def test_figure_drawn_elsewhere_is_rendered_again():
+    rendering.clear_cache()
+    fig, ax = plt.subplots()
+    ax.scatter([1, 2, 3], [1, 2, 3])
+
+    PlotJS(fig=fig)._render()
+    # e.g. an interactive backend redrawing a modified figure
+    ax.set_title("A brand new title")
+    fig.canvas.draw()
+    assert not fig.stale
+
+    assert "A brand new title" in PlotJS(fig=fig)._svg_content
+    assert rendering.cache_info().misses == 2
+
+    plt.close(fig)
+
+
+def test_stale_state_of_the_figure_is_kept():
+    rendering.clear_cache()
+    fig, ax = plt.subplots()
+    (line,) = ax.plot([1, 2, 3])
+    fig.canvas.draw()
+
+    line.set_ydata([3, 2, 1])
+    assert fig.stale
+    PlotJS(fig=fig, rasterize_static=True).as_html()
+    assert fig.stale
+
+    fig.canvas.draw()
+    PlotJS(fig=fig, rasterize_static=True).as_html()
+    assert not fig.stale
+
+    # the figure was not modified since its last render
+    PlotJS(fig=fig, rasterize_static=True).as_html()
+    assert rendering.cache_info() == rendering.CacheInfo(hits=1, misses=2, currsize=1)
+
+    line.set_ydata([1, 1, 1])
+    PlotJS(fig=fig, rasterize_static=True).as_html()
+    assert rendering.cache_info().misses == 3
+
+    plt.close(fig)
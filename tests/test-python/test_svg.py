@@ -0,0 +1,166 @@
+import re
+
+import matplotlib.pyplot as plt
+import pytest
+
+from plotjs import PlotJS
+from plotjs.svg import iter_tagged_svg, optimize_svg, tag_elements
+
+SVG = """<?xml version="1.0" encoding="utf-8" standalone="no"?>
+<!DOCTYPE svg PUBLIC "-//W3C//DTD SVG 1.1//EN"
+  "http://www.w3.org/Graphics/SVG/1.1/DTD/svg11.dtd">
+<svg xmlns:xlink="http://www.w3.org/1999/xlink" viewBox="0 0 460.8 345.6">
+ <metadata>
+  <dc:date>2025-01-01</dc:date>
+ </metadata>
+ <g id="axes_1">
+  <g id="patch_1">
+   <path d="M 73.832727 307.584 
+L 182.050909 307.584 
+z
+" clip-path="url(#p1)" style="fill: #ff7f0e"/>
+  </g>
+  <g id="PathCollection_1">
+   <g clip-path="url(#p2)">
+    <use xlink:href="#m1" x="-0.001" y="223.104" style="fill: #1f77b4; stroke: #1f77b4"/>
+   </g>
+  </g>
+  <g id="text_1">
+   <!-- a label -->
+   <g transform="translate(52.353892 322.181656) scale(0.015625)">
+    <use xlink:href="#DejaVuSans-30"/>
+   </g>
+  </g>
+ </g>
+ <defs>
+  <clipPath id="p1">
+   <rect x="57.6" y="41.472" width="357.12" height="266.112"/>
+  </clipPath>
+  <clipPath id="p2">
+   <rect x="57.600001" y="41.472" width="357.12" height="266.112"/>
+  </clipPath>
+ </defs>
+</svg>
+"""
+
+
+def test_optimize_svg():
+    svg, report = optimize_svg(SVG, precision=2)
+
+    assert svg.startswith("<svg")
+    assert "<metadata>" not in svg
+    assert "<!--" not in svg
+    assert "DOCTYPE" not in svg
+    assert ">\n" not in svg
+
+    assert 'd="M 73.83 307.58 L 182.05 307.58 z"' in svg
+    assert 'x="0" y="223.1"' in svg
+    assert 'style="fill:#1f77b4;stroke:#1f77b4"' in svg
+    assert 'transform="translate(52.353892 322.181656) scale(0.015625)"' in svg
+
+    # p2 is identical to p1 once rounded
+    assert svg.count("<clipPath") == 1
+    assert 'clip-path="url(#p2)"' not in svg
+    assert svg.count('clip-path="url(#p1)"') == 2
+
+    for group_id in ["axes_1", "patch_1", "PathCollection_1", "text_1"]:
+        assert f'<g id="{group_id}">' in svg
+
+    assert report.original_bytes == len(SVG.encode("utf-8"))
+    assert report.optimized_bytes == len(svg.encode("utf-8"))
+    assert report.saved_bytes > 0
+
+
+def test_optimize_svg_precision():
+    svg, _ = optimize_svg(SVG, precision=0)
+    assert 'd="M 74 308 L 182 308 z"' in svg
+
+    with pytest.raises(ValueError, match="`precision` must be a positive integer."):
+        optimize_svg(SVG, precision=-1)
+
+
+def test_optimize_svg_keeps_document_size_and_images():
+    svg = (
+        '<svg width="460.8pt" height="345.6pt" viewBox="0 0 460.8 345.6">'
+        '<image x="57.6" y="41.472" width="357.12" height="266.112"/>'
+        '<rect x="57.6" y="41.472" width="357.12" height="266.112"/></svg>'
+    )
+    svg, _ = optimize_svg(svg, precision=0)
+    assert '<svg width="460.8pt" height="345.6pt"' in svg
+    assert '<image x="57.6" y="41.472" width="357.12" height="266.112"/>' in svg
+    assert '<rect x="58" y="41" width="357" height="266"/>' in svg
+
+
+def test_plotjs_optimize_svg():
+    fig, ax = plt.subplots()
+    ax.scatter([1, 2, 3], [1, 2, 3])
+    ax.bar([1, 2], [1, 2])
+    ax.plot([1, 2], [2, 1])
+
+    plot = PlotJS(fig, optimize_svg=True, precision=1)
+    assert plot.svg_optimization.saved_bytes > 0
+    assert plot.svg_optimization.optimized_bytes == len(
+        plot._svg_content.encode("utf-8")
+    )
+    for prefix in ["axes_", "patch", "line2d", "PathCollection"]:
+        assert f'<g id="{prefix}' in plot._svg_content
+    assert "<svg" in plot.as_html()
+
+    assert PlotJS(fig).svg_optimization is None
+
+    plt.close(fig)
+
+
+def test_tag_elements():
+    manifest = {"axes_1": [["patch_1", "bar"], ["PathCollection_1", "point"]]}
+    svg = tag_elements(SVG, manifest, {"axes_1": [1.0, "b"]})
+
+    assert '<g class="bar plot-element" data-idx="0" id="patch_1">' in svg
+    assert (
+        '<use class="point plot-element" data-idx="0" data-group="1" '
+        'xlink:href="#m1"' in svg
+    )
+    # uses of the text are not plot elements
+    assert svg.count("plot-element") == 2
+    # the rest of the SVG is left as is
+    assert (
+        re.sub(r' class="[^"]*" data-idx="\d+"( data-group="[^"]*")?', "", svg) == SVG
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [1 << 16, 7])
+def test_iter_tagged_svg(chunk_size):
+    manifest = {"axes_1": [["patch_1", "bar"], ["PathCollection_1", "point"]]}
+    parts = list(iter_tagged_svg(SVG, manifest, {"axes_1": [1.0, "b"]}, chunk_size))
+
+    assert "".join(parts) == tag_elements(SVG, manifest, {"axes_1": [1.0, "b"]})
+    assert "".join(iter_tagged_svg(SVG, {}, chunk_size=chunk_size)) == SVG
+
+
+def test_tag_elements_paths():
+    svg, _ = optimize_svg(SVG)
+    svg = tag_elements(svg, {"axes_1": [["patch_1", "area"], ["text_1", "point"]]})
+
+    assert '<path class="area plot-element" data-idx="0" d=' in svg
+    # points are `<use>` when there are some, without groups here
+    assert '<use class="point plot-element" data-idx="0" xlink:href' in svg
+
+
+def test_plotjs_tag_elements():
+    fig, (ax1, ax2) = plt.subplots(ncols=2)
+    ax1.scatter([1, 2], [1, 2])
+    ax1.plot([1, 2], [2, 1])
+    ax2.bar([1, 2], [1, 2])
+
+    plot = PlotJS(fig).add_tooltip(labels=["a", "b"], groups=[True, 2.0], on="point")
+    html = plot.as_html()
+    assert plot.plot_data_json["tagged"]
+    assert 'class="point plot-element" data-idx="0" data-group="true"' in html
+    assert 'class="point plot-element" data-idx="1" data-group="2"' in html
+    # lines are filtered out by `on`, bars have no tooltip
+    assert "line plot-element" not in html
+    assert "bar plot-element" not in html
+    assert plot._svg_content not in html
+    assert "tag" in plot.profile.stages
+
+    plt.close(fig)